@@ -33,8 +33,12 @@ interface JobFormData {
   description: string
 }
 
+const PAGE_SIZE = 50
+
 export default function AdminPanel() {
   const [jobs, setJobs] = useState<Job[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [totalJobs, setTotalJobs] = useState(0)
   const [isLoading, setIsLoading] = useState(true)
   const [isSubmitting, setIsSubmitting] = useState(false)
   const [error, setError] = useState("")
@@ -56,13 +60,17 @@ export default function AdminPanel() {
     loadJobs()
   }, [])
 
-  const loadJobs = async () => {
+  const loadJobs = async (cursor?: string) => {
     try {
-      setIsLoading(true)
-      const response = await fetch(`${API_BASE}/jobs`)
+      if (!cursor) setIsLoading(true)
+      const params = new URLSearchParams({ limit: String(PAGE_SIZE), sort: "posted_date" })
+      if (cursor) params.set("cursor", cursor)
+      const response = await fetch(`${API_BASE}/jobs?${params}`)
       if (response.ok) {
-        const jobsData = await response.json()
-        setJobs(jobsData)
+        const page = await response.json()
+        setJobs((prev) => (cursor ? [...prev, ...page.jobs] : page.jobs))
+        setTotalJobs(page.total)
+        setNextCursor(page.next_cursor)
       } else {
         setError("Failed to load jobs")
       }
@@ -287,7 +295,7 @@ export default function AdminPanel() {
               <CardTitle className="flex items-center gap-2">
                 <Building className="h-5 w-5" />
                 Manage Jobs
-                <Badge variant="outline">{jobs.length} jobs</Badge>
+                <Badge variant="outline">{totalJobs} jobs</Badge>
               </CardTitle>
             </CardHeader>
             <CardContent>
@@ -333,6 +341,11 @@ export default function AdminPanel() {
                       )}
                     </div>
                   ))}
+                  {nextCursor && (
+                    <Button onClick={() => loadJobs(nextCursor)} variant="outline" className="w-full">
+                      Load more
+                    </Button>
+                  )}
                 </div>
               ) : (
                 <div className="text-center py-8">
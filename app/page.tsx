@@ -23,6 +23,14 @@ interface Job {
   posted_date: string
 }
 
+interface JobsPage {
+  jobs: Job[]
+  total: number
+  next_cursor: string | null
+}
+
+const PAGE_SIZE = 30
+
 interface VoiceResult {
   transcript: string
   intent: {
@@ -40,6 +48,9 @@ export default function VocaworkApp() {
   const [selectedLanguage, setSelectedLanguage] = useState("en")
   const [searchQuery, setSearchQuery] = useState("")
   const [jobs, setJobs] = useState<Job[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [totalJobs, setTotalJobs] = useState(0)
+  const [listingQuery, setListingQuery] = useState("")
   const [voiceResult, setVoiceResult] = useState<VoiceResult | null>(null)
   const [error, setError] = useState("")
   const [isLoading, setIsLoading] = useState(true)
@@ -56,24 +67,44 @@ export default function VocaworkApp() {
     loadJobs()
   }, [])
 
+  // Fetch one page of the listing; the backend returns a cursor for the next one
+  const fetchJobsPage = async (query: string, cursor?: string) => {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE), sort: query ? "score" : "posted_date" })
+    if (query) params.set("query", query)
+    if (cursor) params.set("cursor", cursor)
+    const response = await fetch(`${API_BASE}/jobs?${params}`)
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}`)
+    }
+    const page: JobsPage = await response.json()
+    setJobs((prev) => (cursor ? [...prev, ...page.jobs] : page.jobs))
+    setTotalJobs(page.total)
+    setNextCursor(page.next_cursor)
+    setListingQuery(query)
+  }
+
   const loadJobs = async () => {
     try {
       setIsLoading(true)
-      const response = await fetch(`${API_BASE}/jobs`)
-      if (response.ok) {
-        const jobsData = await response.json()
-        setJobs(jobsData)
-      } else {
-        setError("Failed to load jobs")
-      }
+      await fetchJobsPage("")
     } catch (err) {
-      setError("Failed to connect to server")
+      setError("Failed to load jobs")
       console.error("Error loading jobs:", err)
     } finally {
       setIsLoading(false)
     }
   }
 
+  const loadMoreJobs = async () => {
+    if (!nextCursor) return
+    try {
+      await fetchJobsPage(listingQuery, nextCursor)
+    } catch (err) {
+      setError("Failed to load more jobs")
+      console.error("Error loading jobs:", err)
+    }
+  }
+
   const startRecording = async () => {
     try {
       setError("")
@@ -132,6 +163,7 @@ export default function VocaworkApp() {
         const result: VoiceResult = await response.json()
         setVoiceResult(result)
         setJobs(result.jobs)
+        setNextCursor(null)
 
         // Play audio response if available
         if (result.audio_url && audioRef.current) {
@@ -158,13 +190,7 @@ export default function VocaworkApp() {
 
     try {
       setIsLoading(true)
-      const response = await fetch(`${API_BASE}/jobs?query=${encodeURIComponent(searchQuery)}`)
-      if (response.ok) {
-        const jobsData = await response.json()
-        setJobs(jobsData)
-      } else {
-        setError("Failed to search jobs")
-      }
+      await fetchJobsPage(searchQuery.trim())
     } catch (err) {
       setError("Failed to search jobs")
       console.error("Error searching jobs:", err)
@@ -283,7 +309,7 @@ export default function VocaworkApp() {
             <h2 className="text-2xl font-bold text-gray-900">
               {voiceResult ? `Found ${jobs.length} jobs for you` : "Available Jobs"}
             </h2>
-            <Badge variant="outline">{jobs.length} jobs</Badge>
+            <Badge variant="outline">{voiceResult ? jobs.length : totalJobs} jobs</Badge>
           </div>
 
           {isLoading ? (
@@ -295,6 +321,13 @@ export default function VocaworkApp() {
               {jobs.map((job) => (
                 <JobCard key={job.id} job={job} />
               ))}
+              {nextCursor && !voiceResult && (
+                <div className="md:col-span-2 lg:col-span-3 flex justify-center">
+                  <Button onClick={loadMoreJobs} variant="outline">
+                    Load more jobs
+                  </Button>
+                </div>
+              )}
             </div>
           ) : (
             <Card>
@@ -1,17 +1,47 @@
-from flask import Flask, request, jsonify, send_from_directory
+import time
+_startup_started = time.perf_counter()
+
+from flask import (Flask, Request, Response, current_app, g, request, jsonify, send_from_directory,
+                   stream_with_context)
 from flask_cors import CORS
+from werkzeug.wsgi import get_input_stream
 import os
 import json
 import logging
-from werkzeug.utils import secure_filename
 import uuid
 from datetime import datetime
 import tempfile
-import google.generativeai as genai
-import speech_recognition as sr
-from pydub import AudioSegment
 import io
 import base64
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from audio_io import AudioDecodeError, decode_audio, decode_pcm_wav, pydub
+from audio_preprocess import preprocess_audio
+from caches import IntentCache, SearchResultCache, TranscriptCache
+from intent_matcher import DEFAULT_VOCABULARY_PATH, KeywordIntentMatcher
+from job_ingest import IngestError, detect_format, ingest, iter_csv, iter_ndjson
+from job_listing import (ListingError, decode_cursor, encode_cursor, listing_etag, parse_fields,
+                         parse_limit, stream_json_array, stream_json_page)
+from job_snapshots import SnapshotManager
+from job_store import create_job_store
+import lazy_imports
+import metrics
+from request_profiler import RequestProfiler
+from search_index import SORT_ORDERS, JobSearchIndex
+import semantic_index
+from shared_state import create_shared_state
+from speech_stream import can_split, duration_seconds, recognize_chunks, split_on_silence
+from tts import MockTTSBackend, PhraseAudioCache, create_tts_backend
+from upstream import Upstream, UpstreamError
+from voice_batch import BatchError, collect_items, parse_languages, stream_results
+from voice_tasks import QueueFullError, VoiceTaskQueue
+
+# Imported on first use; see lazy_imports
+genai = lazy_imports.lazy_import('google.generativeai')
+sr = lazy_imports.lazy_import('speech_recognition')
+
+_startup_timings = {"imports": round((time.perf_counter() - _startup_started) * 1000, 1)}
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,29 +52,106 @@ app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
 # Configuration
-UPLOAD_FOLDER = 'uploads'
 AUDIO_FOLDER = 'static/audio'
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'ogg', 'm4a', 'webm'}
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['AUDIO_FOLDER'] = AUDIO_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload
+app.config['JOB_STORE_URL'] = os.environ.get('JOB_STORE_URL', 'sqlite:///data/jobs.db')
+app.config['VOICE_WORKERS'] = int(os.environ.get('VOICE_WORKERS', 4))
+app.config['VOICE_QUEUE_SIZE'] = int(os.environ.get('VOICE_QUEUE_SIZE', 100))
+app.config['TRANSCRIPT_CACHE_SIZE'] = int(os.environ.get('TRANSCRIPT_CACHE_SIZE', 1024))
+app.config['TRANSCRIPT_CACHE_TTL'] = int(os.environ.get('TRANSCRIPT_CACHE_TTL', 24 * 60 * 60))
+app.config['TRANSCRIPT_CACHE_DIR'] = os.environ.get('TRANSCRIPT_CACHE_DIR')
+app.config['INTENT_CACHE_SIZE'] = int(os.environ.get('INTENT_CACHE_SIZE', 2048))
+app.config['INTENT_CACHE_TTL'] = int(os.environ.get('INTENT_CACHE_TTL', 24 * 60 * 60))
+app.config['INTENT_VOCABULARY_PATH'] = os.environ.get('INTENT_VOCABULARY_PATH', DEFAULT_VOCABULARY_PATH)
+app.config['BATCH_MAX_ITEMS'] = int(os.environ.get('BATCH_MAX_ITEMS', 500))
+app.config['BATCH_MAX_BYTES'] = int(os.environ.get('BATCH_MAX_BYTES', 256 * 1024 * 1024))
+app.config['BATCH_MAX_ITEM_BYTES'] = int(os.environ.get('BATCH_MAX_ITEM_BYTES', 16 * 1024 * 1024))
+app.config['BATCH_CONCURRENCY'] = int(os.environ.get('BATCH_CONCURRENCY', 8))
+app.config['BATCH_DECODE_PROCESSES'] = int(os.environ.get('BATCH_DECODE_PROCESSES', os.cpu_count() or 2))
+app.config['TTS_BACKEND'] = os.environ.get('TTS_BACKEND', 'auto')
+app.config['TTS_VOICE'] = os.environ.get('TTS_VOICE', '')
+app.config['AUDIO_CACHE_MAX_BYTES'] = int(os.environ.get('AUDIO_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+app.config['AUDIO_PREPROCESS'] = os.environ.get('AUDIO_PREPROCESS', 'true').lower() == 'true'
+app.config['AUDIO_SAMPLE_RATE'] = int(os.environ.get('AUDIO_SAMPLE_RATE', 16000))
+app.config['AUDIO_TRIM_SILENCE_DB'] = float(os.environ.get('AUDIO_TRIM_SILENCE_DB', 30))
+app.config['AUDIO_TARGET_DBFS'] = float(os.environ.get('AUDIO_TARGET_DBFS', -20))
+app.config['AUDIO_MAX_SECONDS'] = float(os.environ.get('AUDIO_MAX_SECONDS', 0))
+app.config['SPEECH_CHUNK_SECONDS'] = float(os.environ.get('SPEECH_CHUNK_SECONDS', 15))
+app.config['SPEECH_CHUNK_CONCURRENCY'] = int(os.environ.get('SPEECH_CHUNK_CONCURRENCY', 4))
+app.config['SPEECH_MIN_SILENCE_MS'] = int(os.environ.get('SPEECH_MIN_SILENCE_MS', 400))
+app.config['SEARCH_CACHE_SIZE'] = int(os.environ.get('SEARCH_CACHE_SIZE', 4096))
+app.config['SEARCH_CACHE_MAX_IDS'] = int(os.environ.get('SEARCH_CACHE_MAX_IDS', 1000))
+app.config['MATCH_MODE'] = os.environ.get('MATCH_MODE', 'lexical')
+app.config['SEMANTIC_ENCODER'] = os.environ.get('SEMANTIC_ENCODER', 'hashed')
+app.config['SEMANTIC_WEIGHT'] = float(os.environ.get('SEMANTIC_WEIGHT', 8.0))
+app.config['SEMANTIC_CANDIDATES'] = int(os.environ.get('SEMANTIC_CANDIDATES', 50))
+app.config['SEMANTIC_MIN_SIMILARITY'] = float(os.environ.get('SEMANTIC_MIN_SIMILARITY', 0.25))
+app.config['SPEECH_TIMEOUT'] = float(os.environ.get('SPEECH_TIMEOUT', 10))
+app.config['SPEECH_MAX_CONCURRENCY'] = int(os.environ.get('SPEECH_MAX_CONCURRENCY', 16))
+app.config['SPEECH_HEDGE_AFTER'] = float(os.environ.get('SPEECH_HEDGE_AFTER', 0))
+app.config['GEMINI_TIMEOUT'] = float(os.environ.get('GEMINI_TIMEOUT', 8))
+app.config['GEMINI_MAX_CONCURRENCY'] = int(os.environ.get('GEMINI_MAX_CONCURRENCY', 8))
+app.config['GEMINI_HEDGE_AFTER'] = float(os.environ.get('GEMINI_HEDGE_AFTER', 0))
+app.config['UPSTREAM_FAILURE_THRESHOLD'] = int(os.environ.get('UPSTREAM_FAILURE_THRESHOLD', 5))
+app.config['UPSTREAM_RESET_TIMEOUT'] = float(os.environ.get('UPSTREAM_RESET_TIMEOUT', 30))
+app.config['BULK_MAX_BYTES'] = int(os.environ.get('BULK_MAX_BYTES', 512 * 1024 * 1024))
+app.config['BULK_BATCH_SIZE'] = int(os.environ.get('BULK_BATCH_SIZE', 1000))
+app.config['BULK_MAX_ERRORS'] = int(os.environ.get('BULK_MAX_ERRORS', 1000))
+app.config['SHARED_STATE_URL'] = os.environ.get('SHARED_STATE_URL', '')
+app.config['VOICE_TASK_STATE_URL'] = os.environ.get('VOICE_TASK_STATE_URL', 'sqlite:///data/voice_tasks.db')
+app.config['SHARED_AUDIO_TTL'] = int(os.environ.get('SHARED_AUDIO_TTL', 7 * 24 * 60 * 60))
+app.config['JOB_SNAPSHOT_POLL_SECONDS'] = float(os.environ.get('JOB_SNAPSHOT_POLL_SECONDS', 1.0))
+app.config['JOB_SNAPSHOT_MAX_LAG'] = float(os.environ.get('JOB_SNAPSHOT_MAX_LAG', 1.0))
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+app.config['PROFILE_TOKEN'] = os.environ.get('PROFILE_TOKEN')
+app.config['PROFILE_PATHS'] = os.environ.get('PROFILE_PATHS', '/api/process-voice,/api/jobs')
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', 'data/profiles')
+app.config['PROFILE_MAX_BYTES'] = int(os.environ.get('PROFILE_MAX_BYTES', 50 * 1024 * 1024))
+app.config['PROFILE_MAX_FILES'] = int(os.environ.get('PROFILE_MAX_FILES', 200))
+app.config['WARM_UP'] = os.environ.get('WARM_UP', 'false').lower() == 'true'
+app.config['METRICS_MULTIPROC_DIR'] = os.environ.get('METRICS_MULTIPROC_DIR')
+
+# Body limits of endpoints that take many uploads in one request; every other
+# endpoint is held to MAX_CONTENT_LENGTH
+ENDPOINT_BODY_LIMITS = {'process_voice_batch': 'BATCH_MAX_BYTES'}
+
+class VocaworkRequest(Request):
+    """Request whose body limit can be raised for a single endpoint"""
+    
+    @property
+    def max_content_length(self):
+        limit_key = ENDPOINT_BODY_LIMITS.get(self.endpoint)
+        if limit_key:
+            return current_app.config[limit_key]
+        return super().max_content_length
+
+app.request_class = VocaworkRequest
 
 # Create folders if they don't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(AUDIO_FOLDER, exist_ok=True)
 
-# Configure Gemini AI
+# Configure Gemini AI; the client is created on first use by get_gemini_model()
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-pro')
-    logger.info("Gemini AI configured successfully")
-else:
+model = None
+_model_lock = threading.Lock()
+if not GEMINI_API_KEY:
     logger.warning("GEMINI_API_KEY not found. Using mock responses.")
-    model = None
 
-# Sample job database
-JOB_DATABASE = [
+def get_gemini_model():
+    """Return the Gemini client, configuring it on first call; None without an API key"""
+    global model
+    if model is None and GEMINI_API_KEY:
+        with _model_lock:
+            if model is None:
+                genai.configure(api_key=GEMINI_API_KEY)
+                model = genai.GenerativeModel('gemini-pro')
+                logger.info("Gemini AI configured successfully")
+    return model
+
+# Sample jobs used to seed an empty job store
+SAMPLE_JOBS = [
     {
         "id": "1",
         "title": "Software Developer",
@@ -135,63 +242,276 @@ JOB_DATABASE = [
     }
 ]
 
+# Batch voice processing: recognition/intent threads plus a lazily started
+# process pool for decoding compressed audio
+BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=app.config['BATCH_CONCURRENCY'],
+                                    thread_name_prefix='voice-batch')
+# Pool processes re-import the __main__ module. When that is this file (run as
+# python app.py), its setup would repeat in every decoder, so batch audio is
+# then decoded in the batch threads instead
+_decode_processes = 0 if __name__ == '__main__' else app.config['BATCH_DECODE_PROCESSES']
+_decode_pool = None
+_decode_pool_lock = threading.Lock()
+
+# Concurrent recognition of the silence-delimited chunks of long recordings
+SPEECH_EXECUTOR = ThreadPoolExecutor(max_workers=app.config['SPEECH_CHUNK_CONCURRENCY'],
+                                     thread_name_prefix='speech-chunk')
+
+# Remote services behind deadlines, concurrency limits and circuit breakers;
+# a call that fails fast here goes to the mock transcript or keyword fallback
+SPEECH_UPSTREAM = Upstream('google_speech',
+                           timeout=app.config['SPEECH_TIMEOUT'],
+                           max_concurrency=app.config['SPEECH_MAX_CONCURRENCY'],
+                           failure_threshold=app.config['UPSTREAM_FAILURE_THRESHOLD'],
+                           reset_timeout=app.config['UPSTREAM_RESET_TIMEOUT'],
+                           hedge_after=app.config['SPEECH_HEDGE_AFTER'],
+                           # Audio without speech is an answer, not an outage
+                           is_failure=lambda e: not isinstance(e, sr.UnknownValueError))
+GEMINI_UPSTREAM = Upstream('gemini',
+                           timeout=app.config['GEMINI_TIMEOUT'],
+                           max_concurrency=app.config['GEMINI_MAX_CONCURRENCY'],
+                           failure_threshold=app.config['UPSTREAM_FAILURE_THRESHOLD'],
+                           reset_timeout=app.config['UPSTREAM_RESET_TIMEOUT'],
+                           hedge_after=app.config['GEMINI_HEDGE_AFTER'])
+
+# Language mapping for Google Speech Recognition
+GOOGLE_LANGUAGES = {
+    'hi': 'hi-IN',
+    'ta': 'ta-IN',
+    'te': 'te-IN',
+    'mr': 'mr-IN',
+    'en': 'en-IN'
+}
+
+# Request and pipeline-stage metrics, exposed at /api/metrics; with
+# METRICS_MULTIPROC_DIR every worker's totals are summed into one scrape
+METRICS = metrics.Registry(multiprocess_dir=app.config['METRICS_MULTIPROC_DIR'])
+REQUEST_DURATION = METRICS.histogram(
+    'vocawork_request_duration_seconds', 'HTTP request latency by route, language and outcome',
+    ('route', 'method', 'status', 'language', 'outcome'))
+STAGE_DURATION = METRICS.histogram(
+    'vocawork_stage_duration_seconds', 'Voice pipeline stage latency',
+    ('stage', 'language', 'outcome'))
+AUDIO_BYTES_SAVED = METRICS.histogram(
+    'vocawork_audio_preprocess_bytes_saved', 'PCM bytes removed from an upload before speech recognition',
+    buckets=(0, 16e3, 64e3, 256e3, 1e6, 4e6, 16e6))
+AUDIO_PREPROCESS_BYTES = METRICS.counter(
+    'vocawork_audio_preprocess_bytes_total', 'PCM bytes entering and leaving audio preprocessing',
+    ('direction',))
+FALLBACK_EVENTS = METRICS.counter(
+    'vocawork_fallback_total', 'Upstream failures answered by a local fallback',
+    ('component', 'reason'))
+
+# Cache tiers and audio shared by every worker (and host, with Redis); None
+# keeps each process to its own memory and local disk
+SHARED_STATE = create_shared_state(app.config['SHARED_STATE_URL']) if app.config['SHARED_STATE_URL'] else None
+
+# Bounded worker pool for asynchronous voice processing; task records are kept
+# where every worker can poll them
+VOICE_TASKS = VoiceTaskQueue(SHARED_STATE if SHARED_STATE is not None
+                             else create_shared_state(app.config['VOICE_TASK_STATE_URL']),
+                             max_workers=app.config['VOICE_WORKERS'],
+                             max_pending=app.config['VOICE_QUEUE_SIZE'])
+
+# Synthesized response phrases, cached by content under AUDIO_FOLDER
+AUDIO_CACHE = PhraseAudioCache(create_tts_backend(app.config['TTS_BACKEND']),
+                               app.config['AUDIO_FOLDER'],
+                               max_bytes=app.config['AUDIO_CACHE_MAX_BYTES'],
+                               shared=SHARED_STATE,
+                               shared_ttl=app.config['SHARED_AUDIO_TTL'])
+logger.info(f"TTS backend: {AUDIO_CACHE.backend.name}")
+
+# Recognized transcripts keyed by audio hash and language
+TRANSCRIPT_CACHE = TranscriptCache(max_entries=app.config['TRANSCRIPT_CACHE_SIZE'],
+                                   ttl=app.config['TRANSCRIPT_CACHE_TTL'],
+                                   directory=app.config['TRANSCRIPT_CACHE_DIR'],
+                                   shared=SHARED_STATE)
+
+# Gemini intents keyed by normalized transcript and language
+INTENT_CACHE = IntentCache(max_entries=app.config['INTENT_CACHE_SIZE'],
+                           ttl=app.config['INTENT_CACHE_TTL'],
+                           shared=SHARED_STATE)
+
+# Ranked job ids of recent voice matches and listings, for the current catalogue version
+SEARCH_CACHE = SearchResultCache(max_entries=app.config['SEARCH_CACHE_SIZE'],
+                                 max_ids=app.config['SEARCH_CACHE_MAX_IDS'])
+
+# Compiled multilingual keyword matcher for the Gemini fallback
+INTENT_MATCHER = KeywordIntentMatcher(app.config['INTENT_VOCABULARY_PATH'])
+
+# Readiness state for /api/ready: set once startup completes, draining on shutdown
+_ready = threading.Event()
+_draining = threading.Event()
+
+# Durable job store shared by all worker processes
+JOB_STORE = create_job_store(app.config['JOB_STORE_URL'])
+if JOB_STORE.count() == 0:
+    JOB_STORE.add_many(SAMPLE_JOBS)
+
+def create_semantic_index(jobs):
+    """Embedding matrix for MATCH_MODE=hybrid, or None when semantic matching is off"""
+    if app.config['MATCH_MODE'] != 'hybrid':
+        return None
+    if not semantic_index.available():
+        logger.warning("MATCH_MODE=hybrid needs numpy; falling back to lexical matching")
+        return None
+    try:
+        encoder = semantic_index.create_encoder(app.config['SEMANTIC_ENCODER'])
+    except Exception as e:
+        logger.error(f"Could not load semantic encoder {app.config['SEMANTIC_ENCODER']}: {str(e)}")
+        return None
+    return semantic_index.SemanticJobIndex(encoder, jobs)
+
+# Immutable, versioned snapshots of the inverted index (and, with
+# MATCH_MODE=hybrid, the job embeddings) over JOB_STORE
+JOB_SNAPSHOTS = SnapshotManager(JOB_STORE, semantic_factory=create_semantic_index,
+                                max_lag=app.config['JOB_SNAPSHOT_MAX_LAG'])
+
+def job_snapshot(force=False):
+    """Current catalogue snapshot, including changes made by this or any other worker"""
+    return JOB_SNAPSHOTS.refresh(force=force)
+
+def published_snapshot():
+    """Snapshot including this worker's own write, for the write handlers"""
+    return job_snapshot(force=True)
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def convert_audio_to_wav(input_path):
-    """Convert audio file to WAV format for speech recognition"""
+def convert_audio(audio_bytes):
+    """Decode uploaded audio bytes in memory for speech recognition"""
     try:
-        # Load audio file
-        audio = AudioSegment.from_file(input_path)
-        
-        # Convert to WAV format
-        output_path = input_path.rsplit('.', 1)[0] + '_converted.wav'
-        audio.export(output_path, format="wav")
-        
-        return output_path
-    except Exception as e:
+        return decode_audio(audio_bytes)
+    except AudioDecodeError as e:
         logger.error(f"Error converting audio: {str(e)}")
-        return input_path
+        metrics.set_outcome('error')
+        return None
+
+if not can_split():
+    # audioop left the standard library in Python 3.13 (pip install audioop-lts)
+    logger.warning("audioop is not installed; recognizing audio whole, without preprocessing "
+                   "or splitting long recordings at pauses")
+    app.config['AUDIO_PREPROCESS'] = False
+
+def preprocess_for_recognition(audio_data):
+    """Downsample, trim, normalize and cap decoded audio (AUDIO_PREPROCESS) and record the bytes saved"""
+    if audio_data is None or not app.config['AUDIO_PREPROCESS']:
+        return audio_data
+    processed, report = preprocess_audio(audio_data,
+                                         sample_rate=app.config['AUDIO_SAMPLE_RATE'],
+                                         trim_silence_db=app.config['AUDIO_TRIM_SILENCE_DB'],
+                                         target_dbfs=app.config['AUDIO_TARGET_DBFS'],
+                                         max_seconds=app.config['AUDIO_MAX_SECONDS'])
+    AUDIO_BYTES_SAVED.observe(report['input_bytes'] - report['output_bytes'])
+    AUDIO_PREPROCESS_BYTES.inc('in', amount=report['input_bytes'])
+    AUDIO_PREPROCESS_BYTES.inc('out', amount=report['output_bytes'])
+    if report['truncated']:
+        logger.warning(f"Audio longer than {app.config['AUDIO_MAX_SECONDS']}s was truncated")
+    logger.info(f"Preprocessed audio: {report['input_bytes']} -> {report['output_bytes']} bytes, "
+                f"{report['trimmed_seconds']}s silence trimmed, gain {report['gain_db']}dB")
+    return processed
+
+def mock_transcript_fallback(language, reason):
+    """Record a speech-recognition fallback and return the mock transcript"""
+    FALLBACK_EVENTS.inc('speech_to_text', reason)
+    metrics.set_outcome('mock')
+    return get_mock_transcript(language)
 
-def speech_to_text_with_sr(audio_path, language):
+def speech_to_text_with_sr(audio_data, language, cache_keys=()):
     """Convert speech to text using SpeechRecognition library"""
+    if audio_data is None:
+        return mock_transcript_fallback(language, 'undecodable_audio')
+    
+    # Same PCM already recognized (e.g. a retry re-encoded by the client)
+    audio_key = TRANSCRIPT_CACHE.key(audio_data.frame_data, language)
+    cached = TRANSCRIPT_CACHE.get(audio_key)
+    if cached is not None:
+        logger.info("Transcript cache hit for decoded audio")
+        metrics.set_outcome('hit')
+        return cached
+    
     try:
-        # Convert audio to WAV if needed
-        wav_path = convert_audio_to_wav(audio_path)
-        
-        # Initialize recognizer
-        r = sr.Recognizer()
-        
-        # Language mapping for Google Speech Recognition
-        lang_map = {
-            'hi': 'hi-IN',
-            'ta': 'ta-IN',
-            'te': 'te-IN',
-            'mr': 'mr-IN',
-            'en': 'en-IN'
-        }
-        
-        google_lang = lang_map.get(language, 'en-IN')
-        
-        # Load audio file
-        with sr.AudioFile(wav_path) as source:
-            audio_data = r.record(source)
-        
-        # Recognize speech
+        # Recognize speech, splitting long recordings at pauses
         try:
-            text = r.recognize_google(audio_data, language=google_lang)
+            if can_split() and duration_seconds(audio_data) > app.config['SPEECH_CHUNK_SECONDS']:
+                text = recognize_long_audio(audio_data, language)
+            else:
+                text = recognize_google(audio_data, language)
             logger.info(f"Speech recognition successful: {text}")
+            # Only real recognitions are cached, never mock fallbacks
+            TRANSCRIPT_CACHE.put((audio_key,) + tuple(cache_keys), text)
+            metrics.set_outcome('recognized')
             return text
         except sr.UnknownValueError:
             logger.warning("Could not understand audio")
-            return get_mock_transcript(language)
+            return mock_transcript_fallback(language, 'unknown_value')
+        except UpstreamError as e:
+            logger.warning(f"Skipping speech recognition: {e}")
+            return mock_transcript_fallback(language, e.reason)
         except sr.RequestError as e:
             logger.error(f"Google Speech Recognition error: {e}")
-            return get_mock_transcript(language)
+            return mock_transcript_fallback(language, 'request_error')
             
     except Exception as e:
         logger.error(f"Error in speech recognition: {str(e)}")
-        return get_mock_transcript(language)
+        return mock_transcript_fallback(language, 'error')
+
+def recognize_google(audio_data, language):
+    """Send one clip to Google Speech Recognition through SPEECH_UPSTREAM"""
+    r = sr.Recognizer()
+    r.operation_timeout = SPEECH_UPSTREAM.timeout
+    return SPEECH_UPSTREAM.call(r.recognize_google, audio_data,
+                                language=GOOGLE_LANGUAGES.get(language, 'en-IN'))
+
+def split_audio(audio_data):
+    """Split decoded audio into chunks at pauses for concurrent recognition"""
+    return split_on_silence(audio_data,
+                            min_silence_ms=app.config['SPEECH_MIN_SILENCE_MS'],
+                            max_chunk_seconds=app.config['SPEECH_CHUNK_SECONDS'])
+
+def recognize_chunk(chunk, language):
+    """
+    Recognize one AudioChunk. Returns '' when the chunk holds no speech and
+    None when recognition failed, so one bad chunk never sinks the recording.
+    """
+    token = metrics.begin_stage()
+    start = time.perf_counter()
+    key = TRANSCRIPT_CACHE.key(chunk.audio.frame_data, language)
+    text = TRANSCRIPT_CACHE.get(key)
+    if text is not None:
+        metrics.set_outcome('hit')
+    else:
+        try:
+            text = recognize_google(chunk.audio, language)
+            TRANSCRIPT_CACHE.put((key,), text)
+            metrics.set_outcome('recognized')
+        except sr.UnknownValueError:
+            text = ''
+            metrics.set_outcome('empty')
+        except UpstreamError as e:
+            logger.warning(f"Skipping speech recognition for chunk {chunk.index}: {e}")
+            FALLBACK_EVENTS.inc('speech_chunk', e.reason)
+            metrics.set_outcome('error')
+            text = None
+        except Exception as e:
+            logger.error(f"Speech recognition failed for chunk {chunk.index}: {str(e)}")
+            FALLBACK_EVENTS.inc('speech_chunk', 'request_error')
+            metrics.set_outcome('error')
+            text = None
+    observe_stage(time.perf_counter() - start, 'speech_chunk', language, metrics.end_stage(token))
+    return text
+
+def recognize_long_audio(audio_data, language):
+    """Recognize a long recording chunk by chunk, concurrently, and join the text"""
+    chunks = split_audio(audio_data)
+    logger.info(f"Recognizing {duration_seconds(audio_data):.1f}s of audio in {len(chunks)} chunks")
+    results = list(recognize_chunks(chunks, lambda chunk: recognize_chunk(chunk, language), SPEECH_EXECUTOR))
+    texts = [text for _, text in results if text]
+    if texts:
+        return ' '.join(texts)
+    if any(text is None for _, text in results):
+        raise sr.RequestError("recognition failed for every chunk")
+    raise sr.UnknownValueError()
 
 def get_mock_transcript(language):
     """Get mock transcript for demonstration"""
@@ -206,9 +526,28 @@ def get_mock_transcript(language):
 
 def extract_intent_with_gemini(text, language):
     """Extract job search intent using Gemini AI"""
-    if not model:
+    if not get_gemini_model():
+        FALLBACK_EVENTS.inc('intent_extraction', 'not_configured')
+        metrics.set_outcome('fallback')
         return extract_intent_fallback(text, language)
     
+    # Near-identical transcripts share one cached (or in-flight) Gemini call;
+    # the outcome stays 'hit' unless this request is the one calling Gemini
+    metrics.set_outcome('hit')
+    key = INTENT_CACHE.key(text, language)
+    intent = INTENT_CACHE.get_or_compute(key, lambda: query_gemini_intent(text, language))
+    if intent is None:
+        FALLBACK_EVENTS.inc('intent_extraction', 'gemini_error')
+        metrics.set_outcome('fallback')
+        return extract_intent_fallback(text, language)
+    
+    intent = dict(intent)
+    intent['original_text'] = text
+    return intent
+
+def query_gemini_intent(text, language):
+    """Ask Gemini for the intent of a transcript; returns None if that fails"""
+    metrics.set_outcome('gemini')
     try:
         prompt = f"""
         Analyze this job search request and extract the key information:
@@ -232,7 +571,8 @@ def extract_intent_with_gemini(text, language):
         If the text is in a regional Indian language, translate the job role and location to English for matching purposes.
         """
         
-        response = model.generate_content(prompt)
+        # The client has no timeout option; GEMINI_UPSTREAM enforces the deadline
+        response = GEMINI_UPSTREAM.call(get_gemini_model().generate_content, prompt)
         
         # Try to parse JSON from response
         response_text = response.text.strip()
@@ -247,229 +587,573 @@ def extract_intent_with_gemini(text, language):
             return intent
         else:
             logger.warning("Could not parse JSON from Gemini response")
-            return extract_intent_fallback(text, language)
+            return None
             
+    except UpstreamError as e:
+        logger.warning(f"Skipping Gemini intent extraction: {e}")
+        return None
     except Exception as e:
         logger.error(f"Error with Gemini intent extraction: {str(e)}")
-        return extract_intent_fallback(text, language)
+        return None
 
 def extract_intent_fallback(text, language):
     """Fallback intent extraction using keyword matching"""
-    text_lower = text.lower()
-    
-    # Job role keywords for different languages
-    job_keywords = {
-        'en': {
-            'software developer': ['developer', 'programmer', 'software engineer'],
-            'data analyst': ['data analyst', 'analyst'],
-            'marketing manager': ['marketing', 'manager'],
-            'graphic designer': ['designer', 'graphic'],
-            'sales executive': ['sales', 'executive'],
-            'customer service': ['customer service', 'support'],
-            'web developer': ['web developer', 'web designer'],
-            'content writer': ['content writer', 'writer']
-        },
-        'hi': {
-            'software developer': ['डेवलपर', 'प्रोग्रामर', 'सॉफ्टवेयर इंजीनियर'],
-            'data analyst': ['डेटा एनालिस्ट', 'एनालिस्ट'],
-            'marketing manager': ['मार्केटिंग', 'मैनेजर'],
-            'graphic designer': ['डिजाइनर', 'ग्राफिक'],
-            'sales executive': ['सेल्स', 'बिक्री'],
-            'customer service': ['ग्राहक सेवा', 'सपोर्ट']
-        }
-    }
-    
-    # Location keywords
-    location_keywords = {
-        'en': ['bangalore', 'delhi', 'mumbai', 'chennai', 'hyderabad', 'pune'],
-        'hi': ['बैंगलोर', 'दिल्ली', 'मुंबई', 'चेन्नई', 'हैदराबाद', 'पुणे'],
-        'ta': ['பெங்களூர்', 'டெல்லி', 'மும்பை', 'சென்னை', 'ஹைதராபாத்'],
-        'te': ['బెంగళూరు', 'ఢిల్లీ', 'ముంబై', 'చెన్నై', 'హైదరాబాద్'],
-        'mr': ['बेंगळुरू', 'दिल्ली', 'मुंबई', 'चेन्नई', 'हैदराबाद', 'पुणे']
-    }
-    
-    # Extract job role
-    job_role = ""
-    lang_jobs = job_keywords.get(language, job_keywords['en'])
-    for role, keywords in lang_jobs.items():
-        if any(keyword.lower() in text_lower for keyword in keywords):
-            job_role = role
-            break
-    
-    # Extract location
-    location = ""
-    lang_locations = location_keywords.get(language, location_keywords['en'])
-    for loc in lang_locations:
-        if loc.lower() in text_lower:
-            # Map to English location names
-            location_map = {
-                'बैंगलोर': 'bangalore', 'दिल्ली': 'delhi', 'मुंबई': 'mumbai',
-                'चेन्नई': 'chennai', 'हैदराबाद': 'hyderabad', 'पुणे': 'pune',
-                'பெங்களூர்': 'bangalore', 'டெல்லி': 'delhi', 'மும்பை': 'mumbai',
-                'சென்னை': 'chennai', 'ஹைதராபாத்': 'hyderabad',
-                'బెంగళూరు': 'bangalore', 'ఢిల్లీ': 'delhi', 'ముంబై': 'mumbai',
-                'చెన్నై': 'chennai', 'హైదరాబాద్': 'hyderabad',
-                'बेंगळुरू': 'bangalore', 'दिल्ली': 'delhi', 'मुंबई': 'mumbai',
-                'चेन्नई': 'chennai', 'हैदराबाद': 'hyderabad', 'पुणे': 'pune'
-            }
-            location = location_map.get(loc.lower(), loc.lower())
-            break
-    
-    return {
-        "job_role": job_role,
-        "location": location,
-        "skills": [],
-        "original_text": text
-    }
+    intent = INTENT_MATCHER.extract(text, language)
+    intent["original_text"] = text
+    return intent
 
 def find_matching_jobs(intent):
     """Find jobs matching the extracted intent"""
-    job_role = intent.get('job_role', '').lower()
-    location = intent.get('location', '').lower()
-    skills = intent.get('skills', [])
-    
-    matching_jobs = []
+    # Scores title (5/3), location (3), skills (2) and description words (0.5)
+    # from the inverted index instead of scanning every job
+    snapshot = job_snapshot()
+    key = JobSearchIndex.match_key(intent)
+    if snapshot.semantic is not None:
+        key += (semantic_index.intent_text(intent),)
+    cached = SEARCH_CACHE.get(snapshot.version, ('match',) + key)
+    if cached is not None:
+        return [snapshot.index.get(job_id) for job_id in cached[0]]
     
-    for job in JOB_DATABASE:
-        score = 0
-        
-        # Match job title
-        if job_role:
-            if job_role in job['title'].lower():
-                score += 5
-            elif any(word in job['title'].lower() for word in job_role.split()):
-                score += 3
-        
-        # Match location
-        if location:
-            if location in job['location'].lower():
-                score += 3
-        
-        # Match skills
-        for skill in skills:
-            if any(skill.lower() in job_skill.lower() for job_skill in job.get('skills', [])):
-                score += 2
-        
-        # Match description keywords
-        search_text = intent.get('original_text', '').lower()
-        for word in search_text.split():
-            if len(word) > 3 and word in job['description'].lower():
-                score += 0.5
-        
-        if score > 0:
-            matching_jobs.append((job, score))
-    
-    # Sort by score and return top matches
-    matching_jobs.sort(key=lambda x: x[1], reverse=True)
-    return [job for job, score in matching_jobs[:10]]
+    semantic_scores = None
+    if snapshot.semantic is not None:
+        # Cosine similarity of the closest jobs, scaled onto the lexical weights;
+        # below the floor a job is no closer than unrelated text would be
+        hits = snapshot.semantic.top_k(semantic_index.intent_text(intent),
+                                       k=app.config['SEMANTIC_CANDIDATES'],
+                                       min_similarity=app.config['SEMANTIC_MIN_SIMILARITY'])
+        semantic_scores = {job_id: app.config['SEMANTIC_WEIGHT'] * similarity
+                           for job_id, similarity in hits}
+    jobs = [job for job, score in snapshot.index.match(intent, limit=10, extra_scores=semantic_scores)]
+    SEARCH_CACHE.put(snapshot.version, ('match',) + key, [job['id'] for job in jobs])
+    return jobs
 
 def generate_audio_response(text, language):
-    """Generate audio response (mock implementation)"""
+    """Generate audio response, reusing the cached file for a repeated phrase"""
     try:
-        filename = f"{uuid.uuid4()}.mp3"
-        filepath = os.path.join(app.config['AUDIO_FOLDER'], filename)
-        
-        # Create a simple text file as mock audio (in production, use TTS)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"Mock TTS Audio: {text} (Language: {language})")
-        
+        filename = AUDIO_CACHE.get_or_synthesize(text, language, app.config['TTS_VOICE'])
         return f"/api/audio/{filename}"
     except Exception as e:
         logger.error(f"Error generating audio response: {str(e)}")
+        metrics.set_outcome('error')
         return None
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
+    semantic = JOB_SNAPSHOTS.current().semantic
     return jsonify({
         "status": "healthy", 
         "timestamp": datetime.now().isoformat(),
-        "gemini_configured": model is not None
+        "gemini_configured": bool(GEMINI_API_KEY) or model is not None,
+        "voice_tasks": VOICE_TASKS.stats(),
+        "transcript_cache": TRANSCRIPT_CACHE.stats(),
+        "intent_cache": INTENT_CACHE.stats(),
+        "search_cache": SEARCH_CACHE.stats(),
+        "shared_state": SHARED_STATE.stats() if SHARED_STATE is not None else None,
+        "profiler": PROFILER.stats() if PROFILER is not None else None,
+        "audio_cache": AUDIO_CACHE.stats(),
+        "job_snapshot": JOB_SNAPSHOTS.stats(),
+        "match_mode": "hybrid" if semantic is not None else "lexical",
+        "semantic_index": semantic.stats() if semantic is not None else None,
+        "upstreams": {upstream.name: upstream.stats() for upstream in (SPEECH_UPSTREAM, GEMINI_UPSTREAM)},
+        "startup_ms": _startup_timings,
+        "lazy_imports_ms": lazy_imports.import_times()
     })
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 503 until startup finished, while draining, or if the job store is unreachable"""
+    checks = {"started": _ready.is_set(), "draining": _draining.is_set()}
+    try:
+        job_snapshot()
+        checks["job_store"] = True
+    except Exception as e:
+        logger.error(f"Readiness check failed: {str(e)}")
+        checks["job_store"] = False
+    
+    ready = checks["started"] and not checks["draining"] and checks["job_store"]
+    return jsonify({"ready": ready, "checks": checks}), 200 if ready else 503
+
+def start_background_work():
+    """Start this process's background threads; gunicorn calls it in each worker after fork"""
+    # Keep the indexes warm between requests, on store notifications where available
+    JOB_SNAPSHOTS.watch(poll_interval=app.config['JOB_SNAPSHOT_POLL_SECONDS'])
+    METRICS.start_flushing()
+
+def begin_shutdown():
+    """Fail the readiness probe so load balancers stop routing new requests here"""
+    _draining.set()
+
+def shutdown():
+    """Drain background work and release resources before the process exits"""
+    begin_shutdown()
+    logger.info("Shutting down: finishing queued voice tasks and batch work")
+    VOICE_TASKS.shutdown(wait=True)
+    BATCH_EXECUTOR.shutdown(wait=True)
+    SPEECH_EXECUTOR.shutdown(wait=True)
+    SPEECH_UPSTREAM.shutdown()
+    GEMINI_UPSTREAM.shutdown()
+    if _decode_pool is not None:
+        _decode_pool.shutdown(wait=True)
+    JOB_SNAPSHOTS.stop()
+    JOB_STORE.close()
+    VOICE_TASKS.state.close()
+    if SHARED_STATE is not None and SHARED_STATE is not VOICE_TASKS.state:
+        SHARED_STATE.close()
+    METRICS.close()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    metrics.begin_request()
+
+@app.after_request
+def record_request_duration(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        language, outcome = metrics.end_request(failed=response.status_code >= 500)
+        REQUEST_DURATION.observe(time.perf_counter() - started, route, request.method,
+                                 str(response.status_code), language, outcome)
+    return response
+
+# Per-request cProfile, only when a token or sample rate turns it on; otherwise
+# no hooks are installed and requests pay nothing
+PROFILER = None
+if app.config['PROFILE_SAMPLE_RATE'] > 0 and not app.config['PROFILE_TOKEN']:
+    # Stored profiles are only listed and downloaded with the token, so
+    # sampling without one would fill PROFILE_DIR with unreachable files
+    logger.warning("PROFILE_SAMPLE_RATE is ignored: set PROFILE_TOKEN to sample requests "
+                   "and read the profiles from /api/admin/profiles")
+    app.config['PROFILE_SAMPLE_RATE'] = 0.0
+if app.config['PROFILE_TOKEN']:
+    PROFILER = RequestProfiler(app.config['PROFILE_DIR'],
+                               sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+                               token=app.config['PROFILE_TOKEN'],
+                               prefixes=[prefix.strip() for prefix in app.config['PROFILE_PATHS'].split(',')
+                                         if prefix.strip()],
+                               max_bytes=app.config['PROFILE_MAX_BYTES'],
+                               max_files=app.config['PROFILE_MAX_FILES'])
+
+def start_profile():
+    trigger = PROFILER.trigger(request.path, request.headers.get('X-Profile'))
+    if trigger:
+        profile = PROFILER.start()
+        if profile is not None:
+            g.profile = (profile, trigger, time.perf_counter())
+
+def finish_profile(response):
+    """Store the request's profile and name it in the X-Profile-Id header"""
+    entry = g.pop('profile', None)
+    if entry is not None:
+        profile, trigger, started = entry
+        profile.disable()
+        profile_id = PROFILER.save(profile, {
+            "method": request.method,
+            "path": request.path,
+            "route": request.url_rule.rule if request.url_rule else None,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "trigger": trigger,
+            "started_at": datetime.now().isoformat(),
+            "pid": os.getpid(),
+        })
+        if profile_id:
+            response.headers['X-Profile-Id'] = profile_id
+    return response
+
+def discard_profile(exc):
+    """Stop a profile left running by a request that raised"""
+    entry = g.pop('profile', None)
+    if entry is not None:
+        entry[0].disable()
+
+if PROFILER is not None:
+    app.before_request(start_profile)
+    app.after_request(finish_profile)
+    app.teardown_request(discard_profile)
+
+def _collect_cache_metrics():
+    """Cache counters from /api/health in Prometheus form, read at scrape time"""
+    lines = []
+    caches = (('transcript', TRANSCRIPT_CACHE.stats()),
+              ('intent', INTENT_CACHE.stats()),
+              ('audio', AUDIO_CACHE.stats()))
+    for name, help_text in (('hits', 'Cache hits'), ('misses', 'Cache misses')):
+        lines.append(f"# HELP vocawork_cache_{name}_total {help_text}")
+        lines.append(f"# TYPE vocawork_cache_{name}_total counter")
+        for cache, stats in caches:
+            lines.append(f'vocawork_cache_{name}_total{{cache="{cache}"}} {stats[name]}')
+    return lines
+
+METRICS.add_collector(_collect_cache_metrics)
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text exposition of request, stage and cache metrics"""
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+def _timed(timings, stage, language, fn, *args):
+    """
+    Call fn(*args), record its wall time in milliseconds under stage and
+    observe it in the stage histogram with the outcome fn reported
+    """
+    token = metrics.begin_stage()
+    start = time.perf_counter()
+    failed = True
+    try:
+        result = fn(*args)
+        failed = False
+        return result
+    finally:
+        elapsed = time.perf_counter() - start
+        outcome = metrics.end_stage(token)
+        observe_stage(elapsed, stage, language, 'error' if failed else outcome)
+        timings[stage] = round(elapsed * 1000, 2)
+
+def observe_stage(elapsed, stage, language, outcome):
+    """Observe a finished stage and count its outcome towards the current request's"""
+    STAGE_DURATION.observe(elapsed, stage, language, outcome)
+    metrics.note_stage(language, outcome)
+
+def transcribe(audio_bytes, language, timings, decode=convert_audio):
+    """Decode and recognize uploaded audio, skipping both for an already seen upload"""
+    start = time.perf_counter()
+    upload_key = TRANSCRIPT_CACHE.key(audio_bytes, language)
+    transcript = TRANSCRIPT_CACHE.get(upload_key, count_miss=False)
+    if transcript is None:
+        audio_data = _timed(timings, 'audio_decode', language, decode, audio_bytes)
+        audio_data = _timed(timings, 'audio_preprocess', language, preprocess_for_recognition, audio_data)
+        transcript = _timed(timings, 'speech_to_text', language, speech_to_text_with_sr,
+                            audio_data, language, (upload_key,))
+    else:
+        logger.info("Transcript cache hit for uploaded audio")
+        observe_stage(time.perf_counter() - start, 'speech_to_text', language, 'hit')
+    return transcript
+
+def run_voice_pipeline(audio_bytes, language):
+    """Run decoding, speech-to-text, intent extraction, matching and TTS on uploaded audio"""
+    timings = {}
+    started = time.perf_counter()
+    
+    # 1. Convert speech to text
+    transcript = transcribe(audio_bytes, language, timings)
+    logger.info(f"Transcript: {transcript}")
+    
+    return complete_voice_pipeline(transcript, language, timings, started)
+
+def complete_voice_pipeline(transcript, language, timings, started):
+    """Intent extraction, matching and TTS for a finished transcript"""
+    # 2. Extract intent using Gemini AI
+    intent = _timed(timings, 'intent_extraction', language, extract_intent_with_gemini, transcript, language)
+    logger.info(f"Extracted intent: {intent}")
+    
+    # 3. Find matching jobs
+    matching_jobs = _timed(timings, 'job_matching', language, find_matching_jobs, intent)
+    logger.info(f"Found {len(matching_jobs)} matching jobs")
+    
+    # 4. Generate audio response
+    if matching_jobs:
+        response_text = f"Found {len(matching_jobs)} jobs for you"
+    else:
+        response_text = "No matching jobs found"
+    audio_url = _timed(timings, 'audio_response', language, generate_audio_response, response_text, language)
+    
+    timings['total'] = round((time.perf_counter() - started) * 1000, 2)
+    
+    return {
+        "transcript": transcript,
+        "intent": intent,
+        "jobs": matching_jobs,
+        "audio_url": audio_url,
+        "timings_ms": timings
+    }
+
+def sse_event(event, data):
+    """Format one server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def stream_voice_pipeline(audio_bytes, language):
+    """
+    Yield server-sent events for uploaded audio: the chunk plan, then a
+    partial transcript with keyword-matched jobs as each chunk is recognized
+    in order, then the same result run_voice_pipeline returns
+    """
+    timings = {}
+    started = time.perf_counter()
+    try:
+        upload_key = TRANSCRIPT_CACHE.key(audio_bytes, language)
+        transcript = TRANSCRIPT_CACHE.get(upload_key, count_miss=False)
+        if transcript is None:
+            audio_data = _timed(timings, 'audio_decode', language, convert_audio, audio_bytes)
+            audio_data = _timed(timings, 'audio_preprocess', language, preprocess_for_recognition, audio_data)
+            if audio_data is None:
+                transcript = mock_transcript_fallback(language, 'undecodable_audio')
+            else:
+                transcript = yield from stream_transcript(audio_data, language, timings, upload_key)
+        
+        yield sse_event('result', complete_voice_pipeline(transcript, language, timings, started))
+    except Exception as e:
+        logger.error(f"Error streaming voice request: {str(e)}", exc_info=True)
+        yield sse_event('error', {"error": str(e)})
+
+def stream_transcript(audio_data, language, timings, upload_key):
+    """Recognize chunks concurrently, yielding partial events; returns the transcript"""
+    start = time.perf_counter()
+    chunks = split_audio(audio_data)
+    yield sse_event('chunks', {
+        "duration": round(duration_seconds(audio_data), 2),
+        "chunks": [{"index": c.index, "start": c.start, "end": c.end} for c in chunks]
+    })
+    
+    texts = []
+    failed = 0
+    for chunk, text in recognize_chunks(chunks, lambda chunk: recognize_chunk(chunk, language), SPEECH_EXECUTOR):
+        if text is None:
+            failed += 1
+        elif text:
+            texts.append(text)
+        partial = {"index": chunk.index, "start": chunk.start, "end": chunk.end,
+                   "text": text, "transcript": ' '.join(texts)}
+        if text:
+            # Cheap keyword match on the transcript so far; Gemini runs once at the end
+            partial["intent"] = extract_intent_fallback(partial["transcript"], language)
+            partial["jobs"] = find_matching_jobs(partial["intent"])
+        yield sse_event('partial', partial)
+    elapsed = time.perf_counter() - start
+    timings['speech_to_text'] = round(elapsed * 1000, 2)
+    observe_stage(elapsed, 'speech_to_text', language, 'streamed')
+    
+    if texts:
+        transcript = ' '.join(texts)
+        TRANSCRIPT_CACHE.put((TRANSCRIPT_CACHE.key(audio_data.frame_data, language), upload_key), transcript)
+        return transcript
+    return mock_transcript_fallback(language, 'request_error' if failed else 'unknown_value')
+
+def decode_in_process_pool(audio_bytes):
+    """
+    Decode audio for a batch item: PCM WAV in this thread, compressed formats
+    on the shared process pool. Raises AudioDecodeError on bad input.
+    """
+    audio = decode_pcm_wav(audio_bytes)
+    if audio is not None:
+        return audio
+    if not _decode_processes:
+        return decode_audio(audio_bytes)
+    
+    global _decode_pool
+    if _decode_pool is None:
+        with _decode_pool_lock:
+            if _decode_pool is None:
+                # Forking this multi-threaded process could copy a lock held by
+                # another thread into the decoder; start decoders fresh instead
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                context = multiprocessing.get_context(method)
+                if method == 'forkserver':
+                    # Decoders need only audio_io; the default preload is __main__
+                    context.set_forkserver_preload(['audio_io'])
+                _decode_pool = ProcessPoolExecutor(max_workers=_decode_processes, mp_context=context)
+    return _decode_pool.submit(decode_audio, audio_bytes).result()
+
+def process_batch_item(item):
+    """Transcribe and match one batch item; failures are reported on the item only"""
+    timings = {}
+    started = time.perf_counter()
+    result = {"index": item.index, "filename": item.filename, "language": item.language}
+    try:
+        transcript = transcribe(item.audio_bytes, item.language, timings, decode=decode_in_process_pool)
+        intent = _timed(timings, 'intent_extraction', item.language, extract_intent_with_gemini,
+                        transcript, item.language)
+        matching_jobs = _timed(timings, 'job_matching', item.language, find_matching_jobs, intent)
+        result.update({"transcript": transcript, "intent": intent, "jobs": matching_jobs})
+    except Exception as e:
+        logger.error(f"Error processing batch item {item.filename}: {str(e)}")
+        result["error"] = str(e)
+    timings['total'] = round((time.perf_counter() - started) * 1000, 2)
+    result["timings_ms"] = timings
+    return result
+
+def get_audio_upload():
+    """Return (file, error_response) for the 'audio' field of the request"""
+    if 'audio' not in request.files:
+        return None, (jsonify({"error": "No audio file provided"}), 400)
+    
+    file = request.files['audio']
+    if file.filename == '':
+        return None, (jsonify({"error": "No audio file selected"}), 400)
+    
+    if not allowed_file(file.filename):
+        return None, (jsonify({"error": f"File type not allowed. Supported types: {', '.join(ALLOWED_EXTENSIONS)}"}), 400)
+    
+    return file, None
+
 @app.route('/api/process-voice', methods=['POST'])
 def process_voice():
     """Process voice input to search for jobs"""
     try:
-        # Check if audio file is present
-        if 'audio' not in request.files:
-            return jsonify({"error": "No audio file provided"}), 400
-        
-        file = request.files['audio']
-        if file.filename == '':
-            return jsonify({"error": "No audio file selected"}), 400
-        
-        if not allowed_file(file.filename):
-            return jsonify({"error": f"File type not allowed. Supported types: {', '.join(ALLOWED_EXTENSIONS)}"}), 400
+        file, error = get_audio_upload()
+        if error:
+            return error
         
         # Get parameters
         language = request.form.get('language', 'en')
         
-        # Save the file temporarily
-        filename = secure_filename(f"{uuid.uuid4()}_{file.filename}")
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        logger.info(f"Processing audio file: {filename} in language: {language}")
-        
-        # 1. Convert speech to text
-        transcript = speech_to_text_with_sr(filepath, language)
-        logger.info(f"Transcript: {transcript}")
+        # Read the upload into memory; it is decoded without touching disk
+        audio_bytes = file.read()
+        logger.info(f"Processing audio file: {file.filename} ({len(audio_bytes)} bytes) in language: {language}")
         
-        # 2. Extract intent using Gemini AI
-        intent = extract_intent_with_gemini(transcript, language)
-        logger.info(f"Extracted intent: {intent}")
+        return jsonify(run_voice_pipeline(audio_bytes, language))
         
-        # 3. Find matching jobs
-        matching_jobs = find_matching_jobs(intent)
-        logger.info(f"Found {len(matching_jobs)} matching jobs")
+    except Exception as e:
+        logger.error(f"Error processing voice request: {str(e)}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/process-voice/stream', methods=['POST'])
+def process_voice_stream():
+    """Process voice input, streaming partial transcripts and matches as server-sent events"""
+    file, error = get_audio_upload()
+    if error:
+        return error
+    
+    language = request.form.get('language', 'en')
+    audio_bytes = file.read()
+    logger.info(f"Streaming audio file: {file.filename} ({len(audio_bytes)} bytes) in language: {language}")
+    
+    return Response(stream_with_context(stream_voice_pipeline(audio_bytes, language)),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/process-voice/batch', methods=['POST'])
+def process_voice_batch():
+    """Process many audio files (or zip archives of them) and stream NDJSON results"""
+    try:
+        files = request.files.getlist('audio') + request.files.getlist('archive')
+        languages = parse_languages(request.form.get('languages'))
+        items = collect_items(files, languages,
+                              default_language=request.form.get('language', 'en'),
+                              is_allowed=allowed_file,
+                              max_items=app.config['BATCH_MAX_ITEMS'],
+                              max_item_bytes=app.config['BATCH_MAX_ITEM_BYTES'],
+                              max_total_bytes=app.config['BATCH_MAX_BYTES'])
+    except BatchError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    logger.info(f"Processing voice batch of {len(items)} items")
+    
+    return Response(stream_with_context(stream_results(items, process_batch_item, BATCH_EXECUTOR)),
+                    mimetype='application/x-ndjson')
+
+@app.route('/api/process-voice/tasks', methods=['POST'])
+def submit_voice_task():
+    """Queue voice input for background processing and return a task id"""
+    try:
+        file, error = get_audio_upload()
+        if error:
+            return error
         
-        # 4. Generate audio response
-        if matching_jobs:
-            response_text = f"Found {len(matching_jobs)} jobs for you"
-            audio_url = generate_audio_response(response_text, language)
-        else:
-            response_text = "No matching jobs found"
-            audio_url = generate_audio_response(response_text, language)
+        language = request.form.get('language', 'en')
+        audio_bytes = file.read()
         
-        # Clean up uploaded file
         try:
-            os.remove(filepath)
-            # Also remove converted WAV file if it exists
-            wav_path = filepath.rsplit('.', 1)[0] + '_converted.wav'
-            if os.path.exists(wav_path):
-                os.remove(wav_path)
-        except:
-            pass
+            task = VOICE_TASKS.submit(run_voice_pipeline, audio_bytes, language)
+        except QueueFullError as e:
+            return jsonify({"error": str(e)}), 503
         
-        return jsonify({
-            "transcript": transcript,
-            "intent": intent,
-            "jobs": matching_jobs,
-            "audio_url": audio_url
-        })
+        logger.info(f"Queued voice task {task.id} for {file.filename} in language: {language}")
         
+        response = task.to_dict()
+        response["status_url"] = f"/api/process-voice/tasks/{task.id}"
+        response["events_url"] = f"/api/process-voice/tasks/{task.id}/events"
+        return jsonify(response), 202
+    
     except Exception as e:
-        logger.error(f"Error processing voice request: {str(e)}", exc_info=True)
+        logger.error(f"Error queueing voice request: {str(e)}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/process-voice/tasks/<task_id>', methods=['GET'])
+def get_voice_task(task_id):
+    """Poll the status and result of a voice task"""
+    task = VOICE_TASKS.get(task_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    return jsonify(task.to_dict())
+
+@app.route('/api/process-voice/tasks/<task_id>/events', methods=['GET'])
+def stream_voice_task(task_id):
+    """Stream status changes of a voice task as server-sent events"""
+    task = VOICE_TASKS.get(task_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    
+    def events():
+        current = task
+        yield sse_event(current.status, current.to_dict())
+        while not current.done:
+            latest = VOICE_TASKS.wait_for_change(current, timeout=15)
+            if latest is None:
+                return
+            if latest.version == current.version:
+                # Keep idle connections from being closed by proxies
+                yield ": keep-alive\n\n"
+                continue
+            current = latest
+            yield sse_event(current.status, current.to_dict())
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/jobs', methods=['GET'])
 def get_jobs():
-    """Get all jobs or filter by query parameters"""
+    """
+    Get jobs, optionally filtered, sorted, projected and paginated.
+    
+    Without limit or cursor the response is the full JSON array; with either,
+    it is a page {"jobs", "total", "next_cursor"}. Both are streamed and carry
+    an ETag derived from the job store version.
+    """
     query = request.args.get('query', '').lower()
     location = request.args.get('location', '').lower()
+    sort = request.args.get('sort', 'catalogue')
+    cursor = request.args.get('cursor')
+    paginated = cursor is not None or 'limit' in request.args
     
-    filtered_jobs = JOB_DATABASE.copy()
+    try:
+        fields = parse_fields(request.args.get('fields'))
+        limit = parse_limit(request.args.get('limit')) if paginated else None
+        after = decode_cursor(cursor, sort) if cursor else None
+        if sort not in SORT_ORDERS:
+            raise ListingError(f"sort must be one of: {', '.join(SORT_ORDERS)}")
+    except ListingError as e:
+        return jsonify({"error": str(e)}), 400
     
-    if query:
-        filtered_jobs = [job for job in filtered_jobs if 
-                        query in job['title'].lower() or 
-                        query in job['description'].lower() or
-                        any(query in skill.lower() for skill in job['skills'])]
+    # Everything below reads one snapshot, so the ETag always matches the body
+    snapshot = job_snapshot()
+    etag = listing_etag(snapshot.version, request.args)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.headers['X-Catalogue-Version'] = str(snapshot.version)
+        return response
     
-    if location:
-        filtered_jobs = [job for job in filtered_jobs if location in job['location'].lower()]
+    key = ('page', query, location, sort, tuple(after) if after else None, limit)
+    cached = SEARCH_CACHE.get(snapshot.version, key)
+    if cached is not None:
+        ids, total, next_key = cached
+        jobs = [snapshot.index.get(job_id) for job_id in ids]
+    else:
+        jobs, total, next_key = snapshot.index.page(query=query, location=location, sort=sort,
+                                                    after=after, limit=limit)
+        SEARCH_CACHE.put(snapshot.version, key, [job['id'] for job in jobs], total, next_key)
+    if paginated:
+        next_cursor = encode_cursor(sort, next_key) if next_key is not None else None
+        body = stream_json_page(jobs, fields, total, next_cursor)
+    else:
+        body = stream_json_array(jobs, fields)
     
-    return jsonify(filtered_jobs)
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Catalogue-Version'] = str(snapshot.version)
+    return response
 
 @app.route('/api/jobs', methods=['POST'])
 def add_job():
@@ -494,21 +1178,61 @@ def add_job():
             job_data['skills'] = [skill.strip() for skill in job_data['skills'].split(',') if skill.strip()]
         
         # Add to database
-        JOB_DATABASE.append(job_data)
+        JOB_STORE.add(job_data)
+        snapshot = published_snapshot()
         
         logger.info(f"New job added: {job_data['title']} at {job_data['company']}")
         
-        return jsonify({"message": "Job added successfully", "job": job_data})
+        return jsonify({"message": "Job added successfully", "job": job_data, "version": snapshot.version})
     
     except Exception as e:
         logger.error(f"Error adding job: {str(e)}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/jobs/bulk', methods=['POST'])
+def bulk_add_jobs():
+    """Add jobs streamed as NDJSON or CSV and report rejected rows"""
+    try:
+        body_format = detect_format(request.mimetype, request.args.get('format'))
+    except IngestError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    try:
+        # Read the raw body incrementally; MAX_CONTENT_LENGTH is sized for audio uploads
+        stream = get_input_stream(request.environ, safe_fallback=False,
+                                  max_content_length=app.config['BULK_MAX_BYTES'])
+        rows = iter_csv(stream) if body_format == 'csv' else iter_ndjson(stream)
+        started = time.perf_counter()
+        report = ingest(rows, JOB_STORE, published_snapshot,
+                        batch_size=app.config['BULK_BATCH_SIZE'],
+                        max_errors=app.config['BULK_MAX_ERRORS'])
+        report.setdefault("version", JOB_SNAPSHOTS.version)
+        
+        logger.info(f"Bulk {body_format} load: {report['inserted']} inserted, "
+                    f"{report['duplicates']} duplicates, {report['rejected']} rejected "
+                    f"in {time.perf_counter() - started:.2f}s")
+        
+        if "error" not in report:
+            return jsonify(report), 200
+        # Batches before the error are already committed; 207 tells the
+        # client the load was partial rather than rejected
+        return jsonify(report), 207 if report["inserted"] else 400
+    
+    except Exception as e:
+        logger.error(f"Error in bulk job load: {str(e)}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/audio/<filename>')
 def serve_audio(filename):
     """Serve audio files"""
     try:
-        return send_from_directory(app.config['AUDIO_FOLDER'], filename)
+        # Phrases synthesized by another worker are copied from the shared state
+        if not os.path.exists(os.path.join(app.config['AUDIO_FOLDER'], filename)):
+            AUDIO_CACHE.fetch(filename)
+        
+        # File names are content hashes, so clients may cache them indefinitely;
+        # ETag and Range requests are handled by send_from_directory
+        return send_from_directory(app.config['AUDIO_FOLDER'], filename, max_age=365 * 24 * 60 * 60)
     except Exception as e:
         logger.error(f"Error serving audio file {filename}: {str(e)}")
         return jsonify({"error": "Audio file not found"}), 404
@@ -517,12 +1241,11 @@ def serve_audio(filename):
 def delete_job(job_id):
     """Delete a job by ID"""
     try:
-        global JOB_DATABASE
-        original_length = len(JOB_DATABASE)
-        JOB_DATABASE = [job for job in JOB_DATABASE if job['id'] != job_id]
+        deleted = JOB_STORE.delete(job_id)
+        snapshot = published_snapshot()
         
-        if len(JOB_DATABASE) < original_length:
-            return jsonify({"message": "Job deleted successfully"})
+        if deleted:
+            return jsonify({"message": "Job deleted successfully", "version": snapshot.version})
         else:
             return jsonify({"error": "Job not found"}), 404
     
@@ -530,9 +1253,51 @@ def delete_job(job_id):
         logger.error(f"Error deleting job: {str(e)}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+def _profiles_denied():
+    """Error response unless profiling is on and the request carries PROFILE_TOKEN"""
+    if PROFILER is None:
+        return jsonify({"error": "Profiling is not enabled"}), 404
+    if not PROFILER.authorized(request.headers.get('X-Profile')):
+        return jsonify({"error": "X-Profile header with the profiling token required"}), 403
+    return None
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_profiles():
+    """Stored request profiles, newest first"""
+    denied = _profiles_denied()
+    if denied:
+        return denied
+    
+    return jsonify({"profiles": PROFILER.list(), "profiler": PROFILER.stats()})
+
+@app.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """A stored profile as a pstats file, or as text with ?format=text&sort=&limit="""
+    denied = _profiles_denied()
+    if denied:
+        return denied
+    
+    path = PROFILER.path(profile_id)
+    if path is None:
+        return jsonify({"error": "Profile not found"}), 404
+    
+    if request.args.get('format') == 'text':
+        try:
+            limit = int(request.args.get('limit', 40))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        report = PROFILER.render(profile_id, request.args.get('sort', 'cumulative'), limit)
+        if report is None:
+            return jsonify({"error": "Profile not found"}), 404
+        return Response(report, mimetype='text/plain')
+    
+    return send_from_directory(PROFILER.directory, os.path.basename(path), as_attachment=True,
+                               mimetype='application/octet-stream')
+
 @app.errorhandler(413)
 def too_large(e):
-    return jsonify({"error": "File too large. Maximum size is 16MB."}), 413
+    limit = request.max_content_length
+    return jsonify({"error": f"File too large. Maximum size is {limit // (1024 * 1024)}MB."}), 413
 
 @app.errorhandler(404)
 def not_found(e):
@@ -542,6 +1307,27 @@ def not_found(e):
 def internal_error(e):
     return jsonify({"error": "Internal server error"}), 500
 
+def warm_up():
+    """
+    Load the lazily imported dependencies and the Gemini client and exercise
+    the audio and matching paths once, so the first voice request does not pay
+    for them. Runs at startup with WARM_UP=true (before fork under gunicorn).
+    """
+    started = time.perf_counter()
+    lazy_imports.load(sr, pydub)
+    get_gemini_model()
+    convert_audio(MockTTSBackend().synthesize('', 'en'))
+    find_matching_jobs(extract_intent_fallback(get_mock_transcript('en'), 'en'))
+    _startup_timings["warm_up"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Warm-up finished in {_startup_timings['warm_up']}ms")
+
+if app.config['WARM_UP']:
+    warm_up()
+
+_startup_timings["total"] = round((time.perf_counter() - _startup_started) * 1000, 1)
+logger.info(f"Startup took {_startup_timings['total']}ms (imports {_startup_timings['imports']}ms)")
+_ready.set()
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     host = os.environ.get('HOST', '0.0.0.0')
@@ -549,6 +1335,7 @@ if __name__ == '__main__':
     
     logger.info(f"Starting Vocawork backend on {host}:{port}")
     logger.info(f"Debug mode: {debug}")
-    logger.info(f"Gemini AI: {'Configured' if model else 'Not configured (using fallback)'}")
+    logger.info(f"Gemini AI: {'Configured' if GEMINI_API_KEY else 'Not configured (using fallback)'}")
     
+    start_background_work()
     app.run(host=host, port=port, debug=debug)
\ No newline at end of file
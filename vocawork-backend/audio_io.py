@@ -0,0 +1,86 @@
+"""
+In-memory audio decoding for the voice pipeline.
+
+Uploads are decoded straight from their bytes into mono PCM wrapped in
+speech_recognition.AudioData, so nothing is written to disk. Uncompressed
+mono and stereo WAV is read and downmixed in-process with audioop, without
+pydub or ffmpeg; resampling is left to audio_preprocess.
+"""
+
+import io
+import wave
+
+from lazy_imports import lazy_import
+
+try:
+    import audioop
+except ImportError:
+    # Python 3.13+ without the audioop-lts backport: stereo WAV goes through
+    # pydub, and audio_preprocess and speech_stream (which import audioop from
+    # here) fall back as well
+    audioop = None
+
+sr = lazy_import('speech_recognition')
+pydub = lazy_import('pydub')
+
+
+
+class AudioDecodeError(Exception):
+    """Raised when uploaded bytes cannot be decoded as audio"""
+
+
+def read_pcm_wav(data):
+    """Return (frames, sample_rate, sample_width, channels) for PCM WAV bytes, else None"""
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            if wav.getcomptype() != 'NONE':
+                return None
+            return (wav.readframes(wav.getnframes()), wav.getframerate(),
+                    wav.getsampwidth(), wav.getnchannels())
+    except (wave.Error, EOFError):
+        return None
+
+
+def pcm_to_audio(pcm):
+    """AudioData for a read_pcm_wav result that needs neither pydub nor ffmpeg, else None"""
+    if not pcm or not (pcm[3] == 1 or (pcm[3] == 2 and audioop is not None)):
+        return None
+    frames, sample_rate, sample_width, channels = pcm
+    if channels == 2:
+        frames = downmix(frames, sample_width)
+    return sr.AudioData(frames, sample_rate, sample_width)
+
+
+def decode_pcm_wav(data):
+    """Mono AudioData for mono or stereo PCM WAV bytes, else None"""
+    return pcm_to_audio(read_pcm_wav(data))
+
+
+def decode_audio(data):
+    """Decode uploaded audio bytes into mono speech_recognition.AudioData"""
+    pcm = read_pcm_wav(data)
+    audio = pcm_to_audio(pcm)
+    if audio is not None:
+        return audio
+
+    try:
+        if pcm:
+            # Multichannel PCM WAV is still parsed in-process by pydub
+            segment = pydub.AudioSegment.from_file(io.BytesIO(data), format='wav')
+        else:
+            # Compressed formats are piped through ffmpeg's stdin/stdout
+            segment = pydub.AudioSegment.from_file(io.BytesIO(data))
+    except Exception as e:
+        raise AudioDecodeError(f"Could not decode audio: {str(e)}") from e
+
+    segment = segment.set_channels(1)
+    return sr.AudioData(segment.raw_data, segment.frame_rate, segment.sample_width)
+
+
+def downmix(frames, sample_width):
+    """Average the two channels of interleaved stereo PCM"""
+    if sample_width == 1:
+        # 8-bit WAV samples are unsigned; audioop works on signed ones
+        mono = audioop.tomono(audioop.bias(frames, 1, -128), 1, 0.5, 0.5)
+        return audioop.bias(mono, 1, 128)
+    return audioop.tomono(frames, sample_width, 0.5, 0.5)
@@ -0,0 +1,113 @@
+"""
+Preprocessing of decoded speech before recognition.
+
+The recognizer uploads whatever PCM it is given, so a 44.1 kHz 32-bit clip
+with five seconds of silence either side costs several times the bytes (and
+upstream time) of the speech in it. preprocess_audio reduces a decoded mono
+clip to what recognition needs: 16-bit samples at 16 kHz, leading and
+trailing silence trimmed, loudness normalized and (optionally) the length
+capped. Every step is an audioop operation over the whole sample buffer or
+large windows of it. Downmixing to mono happens earlier, in
+audio_io.decode_audio.
+
+audioop left the standard library in Python 3.13, where requirements.txt
+installs the audioop-lts backport; without either, audioop is None here and
+the app skips preprocessing.
+"""
+
+import math
+
+from audio_io import audioop
+from lazy_imports import lazy_import
+from speech_stream import FRAME_MS, frame_energies
+
+sr = lazy_import('speech_recognition')
+
+FULL_SCALE_16 = 32767
+# Frames quieter than this (about -60 dBFS) are silence however quiet the clip
+SILENCE_FLOOR_RMS = 32
+# Silence is measured over windows of this many frames, then the edges of the
+# speech are refined frame by frame
+TRIM_WINDOW_FRAMES = 10
+
+
+def _db_to_ratio(db):
+    return 10 ** (db / 20)
+
+
+def _trim_silence(frames, sample_rate, silence_db, padding_ms):
+    """frames without leading and trailing silence, keeping padding_ms either side"""
+    frame_bytes = int(sample_rate * FRAME_MS / 1000) * 2
+    window_bytes = frame_bytes * TRIM_WINDOW_FRAMES
+    energies = frame_energies(frames, window_bytes, 2)
+    if not energies:
+        return frames
+    threshold = max(max(energies) * _db_to_ratio(-silence_db), SILENCE_FLOOR_RMS)
+    first_window = next((i for i, energy in enumerate(energies) if energy > threshold), None)
+    if first_window is None:
+        return frames
+    last_window = next(i for i in range(len(energies) - 1, -1, -1) if energies[i] > threshold)
+
+    # A window above the threshold has at least one frame above it
+    head = frame_energies(frames[first_window * window_bytes:(first_window + 1) * window_bytes], frame_bytes, 2)
+    tail = frame_energies(frames[last_window * window_bytes:(last_window + 1) * window_bytes], frame_bytes, 2)
+    first = first_window * TRIM_WINDOW_FRAMES + next(i for i, energy in enumerate(head) if energy > threshold)
+    last = last_window * TRIM_WINDOW_FRAMES + max(i for i, energy in enumerate(tail) if energy > threshold)
+
+    padding = math.ceil(padding_ms / FRAME_MS)
+    start = max(0, first - padding) * frame_bytes
+    return frames[start:(last + 1 + padding) * frame_bytes]
+
+
+def _normalize(frames, target_dbfs, max_gain_db):
+    """Scale towards target_dbfs RMS, by at most max_gain_db and never past full scale"""
+    rms = audioop.rms(frames, 2)
+    peak = audioop.max(frames, 2)
+    if not rms or not peak:
+        return frames, 0.0
+    gain = min(FULL_SCALE_16 * _db_to_ratio(target_dbfs) / rms,
+               _db_to_ratio(max_gain_db),
+               FULL_SCALE_16 / peak)
+    if abs(gain - 1) < 0.05:
+        return frames, 0.0
+    return audioop.mul(frames, 2, gain), 20 * math.log10(gain)
+
+
+def preprocess_audio(audio_data, sample_rate=16000, trim_silence_db=30.0, trim_padding_ms=200,
+                     target_dbfs=-20.0, max_gain_db=20.0, max_seconds=0.0):
+    """
+    Return (AudioData, report) for mono AudioData. Clips below sample_rate
+    are not upsampled; trim_silence_db=0 keeps silence and max_seconds=0
+    keeps the full length. report holds the byte counts before and after
+    and what each step did; bytes are counted as 16-bit PCM, the width the
+    recognizer converts to before uploading.
+    """
+    frames = audio_data.frame_data
+    rate = audio_data.sample_rate
+    width = audio_data.sample_width
+    report = {"input_bytes": len(frames) // width * 2, "input_rate": rate, "input_width": width}
+
+    if width != 2:
+        if width == 1:
+            # 8-bit PCM is unsigned; audioop expects signed samples
+            frames = audioop.bias(frames, 1, -128)
+        frames = audioop.lin2lin(frames, width, 2)
+    if rate > sample_rate:
+        frames, _ = audioop.ratecv(frames, 2, 1, rate, sample_rate, None)
+        rate = sample_rate
+
+    untrimmed = len(frames)
+    if trim_silence_db:
+        frames = _trim_silence(frames, rate, trim_silence_db, trim_padding_ms)
+    report["trimmed_seconds"] = round((untrimmed - len(frames)) / (rate * 2), 3)
+
+    max_bytes = int(max_seconds * rate) * 2
+    report["truncated"] = bool(max_seconds) and len(frames) > max_bytes
+    if report["truncated"]:
+        frames = frames[:max_bytes]
+
+    frames, report["gain_db"] = _normalize(frames, target_dbfs, max_gain_db)
+    report["gain_db"] = round(report["gain_db"], 1)
+    report["output_bytes"] = len(frames)
+    report["output_rate"] = rate
+    return sr.AudioData(frames, rate, 2), report
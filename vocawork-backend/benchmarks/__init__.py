@@ -0,0 +1,10 @@
+"""
+Benchmarks and load tests for the Vocawork backend.
+
+Run from the vocawork-backend directory, e.g.:
+
+    python -m benchmarks.microbench --sizes 1000,100000 --output results/micro.json
+    python -m benchmarks.stub_server --port 5001
+    python -m benchmarks.loadgen --url http://localhost:5001 --output results/load.json
+    python -m benchmarks.startup --output results/startup.json
+"""
@@ -0,0 +1,108 @@
+"""
+Deterministic synthetic data: job postings, multilingual transcripts and audio clips.
+"""
+
+import io
+import math
+import random
+import struct
+import wave
+
+TITLES = [
+    "Software Developer", "Data Analyst", "Customer Service Representative",
+    "Marketing Manager", "Graphic Designer", "Sales Executive", "Web Developer",
+    "Content Writer", "Backend Engineer", "Frontend Developer", "HR Executive",
+    "Accountant", "Delivery Associate", "Nurse", "Electrician", "Teacher",
+]
+LOCATIONS = ["Bangalore", "Delhi", "Mumbai", "Chennai", "Hyderabad", "Pune", "Kolkata",
+             "Ahmedabad", "Jaipur", "Kochi", "Lucknow", "Indore"]
+SKILLS = ["JavaScript", "React", "Node.js", "MongoDB", "SQL", "Excel", "Python",
+          "Data Visualization", "Communication", "Problem Solving", "Customer Support",
+          "Digital Marketing", "SEO", "Content Strategy", "Analytics", "Photoshop",
+          "Illustrator", "UI/UX", "Branding", "Sales", "CRM", "Lead Generation", "HTML",
+          "CSS", "PHP", "WordPress", "Writing", "Research", "Tally", "Driving"]
+DESCRIPTION_WORDS = ("team experience looking candidate skilled growth clients develop build "
+                     "maintain support deliver quality customers digital platforms business "
+                     "opportunity training flexible shifts immediate joining required").split()
+COMPANIES = ["TechSolutions India", "Analytics Hub", "Global Services Ltd", "Creative Agency",
+             "Design Studio", "Business Solutions", "Digital Innovations", "Media House"]
+
+TRANSCRIPTS = {
+    'en': ["I need a software developer job in Bangalore",
+           "looking for data analyst work in Delhi with SQL and Excel",
+           "any web developer jobs in Pune",
+           "customer service job in Mumbai please",
+           "graphic designer with photoshop in Chennai"],
+    'hi': ["मुझे दिल्ली में डेटा एनालिस्ट की नौकरी चाहिए",
+           "बैंगलोर में सॉफ्टवेयर डेवलपर की नौकरी",
+           "मुंबई में सेल्स की नौकरी चाहिए"],
+    'ta': ["எனக்கு சென்னையில் டெவலப்பர் வேலை தேவை",
+           "பெங்களூர் மார்க்கெட்டிங் வேலை"],
+    'te': ["నాకు హైదరాబాద్‌లో సాఫ్ట్‌వేర్ ఇంజనీర్ ఉద్యోగం కావాలి",
+           "ముంబై లో సేల్స్ ఉద్యోగం"],
+    'mr': ["मला मुंबईत मार्केटिंग मॅनेजर पद हवे आहे",
+           "पुणे येथे डेव्हलपर नोकरी"],
+}
+
+
+def generate_jobs(count, seed=42):
+    """Yield count job dicts shaped like the API's jobs"""
+    rng = random.Random(seed)
+    for i in range(count):
+        title = rng.choice(TITLES)
+        skills = rng.sample(SKILLS, rng.randint(2, 5))
+        yield {
+            "id": f"bench-{i}",
+            "title": title,
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "salary": f"₹{rng.randint(15, 90)},000 per month",
+            "skills": skills,
+            "contact": f"+91 9{rng.randint(100000000, 999999999)}",
+            "description": f"{title} needed. " + ' '.join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(12, 30))),
+            "posted_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00Z",
+        }
+
+
+def generate_transcripts(count, seed=42):
+    """Yield (language, transcript) pairs cycling through every language"""
+    rng = random.Random(seed)
+    languages = sorted(TRANSCRIPTS)
+    for i in range(count):
+        language = languages[i % len(languages)]
+        yield language, rng.choice(TRANSCRIPTS[language])
+
+
+def generate_intents(count, seed=42):
+    """Yield intents like those extract_intent_* return"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        title = rng.choice(TITLES)
+        location = rng.choice(LOCATIONS)
+        yield {
+            "job_role": title.lower(),
+            "location": location.lower(),
+            "skills": [skill.lower() for skill in rng.sample(SKILLS, rng.randint(0, 2))],
+            "original_text": f"I need a {title.lower()} job in {location} with good experience",
+        }
+
+
+def generate_wav(seconds=2.0, sample_rate=16000, channels=1, seed=0):
+    """Speech-like test clip: a few tones with amplitude envelopes, as WAV bytes"""
+    rng = random.Random(seed)
+    frequencies = [rng.uniform(120, 400) for _ in range(3)]
+    frames = bytearray()
+    total = int(seconds * sample_rate)
+    for n in range(total):
+        t = n / sample_rate
+        envelope = 0.5 * (1 - math.cos(2 * math.pi * min(t / seconds, 1.0)))
+        value = sum(math.sin(2 * math.pi * f * t) for f in frequencies) / len(frequencies)
+        sample = int(12000 * envelope * value)
+        frames += struct.pack('<h', sample) * channels
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
@@ -0,0 +1,148 @@
+"""
+Closed-loop HTTP load generator for the job search and voice endpoints.
+
+    python -m benchmarks.loadgen --url http://127.0.0.1:5001 --concurrency 16 --duration 30
+    python -m benchmarks.loadgen --scenario voice --requests 200 --output results/voice.json
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+
+from benchmarks.corpus import LOCATIONS, TITLES, TRANSCRIPTS, generate_wav
+from benchmarks.results import compare_results, print_table, save_results, summarize
+
+
+def _multipart(fields, file_field, filename, data, content_type):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+                 f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n'.encode())
+    parts.append(data)
+    parts.append(f'\r\n--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def job_search_requests(base_url, seed=42):
+    """Endless GET /api/jobs variants: no filter, query, location, both"""
+    rng = random.Random(seed)
+    while True:
+        params = {}
+        if rng.random() < 0.7:
+            params["query"] = rng.choice(TITLES).split()[0].lower()
+        if rng.random() < 0.5:
+            params["location"] = rng.choice(LOCATIONS)
+        url = f"{base_url}/api/jobs"
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        yield 'jobs', urllib.request.Request(url)
+
+
+def voice_requests(base_url, clips=8, seed=42):
+    """Endless POST /api/process-voice uploads cycling through clips and languages"""
+    rng = random.Random(seed)
+    audio = [generate_wav(rng.uniform(1.5, 4.0), seed=i) for i in range(clips)]
+    languages = sorted(TRANSCRIPTS)
+    for i in itertools.count():
+        body, content_type = _multipart({"language": languages[i % len(languages)]},
+                                        'audio', f'clip-{i % clips}.wav', audio[i % clips], 'audio/wav')
+        yield 'voice', urllib.request.Request(f"{base_url}/api/process-voice", data=body,
+                                              headers={"Content-Type": content_type})
+
+
+def mixed_requests(base_url, voice_fraction=0.2, seed=42):
+    rng = random.Random(seed)
+    jobs, voice = job_search_requests(base_url, seed), voice_requests(base_url, seed=seed)
+    while True:
+        yield next(voice) if rng.random() < voice_fraction else next(jobs)
+
+
+SCENARIOS = {"jobs": job_search_requests, "voice": voice_requests, "mixed": mixed_requests}
+
+
+def run_load(requests, concurrency, duration=None, total=None, timeout=60):
+    """
+    Drive requests from concurrency threads until duration seconds pass or total
+    requests complete. Returns {name: (latencies, errors)} and the elapsed time.
+    """
+    lock = threading.Lock()
+    samples = {}
+    issued = itertools.count()
+    deadline = time.perf_counter() + duration if duration else None
+
+    def worker():
+        while True:
+            with lock:
+                if total is not None and next(issued) >= total:
+                    return
+                name, request = next(requests)
+            if deadline and time.perf_counter() >= deadline:
+                return
+            started = time.perf_counter()
+            ok = True
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError):
+                ok = False
+            latency = time.perf_counter() - started
+            with lock:
+                latencies, errors = samples.setdefault(name, ([], [0]))
+                if ok:
+                    latencies.append(latency)
+                else:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {name: (latencies, errors[0]) for name, (latencies, errors) in samples.items()}, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5001')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='mixed')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, help='seconds to run (default 30 unless --requests is given)')
+    parser.add_argument('--requests', type=int, help='stop after this many requests')
+    parser.add_argument('--timeout', type=float, default=60.0, help='per-request timeout in seconds')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='regression threshold (fraction)')
+    args = parser.parse_args()
+
+    duration = args.duration if args.duration or args.requests else 30.0
+    samples, elapsed = run_load(SCENARIOS[args.scenario](args.url.rstrip('/')), args.concurrency,
+                                duration, args.requests, args.timeout)
+    params = {"scenario": args.scenario, "concurrency": args.concurrency}
+    results = [summarize(f'http_{name}', latencies, elapsed, params, errors)
+               for name, (latencies, errors) in sorted(samples.items())]
+
+    print_table(results)
+    for result in results:
+        if result["errors"]:
+            print(f"{result['benchmark']}: {result['errors']} failed request(s)")
+    if args.output:
+        save_results(args.output, results)
+    if args.compare:
+        regressions = compare_results(args.compare, results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
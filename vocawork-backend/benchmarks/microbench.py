@@ -0,0 +1,122 @@
+"""
+Microbenchmarks for job matching, fallback intent extraction and audio decoding.
+
+    python -m benchmarks.microbench --sizes 1000,100000 --output results/micro.json
+    python -m benchmarks.microbench --sizes 1000000 --only matching
+    python -m benchmarks.microbench --compare results/micro.json
+"""
+
+import argparse
+import io
+import itertools
+import shutil
+import sys
+import time
+
+from benchmarks.corpus import generate_intents, generate_jobs, generate_transcripts, generate_wav
+from benchmarks.results import compare_results, print_table, save_results, summarize
+
+
+def _measure(fn, inputs):
+    latencies = []
+    started = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - started
+
+
+def bench_matching(size, operations):
+    from search_index import JobSearchIndex
+
+    jobs = list(generate_jobs(size))
+    started = time.perf_counter()
+    index = JobSearchIndex(jobs)
+    build_seconds = time.perf_counter() - started
+    results = [summarize('index_build', [build_seconds], build_seconds, {"jobs": size})]
+
+    intents = list(generate_intents(operations))
+    latencies, elapsed = _measure(lambda intent: index.match(intent, limit=10), intents)
+    results.append(summarize('find_matching_jobs', latencies, elapsed, {"jobs": size}))
+
+    queries = [(intent["job_role"].split()[0], intent["location"] if i % 2 else '')
+               for i, intent in enumerate(intents)]
+    latencies, elapsed = _measure(lambda q: index.search(query=q[0], location=q[1]), queries)
+    results.append(summarize('search_jobs', latencies, elapsed, {"jobs": size}))
+
+    new_jobs = list(generate_jobs(operations, seed=7))
+    for job in new_jobs:
+        job["id"] = "new-" + job["id"]
+    latencies, elapsed = _measure(index.add, new_jobs)
+    results.append(summarize('index_add', latencies, elapsed, {"jobs": size}))
+    latencies, elapsed = _measure(index.remove, [job["id"] for job in new_jobs])
+    results.append(summarize('index_remove', latencies, elapsed, {"jobs": size}))
+    return results
+
+
+def bench_intent_fallback(operations):
+    from intent_matcher import KeywordIntentMatcher
+
+    matcher = KeywordIntentMatcher()
+    results = []
+    transcripts = list(generate_transcripts(operations))
+    for language in sorted({language for language, _ in transcripts}):
+        texts = [text for lang, text in transcripts if lang == language]
+        latencies, elapsed = _measure(lambda text: matcher.extract(text, language), texts)
+        results.append(summarize('extract_intent_fallback', latencies, elapsed, {"language": language}))
+    return results
+
+
+def bench_audio(operations):
+    from audio_io import decode_audio
+
+    clips = {
+        "wav_16k_mono": generate_wav(2.0, 16000, 1),
+        "wav_44k_stereo": generate_wav(2.0, 44100, 2),
+    }
+    if shutil.which('ffmpeg'):
+        from pydub import AudioSegment
+        buffer = io.BytesIO()
+        AudioSegment.from_wav(io.BytesIO(clips["wav_44k_stereo"])).export(buffer, format='mp3')
+        clips["mp3_44k_stereo"] = buffer.getvalue()
+    results = []
+    for name, data in clips.items():
+        latencies, elapsed = _measure(decode_audio, itertools.repeat(data, operations))
+        results.append(summarize('audio_decode', latencies, elapsed, {"clip": name, "seconds": 2.0}))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,100000', help='comma-separated corpus sizes, e.g. 1000,100000,1000000')
+    parser.add_argument('--operations', type=int, default=500, help='operations per benchmark')
+    parser.add_argument('--only', choices=['matching', 'intent', 'audio'], action='append',
+                        help='run only the named group (repeatable)')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='regression threshold (fraction)')
+    args = parser.parse_args()
+
+    groups = set(args.only or ['matching', 'intent', 'audio'])
+    results = []
+    if 'matching' in groups:
+        for size in (int(size) for size in args.sizes.split(',') if size):
+            results.extend(bench_matching(size, args.operations))
+    if 'intent' in groups:
+        results.extend(bench_intent_fallback(args.operations))
+    if 'audio' in groups:
+        results.extend(bench_audio(min(args.operations, 100)))
+
+    print_table(results)
+    if args.output:
+        save_results(args.output, results)
+    if args.compare:
+        regressions = compare_results(args.compare, results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,403 @@
+"""
+In-memory server speaking the subset of the Redis protocol used by
+RedisJobStore and RedisSharedState, for multi-worker tests without Redis.
+
+    python -m benchmarks.redis_standin --port 6399
+    JOB_STORE_URL=redis://127.0.0.1:6399/0 SHARED_STATE_URL=redis://127.0.0.1:6399/0 \
+        python run_backend.py --mode production
+
+Data lives in one process and is lost when it exits. Only RESP2 and the
+commands listed in COMMANDS are understood; anything else is an error.
+"""
+
+import argparse
+import socketserver
+import threading
+import time
+
+
+class Error(Exception):
+    pass
+
+
+class SimpleString(str):
+    pass
+
+
+OK = SimpleString('OK')
+QUEUED = SimpleString('QUEUED')
+
+
+def encode(value):
+    if isinstance(value, Error):
+        return f"-{value}\r\n".encode('utf-8')
+    if isinstance(value, SimpleString):
+        return f"+{value}\r\n".encode('utf-8')
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return f":{value}\r\n".encode('ascii')
+    if isinstance(value, (list, tuple)):
+        return b''.join([f"*{len(value)}\r\n".encode('ascii')] + [encode(item) for item in value])
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+class Database:
+    """Keys, expiry times and pub/sub subscribers shared by every connection"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.data = {}
+        self.expires = {}
+        self.subscribers = {}
+        # Write counts per key (and for FLUSHALL) that WATCH compares at EXEC
+        self.versions = {}
+        self.flushes = 0
+
+    def _live(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            del self.expires[key]
+        return self.data.get(key)
+
+    def _typed(self, key, kind, create=False):
+        value = self._live(key)
+        if value is None:
+            if not create:
+                return None
+            value = self.data[key] = kind()
+        if not isinstance(value, kind):
+            raise Error('WRONGTYPE Operation against a key holding the wrong kind of value')
+        return value
+
+    def _drop_if_empty(self, key):
+        if not self.data.get(key):
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+
+    def execute(self, name, args):
+        handler = COMMANDS.get(name)
+        if handler is None:
+            return Error(f"ERR unknown command '{name}'")
+        with self.lock:
+            if name in WRITE_COMMANDS:
+                for key in (args if name == 'DEL' else args[:1]):
+                    self.versions[key] = self.versions.get(key, 0) + 1
+            try:
+                return handler(self, *args)
+            except Error as e:
+                return e
+            except (TypeError, ValueError, IndexError):
+                return Error(f"ERR wrong arguments for '{name}' command")
+
+    # Strings
+
+    def get(self, key):
+        return self._typed(key, bytes)
+
+    def set(self, key, value, *options):
+        options = [option.upper() for option in options]
+        ttl = None
+        if b'EX' in options:
+            ttl = int(options[options.index(b'EX') + 1])
+        elif b'PX' in options:
+            ttl = int(options[options.index(b'PX') + 1]) / 1000
+        if b'NX' in options and self._live(key) is not None:
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if ttl is not None:
+            self.expires[key] = time.monotonic() + ttl
+        return OK
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self.data[key]
+                self.expires.pop(key, None)
+                removed += 1
+        return removed
+
+    def exists(self, *keys):
+        return sum(self._live(key) is not None for key in keys)
+
+    def incrby(self, key, amount=b'1'):
+        value = int(self._typed(key, bytes) or 0) + int(amount)
+        self.data[key] = str(value).encode('ascii')
+        return value
+
+    # Hashes
+
+    def hset(self, key, *pairs):
+        if not pairs or len(pairs) % 2:
+            raise ValueError
+        table = self._typed(key, dict, create=True)
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in table
+            table[field] = value
+        return added
+
+    def hget(self, key, field):
+        return (self._typed(key, dict) or {}).get(field)
+
+    def hmget(self, key, *fields):
+        table = self._typed(key, dict) or {}
+        return [table.get(field) for field in fields]
+
+    def hdel(self, key, *fields):
+        table = self._typed(key, dict) or {}
+        removed = sum(table.pop(field, None) is not None for field in fields)
+        self._drop_if_empty(key)
+        return removed
+
+    def hlen(self, key):
+        return len(self._typed(key, dict) or {})
+
+    def hgetall(self, key):
+        return [item for pair in (self._typed(key, dict) or {}).items() for item in pair]
+
+    # Sorted sets (held as member -> score dicts, sorted on read)
+
+    def zadd(self, key, *pairs):
+        if not pairs or len(pairs) % 2:
+            raise ValueError
+        members = self._typed(key, ZSet, create=True)
+        added = 0
+        for score, member in zip(pairs[::2], pairs[1::2]):
+            added += member not in members
+            members[member] = float(score)
+        return added
+
+    def zrem(self, key, *members):
+        zset = self._typed(key, ZSet) or {}
+        removed = sum(zset.pop(member, None) is not None for member in members)
+        self._drop_if_empty(key)
+        return removed
+
+    def zcard(self, key):
+        return len(self._typed(key, ZSet) or {})
+
+    def zrange(self, key, start, stop, *options):
+        ordered = sorted((self._typed(key, ZSet) or {}).items(), key=lambda item: (item[1], item[0]))
+        ordered = _slice(ordered, int(start), int(stop))
+        if b'WITHSCORES' in (option.upper() for option in options):
+            return [item for member, score in ordered for item in (member, _format_score(score))]
+        return [member for member, _ in ordered]
+
+    def zmscore(self, key, *members):
+        zset = self._typed(key, ZSet) or {}
+        return [_format_score(zset[member]) if member in zset else None for member in members]
+
+    # Lists
+
+    def rpush(self, key, *values):
+        items = self._typed(key, list, create=True)
+        items.extend(values)
+        return len(items)
+
+    def lrange(self, key, start, stop):
+        return _slice(self._typed(key, list) or [], int(start), int(stop))
+
+    def llen(self, key):
+        return len(self._typed(key, list) or [])
+
+    def ltrim(self, key, start, stop):
+        items = self._typed(key, list)
+        if items is not None:
+            items[:] = _slice(items, int(start), int(stop))
+            self._drop_if_empty(key)
+        return OK
+
+    # Server
+
+    def publish(self, channel, message):
+        connections = list(self.subscribers.get(channel, ()))
+        for connection in connections:
+            connection.send([b'message', channel, message])
+        return len(connections)
+
+    def flushall(self, *args):
+        self.data.clear()
+        self.expires.clear()
+        self.flushes += 1
+        return OK
+
+    def watch_state(self, keys):
+        return self.flushes, [self.versions.get(key, 0) for key in keys]
+
+
+class ZSet(dict):
+    pass
+
+
+def _format_score(score):
+    return repr(int(score) if score.is_integer() else score)
+
+
+def _slice(items, start, stop):
+    """items[start..stop] with Redis' inclusive, negative-aware indexes"""
+    length = len(items)
+    start = max(length + start if start < 0 else start, 0)
+    stop = length + stop if stop < 0 else stop
+    return list(items[start:stop + 1]) if start <= stop else []
+
+
+WRITE_COMMANDS = {'SET', 'DEL', 'INCR', 'INCRBY', 'HSET', 'HDEL', 'ZADD', 'ZREM', 'RPUSH', 'LTRIM'}
+
+COMMANDS = {
+    'PING': lambda db, *args: args[0] if args else SimpleString('PONG'),
+    'ECHO': lambda db, message: message,
+    'CLIENT': lambda db, *args: OK,
+    'SELECT': lambda db, index: OK,
+    'GET': Database.get,
+    'SET': Database.set,
+    'DEL': Database.delete,
+    'EXISTS': Database.exists,
+    'INCR': Database.incrby,
+    'INCRBY': Database.incrby,
+    'HSET': Database.hset,
+    'HGET': Database.hget,
+    'HMGET': Database.hmget,
+    'HDEL': Database.hdel,
+    'HLEN': Database.hlen,
+    'HGETALL': Database.hgetall,
+    'ZADD': Database.zadd,
+    'ZREM': Database.zrem,
+    'ZCARD': Database.zcard,
+    'ZRANGE': Database.zrange,
+    'ZMSCORE': Database.zmscore,
+    'RPUSH': Database.rpush,
+    'LRANGE': Database.lrange,
+    'LLEN': Database.llen,
+    'LTRIM': Database.ltrim,
+    'PUBLISH': Database.publish,
+    'FLUSHALL': Database.flushall,
+}
+
+
+class Connection(socketserver.StreamRequestHandler):
+    """One client: plain commands, WATCH/MULTI/EXEC transactions and SUBSCRIBE"""
+
+    def setup(self):
+        super().setup()
+        self._send_lock = threading.Lock()
+        self._queued = None
+        self._watched = None
+        self._channels = set()
+
+    def send(self, value):
+        with self._send_lock:
+            try:
+                self.wfile.write(encode(value))
+                self.wfile.flush()
+            except OSError:
+                pass
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        db = self.server.db
+        try:
+            while True:
+                command = self.read_command()
+                if command is None:
+                    return
+                if command:
+                    self.send(self.dispatch(db, command[0].decode('utf-8').upper(), command[1:]))
+        except (OSError, ValueError):
+            pass
+        finally:
+            with db.lock:
+                for channel in self._channels:
+                    db.subscribers.get(channel, set()).discard(self)
+
+    def dispatch(self, db, name, args):
+        if name == 'WATCH':
+            with db.lock:
+                self._watched = (args, db.watch_state(args))
+            return OK
+        if name == 'UNWATCH':
+            self._watched = None
+            return OK
+        if name == 'MULTI':
+            self._queued = []
+            return OK
+        if name == 'DISCARD':
+            self._queued = self._watched = None
+            return OK
+        if name == 'EXEC':
+            if self._queued is None:
+                return Error('ERR EXEC without MULTI')
+            queued, self._queued = self._queued, None
+            watched, self._watched = self._watched, None
+            with db.lock:
+                if watched is not None and db.watch_state(watched[0]) != watched[1]:
+                    # A watched key changed: the transaction is aborted (nil reply)
+                    return None
+                return [db.execute(queued_name, queued_args) for queued_name, queued_args in queued]
+        if self._queued is not None:
+            self._queued.append((name, args))
+            return QUEUED
+        if name in ('SUBSCRIBE', 'UNSUBSCRIBE'):
+            return self.subscribe(db, name, args)
+        return db.execute(name, args)
+
+    def subscribe(self, db, name, channels):
+        with db.lock:
+            if name == 'UNSUBSCRIBE' and not channels:
+                channels = list(self._channels)
+                if not channels:
+                    return [b'unsubscribe', None, 0]
+            for channel in channels:
+                if name == 'SUBSCRIBE':
+                    self._channels.add(channel)
+                    db.subscribers.setdefault(channel, set()).add(self)
+                else:
+                    self._channels.discard(channel)
+                    db.subscribers.get(channel, set()).discard(self)
+                # Each channel gets its own confirmation; the last one is the reply
+                reply = [name.lower().encode('ascii'), channel, len(self._channels)]
+                if channel is not channels[-1]:
+                    self.send(reply)
+        return reply
+
+
+class Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, Connection)
+        self.db = Database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6399)
+    args = parser.parse_args()
+
+    with Server((args.host, args.port)) as server:
+        print(f"Redis stand-in listening on redis://{args.host}:{args.port}/0")
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Latency summaries and JSON result files shared by the benchmarks.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(name, latencies, elapsed, params=None, errors=0):
+    """Summarize per-operation latencies (seconds) measured over elapsed seconds"""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "benchmark": name,
+        "params": params or {},
+        "ops": count,
+        "errors": errors,
+        "mean_ms": round(sum(values) / count * 1000, 4) if count else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 4),
+        "max_ms": round(values[-1] * 1000, 4) if count else 0.0,
+        "throughput_per_s": round(count / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def save_results(path, results):
+    """Write results with enough environment detail to compare runs"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    document = {
+        "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+
+
+def _result_key(result):
+    return (result["benchmark"], json.dumps(result["params"], sort_keys=True))
+
+
+def compare_results(baseline_path, results, threshold=0.10):
+    """
+    Print p50/p95 changes against a saved baseline and return the list of
+    regressions worse than threshold (a fraction, 0.10 = 10% slower)
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {_result_key(result): result for result in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(_result_key(result))
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = previous[metric], result[metric]
+            change = (after - before) / before if before else 0.0
+            print(f"{result['benchmark']} {result['params']} {metric}: "
+                  f"{before:.3f} -> {after:.3f} ({change:+.1%})")
+            if change > threshold:
+                regressions.append((result["benchmark"], result["params"], metric, change))
+    return regressions
+
+
+def print_table(results):
+    for result in results:
+        print(f"{result['benchmark']:<28} {json.dumps(result['params'], ensure_ascii=False):<40} "
+              f"ops={result['ops']:<7} p50={result['p50_ms']:.3f}ms p95={result['p95_ms']:.3f}ms "
+              f"p99={result['p99_ms']:.3f}ms {result['throughput_per_s']:.1f}/s")
@@ -0,0 +1,82 @@
+"""
+Cold-start report: wall time to import the backend, broken down by module.
+
+Each run imports app in a fresh interpreter with -X importtime and totals
+the cumulative import time of each package or backend module app.py imports.
+
+    python -m benchmarks.startup --runs 5 --output results/startup.json
+    python -m benchmarks.startup --compare results/startup.json
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.results import compare_results, save_results, summarize
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_profile(statement='import app', env=None):
+    """Return (wall seconds, {top-level module: cumulative import ms}) for one cold import"""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                               cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - started
+
+    modules = defaultdict(float)
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        if len(indent) == 1 and name == 'app':
+            modules['app (module body)'] += int(self_us) / 1000
+        elif len(indent) == 3:
+            # Imports made directly by app.py carry the cost of everything beneath them
+            modules[name.split('.')[0]] += int(cumulative_us) / 1000
+    return elapsed, dict(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15, help='modules to list')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='regression threshold (fraction)')
+    args = parser.parse_args()
+
+    env = dict(os.environ, JOB_STORE_URL=os.environ.get('JOB_STORE_URL', 'memory://'))
+    walls = []
+    per_module = defaultdict(list)
+    for _ in range(args.runs):
+        wall, modules = import_profile(env=env)
+        walls.append(wall)
+        for name, ms in modules.items():
+            per_module[name].append(ms / 1000)
+
+    results = [summarize('startup_import_app', walls, sum(walls), {"runs": args.runs})]
+    ranked = sorted(per_module.items(), key=lambda item: -sum(item[1]) / len(item[1]))
+    print(f"import app: median {sorted(walls)[len(walls) // 2] * 1000:.0f}ms over {args.runs} runs")
+    for name, seconds in ranked[:args.top]:
+        result = summarize('startup_module_import', seconds, sum(seconds), {"module": name})
+        results.append(result)
+        print(f"  {name:<32} p50={result['p50_ms']:.1f}ms")
+
+    if args.output:
+        save_results(args.output, results)
+    if args.compare:
+        regressions = compare_results(args.compare, results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
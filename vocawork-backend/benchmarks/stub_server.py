@@ -0,0 +1,54 @@
+"""
+Run the backend with stand-in upstreams and a synthetic corpus, for load tests.
+
+    python -m benchmarks.stub_server --jobs 100000 --speech-latency 1.2 --gemini-latency 0.8
+    python -m benchmarks.stub_server --tail-rate 0.05 --tail-latency 20   # stalls: watch /api/health upstreams
+"""
+
+import argparse
+import logging
+import os
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--jobs', type=int, default=1000, help='synthetic postings to load')
+    parser.add_argument('--speech-latency', type=float, default=1.2, help='seconds per recognition call')
+    parser.add_argument('--gemini-latency', type=float, default=0.8, help='seconds per Gemini call')
+    parser.add_argument('--jitter', type=float, default=0.2, help='uniform +/- jitter in seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of upstream calls that fail')
+    parser.add_argument('--tail-rate', type=float, default=0.0, help='fraction of upstream calls that stall')
+    parser.add_argument('--tail-latency', type=float, default=10.0, help='seconds a stalled call takes')
+    args = parser.parse_args()
+
+    # Keep benchmark data out of the real job store
+    os.environ.setdefault('JOB_STORE_URL', 'memory://')
+    logging.disable(logging.INFO)
+
+    import app as backend
+    from benchmarks.corpus import generate_jobs
+    from benchmarks.stubs import StubGeminiModel, install_speech_stub
+
+    install_speech_stub(args.speech_latency, args.jitter, args.failure_rate, args.tail_rate, args.tail_latency)
+    backend.model = StubGeminiModel(args.gemini_latency, args.jitter, args.failure_rate,
+                                    args.tail_rate, args.tail_latency)
+
+    started = time.perf_counter()
+    batch = []
+    for job in generate_jobs(args.jobs):
+        batch.append(job)
+        if len(batch) == 10000:
+            backend.JOB_STORE.add_many(batch)
+            batch = []
+    backend.JOB_STORE.add_many(batch)
+    backend.job_snapshot()
+    print(f"Loaded {args.jobs} synthetic jobs in {time.perf_counter() - started:.1f}s")
+
+    backend.app.run(host=args.host, port=args.port, debug=False, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
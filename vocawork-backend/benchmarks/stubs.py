@@ -0,0 +1,77 @@
+"""
+Stand-ins for Google Speech Recognition and Gemini with configurable latency.
+
+Besides a base latency with jitter, a tail_rate fraction of calls can stall
+for tail_latency seconds, which is what upstream deadlines, circuit breakers
+and hedging in the app are meant to absorb.
+"""
+
+import hashlib
+import json
+import random
+import re
+import time
+
+import speech_recognition as sr
+
+from benchmarks.corpus import TRANSCRIPTS
+from intent_matcher import KeywordIntentMatcher
+
+
+def _sleep(latency, jitter, tail_rate=0.0, tail_latency=0.0):
+    if tail_rate and random.random() < tail_rate:
+        latency = tail_latency
+    if latency or jitter:
+        time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+
+class _StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubGeminiModel:
+    """Answers generate_content like Gemini, using the keyword matcher, after a delay"""
+
+    TEXT_RE = re.compile(r'Text: "(.*?)"\s*\n\s*Language: (\w+)', re.DOTALL)
+
+    def __init__(self, latency=0.8, jitter=0.2, failure_rate=0.0, tail_rate=0.0, tail_latency=10.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.calls = 0
+        self._matcher = KeywordIntentMatcher()
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        _sleep(self.latency, self.jitter, self.tail_rate, self.tail_latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RuntimeError("stub Gemini failure")
+        match = self.TEXT_RE.search(prompt)
+        text, language = (match.group(1), match.group(2)) if match else ('', 'en')
+        intent = self._matcher.extract(text, language)
+        intent["original_text"] = text
+        return _StubResponse(f"Here is the result:\n```json\n{json.dumps(intent, ensure_ascii=False)}\n```")
+
+
+def install_speech_stub(latency=1.2, jitter=0.3, failure_rate=0.0, tail_rate=0.0, tail_latency=10.0):
+    """
+    Replace Recognizer.recognize_google with a delayed stand-in that returns a
+    transcript chosen deterministically from the audio. Returns the call log.
+    """
+    calls = []
+    languages = {'hi-IN': 'hi', 'ta-IN': 'ta', 'te-IN': 'te', 'mr-IN': 'mr'}
+
+    def recognize_google(self, audio_data, key=None, language='en-US', *args, **kwargs):
+        calls.append(language)
+        _sleep(latency, jitter, tail_rate, tail_latency)
+        if failure_rate and random.random() < failure_rate:
+            raise sr.RequestError("stub recognition failure")
+        options = TRANSCRIPTS[languages.get(language, 'en')]
+        digest = hashlib.sha1(audio_data.frame_data).digest()
+        return options[digest[0] % len(options)]
+
+    sr.Recognizer.recognize_google = recognize_google
+    return calls
@@ -0,0 +1,338 @@
+"""
+Bounded caches used on the voice pipeline hot path.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry time-to-live"""
+
+    def __init__(self, max_entries=1024, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskCache:
+    """JSON-file cache tier, one file per key, expired by modification time"""
+
+    def __init__(self, directory, max_entries=10000, ttl=None):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if self.ttl and os.path.getmtime(path) < time.time() - self.ttl:
+                os.remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {str(e)}")
+            return
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def prune(self):
+        """Drop the oldest files beyond max_entries"""
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+class SharedTier:
+    """JSON cache tier in a SharedState namespace, seen by every worker"""
+
+    def __init__(self, state, namespace, ttl=None):
+        self.state = state
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def get(self, key):
+        try:
+            data = self.state.get(self.namespace, key)
+            return json.loads(data) if data is not None else None
+        except Exception as e:
+            logger.warning(f"Shared {self.namespace} cache read failed: {str(e)}")
+            return None
+
+    def put(self, key, value):
+        try:
+            self.state.set(self.namespace, key, json.dumps(value, ensure_ascii=False).encode('utf-8'),
+                           ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"Shared {self.namespace} cache write failed: {str(e)}")
+
+
+class TranscriptCache:
+    """
+    Speech-to-text results keyed by a hash of the audio and the language code.
+
+    Entries are stored under the hash of the uploaded bytes (a hit skips
+    decoding and recognition) and of the decoded PCM (a hit skips
+    recognition for the same audio re-encoded differently). Misses in memory
+    fall through to the disk tier, then to the shared tier.
+    """
+
+    def __init__(self, max_entries=1024, ttl=None, directory=None, shared=None):
+        """shared is an optional SharedState for a tier common to every worker"""
+        self._memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._disk = DiskCache(directory, max_entries=max_entries * 10, ttl=ttl) if directory else None
+        self._shared = SharedTier(shared, 'transcripts', ttl) if shared is not None else None
+        self._tiers = [tier for tier in (self._disk, self._shared) if tier is not None]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(audio, language):
+        digest = hashlib.sha256(audio)
+        digest.update(b'\0' + (language or '').encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key, count_miss=True):
+        """Cached transcript for key or None; count_miss=False for pre-checks"""
+        transcript = self._memory.get(key)
+        if transcript is None:
+            for tier in self._tiers:
+                transcript = tier.get(key)
+                if transcript is not None:
+                    self._memory.put(key, transcript)
+                    break
+        with self._lock:
+            if transcript is not None:
+                self.hits += 1
+            elif count_miss:
+                self.misses += 1
+        return transcript
+
+    def put(self, keys, transcript):
+        for key in keys:
+            self._memory.put(key, transcript)
+            for tier in self._tiers:
+                tier.put(key, transcript)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._memory),
+            "evictions": self._memory.evictions,
+            "disk_enabled": self._disk is not None,
+            "shared_enabled": self._shared is not None,
+        }
+
+
+def normalize_transcript(text):
+    """Fold case, Unicode forms, punctuation and whitespace for cache keys"""
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    # Drop punctuation in any script (including the Devanagari danda)
+    text = ''.join(' ' if unicodedata.category(ch).startswith('P') else ch for ch in text)
+    return ' '.join(text.split())
+
+
+class IntentCache:
+    """
+    Memoizes intent extraction by normalized transcript and language.
+
+    Concurrent lookups for a key that is already being computed wait for that
+    computation instead of issuing their own upstream call. With a shared
+    tier, other workers' results are reused before computing.
+    """
+
+    def __init__(self, max_entries=2048, ttl=None, shared=None):
+        self._cache = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._shared = SharedTier(shared, 'intents', ttl) if shared is not None else None
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    @staticmethod
+    def key(text, language):
+        return (language or '', normalize_transcript(text))
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, or compute() it once for all
+        concurrent callers. None results are shared but not cached.
+        """
+        value = self._cache.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            shared_key = self._shared_key(key) if self._shared else None
+            value = self._shared.get(shared_key) if shared_key else None
+            if value is None:
+                value = compute()
+                if value is not None and shared_key:
+                    self._shared.put(shared_key, value)
+            if value is not None:
+                self._cache.put(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    @staticmethod
+    def _shared_key(key):
+        return hashlib.sha256(json.dumps(key, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats["coalesced"] = self.coalesced
+        stats["in_flight"] = len(self._in_flight)
+        return stats
+
+
+class SearchResultCache:
+    """
+    Ranked job-id lists for repeated searches, valid for one catalogue version.
+
+    Keys carry the version they were computed at. The first lookup at a newer
+    version drops every older entry, so no result outlives the write that
+    changed the catalogue. Requests still reading an older snapshot neither
+    clear the cache nor store into it.
+    """
+
+    def __init__(self, max_entries=4096, max_ids=1000):
+        self._cache = LRUCache(max_entries=max_entries)
+        self.max_ids = max_ids
+        self._version = None
+        self._lock = threading.Lock()
+        self.invalidations = 0
+        self.stale = 0
+
+    def _current(self, version):
+        """Advance to version if it is newer; False if it is older than the cache"""
+        with self._lock:
+            if self._version is not None and version <= self._version:
+                if version < self._version:
+                    self.stale += 1
+                    return False
+                return True
+            if self._version is not None:
+                self.invalidations += 1
+            self._version = version
+            # Cleared under the lock so no put at the new version can interleave
+            self._cache.clear()
+            return True
+
+    def get(self, version, key):
+        if not self._current(version):
+            return None
+        return self._cache.get((version, key))
+
+    def put(self, version, key, ids, *extra):
+        """Store a ranked id list (plus any extra values returned alongside it by get)"""
+        if len(ids) > self.max_ids or not self._current(version):
+            return
+        with self._lock:
+            # A newer version may have arrived since; its clear must not be undone
+            if version == self._version:
+                self._cache.put((version, key), (tuple(ids),) + extra)
+
+    def stats(self):
+        stats = self._cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+        stats["invalidations"] = self.invalidations
+        stats["stale_skipped"] = self.stale
+        stats["version"] = self._version
+        return stats
@@ -0,0 +1,105 @@
+"""
+Connection handling shared by the SQLite and Redis backends of job_store and
+shared_state.
+
+Both backends are built once in a preloading server master and then used by
+every forked worker, so connections and listener threads are tied to the
+process that opened them: a child never reuses or closes its parent's SQLite
+connections, and restarts its own Redis pub/sub listener after fork().
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class SQLiteConnections:
+    """One connection per thread and per process to a WAL-mode SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        # Connections opened before a fork must not be used or closed by the
+        # child; they are parked here
+        self._inherited = []
+
+    def get(self):
+        """The calling thread's connection, opened on first use in this process"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid != os.getpid():
+            self._inherited.append(conn)
+            conn = None
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def close(self):
+        """Close the calling thread's connection if this process opened it"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.conn = None
+
+
+class RedisSubscriptions:
+    """
+    Pub/sub callbacks on one Redis client, called on a background listener.
+
+    The listener thread and its socket do not survive fork(); a child that
+    inherits subscriptions starts its own listener.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._callbacks = {}
+        self._pubsub = None
+        self._listener = None
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    @property
+    def listening(self):
+        return self._listener is not None
+
+    def subscribe(self, channel, callback):
+        """Call callback(message) with each message published on channel, as text"""
+        self._callbacks.setdefault(channel, []).append(callback)
+        self._stop()
+        self._start()
+
+    def _start(self):
+        handlers = {}
+        for channel, callbacks in self._callbacks.items():
+            def handle(message, callbacks=callbacks):
+                data = message['data']
+                for callback in callbacks:
+                    callback(data.decode('utf-8') if isinstance(data, bytes) else data)
+            handlers[channel] = handle
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**handlers)
+        self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def _stop(self):
+        if self._listener is not None:
+            # Let the listener finish its current read before its socket closes
+            self._listener.stop()
+            self._listener.join(timeout=2)
+            self._pubsub.close()
+            self._listener = None
+            self._pubsub = None
+
+    def _after_fork(self):
+        # The parent's listener thread is gone and its socket belongs to the parent
+        self._listener = None
+        self._pubsub = None
+        if self._callbacks:
+            self._start()
+
+    def close(self):
+        self._stop()
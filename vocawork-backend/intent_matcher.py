@@ -0,0 +1,128 @@
+"""
+Keyword-based intent extraction used when Gemini is unavailable.
+
+The role, location and skill vocabularies live in a JSON file and are
+compiled into one regular expression per language, so a single pass over
+the transcript yields every match. The file is re-read when it changes.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VOCABULARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       'resources', 'intent_vocabulary.json')
+DEFAULT_LANGUAGE = 'en'
+KINDS = ('roles', 'locations', 'skills')
+
+# Zero-width joiners vary between keyboards and recognizers; ignore them
+_ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\u200c\u200d'))
+
+
+def normalize_text(text):
+    """Lowercase and NFC-normalize text, dropping zero-width joiners"""
+    return unicodedata.normalize('NFC', text or '').translate(_ZERO_WIDTH).lower()
+
+
+class _CompiledLanguage:
+    """Pattern and phrase table for one language (plus English loanwords)"""
+
+    def __init__(self, phrases):
+        # phrase -> list of (kind, canonical name)
+        self.phrases = phrases
+        latin = sorted((p for p in phrases if p.isascii()), key=len, reverse=True)
+        native = sorted((p for p in phrases if not p.isascii()), key=len, reverse=True)
+        alternatives = []
+        if latin:
+            # Latin phrases must be whole words, optionally plural ("developers"
+            # but not "excellent" for "excel")
+            alternatives.append(r'(?<![a-z0-9])(' + '|'.join(map(re.escape, latin)) + r')(?:e?s)?(?![a-z0-9])')
+        if native:
+            # Indic words take case suffixes ("சென்னையில்"), so match anywhere
+            alternatives.append('(' + '|'.join(map(re.escape, native)) + ')')
+        self.pattern = re.compile('|'.join(alternatives)) if alternatives else None
+
+
+class KeywordIntentMatcher:
+    """Extracts job role, location and skills from a transcript in one pass"""
+
+    def __init__(self, path=DEFAULT_VOCABULARY_PATH, reload_interval=2.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._languages = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._load()
+
+    def _load(self):
+        mtime = os.path.getmtime(self.path)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            vocabulary = json.load(f)
+
+        by_language = {}
+        for kind in KINDS:
+            for canonical, translations in vocabulary.get(kind, {}).items():
+                for language, phrases in translations.items():
+                    table = by_language.setdefault(language, {})
+                    for phrase in phrases:
+                        table.setdefault(normalize_text(phrase), []).append((kind, canonical))
+
+        english = by_language.get(DEFAULT_LANGUAGE, {})
+        languages = {}
+        for language, table in by_language.items():
+            merged = {phrase: list(matches) for phrase, matches in english.items()}
+            if language != DEFAULT_LANGUAGE:
+                for phrase, matches in table.items():
+                    merged.setdefault(phrase, []).extend(matches)
+            languages[language] = _CompiledLanguage(merged)
+
+        self._languages = languages
+        self._mtime = mtime
+        logger.info(f"Loaded intent vocabulary for {', '.join(sorted(languages))} from {self.path}")
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            if now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            try:
+                if os.path.getmtime(self.path) != self._mtime:
+                    self._load()
+            except (OSError, ValueError) as e:
+                # Keep serving the previous vocabulary if the new file is broken
+                logger.error(f"Could not reload intent vocabulary: {str(e)}")
+
+    def extract(self, text, language):
+        """Return {'job_role', 'location', 'skills'} found in text"""
+        self._maybe_reload()
+        compiled = self._languages.get(language) or self._languages.get(DEFAULT_LANGUAGE)
+
+        job_role = ""
+        role_length = 0
+        location = ""
+        skills = []
+        if compiled and compiled.pattern:
+            for match in compiled.pattern.finditer(normalize_text(text)):
+                phrase = match.group(match.lastindex)
+                for kind, canonical in compiled.phrases[phrase]:
+                    if kind == 'roles':
+                        # Prefer the most specific role phrase ("web developer" over "developer")
+                        if len(phrase) > role_length:
+                            job_role, role_length = canonical, len(phrase)
+                    elif kind == 'locations':
+                        if not location:
+                            location = canonical
+                    elif canonical not in skills:
+                        skills.append(canonical)
+
+        return {"job_role": job_role, "location": location, "skills": skills}
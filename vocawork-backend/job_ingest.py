@@ -0,0 +1,210 @@
+"""
+Helpers for POST /api/jobs/bulk.
+
+Partner feeds are read straight from the request body as NDJSON (one job
+object per line) or CSV (a header row naming the job fields). Rows are
+parsed and validated one at a time, duplicates are dropped by content hash,
+and accepted jobs are written in batches so the catalogue snapshot is
+republished once per batch rather than once per job. Memory use is one batch
+of jobs plus a hash per row, however large the upload.
+"""
+
+import codecs
+import csv
+import json
+import re
+import uuid
+from datetime import datetime
+
+from job_listing import JOB_FIELDS
+from job_store import content_hash
+
+REQUIRED_FIELDS = ('title', 'company', 'location', 'salary', 'contact', 'description')
+FORMATS = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/json-seq': 'ndjson',
+    'text/csv': 'csv',
+}
+MAX_LINE_BYTES = 1024 * 1024
+SKILL_SEPARATOR = re.compile(r'[,;|]')
+
+
+class IngestError(Exception):
+    """Raised when an upload cannot be read any further"""
+
+
+class RowError(ValueError):
+    """Raised for a single row that is rejected"""
+
+
+def detect_format(mimetype, requested=None):
+    """'ndjson' or 'csv' from a ?format= override or the request Content-Type"""
+    if requested:
+        if requested not in ('ndjson', 'csv'):
+            raise IngestError("format must be 'ndjson' or 'csv'")
+        return requested
+    if mimetype in FORMATS:
+        return FORMATS[mimetype]
+    raise IngestError("Send NDJSON (Content-Type: application/x-ndjson) or CSV "
+                      "(Content-Type: text/csv), or pass ?format=ndjson|csv")
+
+
+def _read_lines(stream, max_line_bytes):
+    """Yield raw lines; a line longer than max_line_bytes is yielded as None"""
+    while True:
+        try:
+            line = stream.readline(max_line_bytes + 1)
+        except Exception as e:
+            raise IngestError(f"Could not read request body: {e}") from e
+        if not line:
+            return
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            # Skip the rest of the oversized line
+            while line and not line.endswith(b'\n'):
+                try:
+                    line = stream.readline(max_line_bytes + 1)
+                except Exception as e:
+                    raise IngestError(f"Could not read request body: {e}") from e
+            yield None
+        else:
+            yield line
+
+
+def iter_ndjson(stream, max_line_bytes=MAX_LINE_BYTES):
+    """Yield (line number, record or RowError) for each non-blank NDJSON line"""
+    for line_no, line in enumerate(_read_lines(stream, max_line_bytes), 1):
+        if line is None:
+            yield line_no, RowError(f"Line longer than {max_line_bytes} bytes")
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, RowError(f"Invalid JSON: {e}")
+
+
+def iter_csv(stream, max_line_bytes=MAX_LINE_BYTES):
+    """Yield (line number, record or RowError) for each CSV data row"""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    def text_lines():
+        for line_no, line in enumerate(_read_lines(stream, max_line_bytes), 1):
+            if line is None:
+                raise IngestError(f"Line {line_no} is longer than {max_line_bytes} bytes")
+            try:
+                yield decoder.decode(line)
+            except UnicodeDecodeError as e:
+                raise IngestError(f"Line {line_no} is not valid UTF-8: {e}") from e
+
+    reader = csv.reader(text_lines())
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    except csv.Error as e:
+        raise IngestError(f"Invalid CSV header: {e}") from e
+    header = [name.strip() for name in header]
+
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield reader.line_num, RowError(f"Invalid CSV: {e}")
+            continue
+        if not any(cell.strip() for cell in row):
+            continue
+        if len(row) > len(header):
+            yield reader.line_num, RowError(f"Expected {len(header)} columns, got {len(row)}")
+            continue
+        yield reader.line_num, dict(zip(header, row))
+
+
+def validate_job(record):
+    """Return a new job built from a parsed row, or raise RowError"""
+    if not isinstance(record, dict):
+        raise RowError("Each row must be a JSON object")
+    job = {}
+    for field in JOB_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, ''):
+            job[field] = value
+
+    for field in REQUIRED_FIELDS:
+        if field not in job:
+            raise RowError(f"Missing required field: {field}")
+        if not isinstance(job[field], (str, int, float)):
+            raise RowError(f"Field {field} must be a string")
+        job[field] = str(job[field])
+
+    skills = job.get('skills', [])
+    if isinstance(skills, str):
+        skills = SKILL_SEPARATOR.split(skills)
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise RowError("skills must be a list of strings or a comma-separated string")
+    job['skills'] = [skill.strip() for skill in skills if skill.strip()]
+
+    job['id'] = str(uuid.uuid4())
+    job['posted_date'] = datetime.now().isoformat()
+    return job
+
+
+def ingest(rows, store, publish, batch_size=500, max_errors=100):
+    """
+    Validate and insert (line number, record) rows from iter_ndjson/iter_csv.
+
+    Jobs whose content hash is already stored, or appeared earlier in the
+    upload, are counted as duplicates. publish() is called after each batch
+    is written and returns the new catalogue snapshot. Returns the report.
+    """
+    report = {"received": 0, "inserted": 0, "duplicates": 0, "rejected": 0,
+              "batches": 0, "errors": [], "errors_truncated": False}
+    seen = set()
+    batch = {}
+
+    def reject(line_no, error):
+        report["rejected"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"line": line_no, "error": str(error)})
+        else:
+            report["errors_truncated"] = True
+
+    def flush():
+        existing = store.existing_hashes(batch)
+        fresh = [job for digest, job in batch.items() if digest not in existing]
+        report["duplicates"] += len(batch) - len(fresh)
+        if fresh:
+            store.add_many(fresh)
+            report["version"] = publish().version
+            report["inserted"] += len(fresh)
+            report["batches"] += 1
+        batch.clear()
+
+    try:
+        for line_no, record in rows:
+            report["received"] += 1
+            try:
+                if isinstance(record, RowError):
+                    raise record
+                job = validate_job(record)
+            except RowError as e:
+                reject(line_no, e)
+                continue
+            digest = content_hash(job)
+            if digest in seen:
+                report["duplicates"] += 1
+                continue
+            seen.add(digest)
+            batch[digest] = job
+            if len(batch) >= batch_size:
+                flush()
+    except IngestError as e:
+        report["error"] = str(e)
+    if batch:
+        flush()
+    return report
@@ -0,0 +1,86 @@
+"""
+Pagination cursors, field projection and streamed serialization for GET /api/jobs.
+"""
+
+import base64
+import hashlib
+import json
+
+JOB_FIELDS = ('id', 'title', 'company', 'location', 'salary', 'skills', 'contact',
+              'description', 'posted_date')
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class ListingError(Exception):
+    """Raised for malformed listing parameters; reported as a 400"""
+
+
+def encode_cursor(sort, key):
+    """Opaque cursor holding the sort order and the last sort key of a page"""
+    raw = json.dumps({"sort": sort, "key": key}, separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort):
+    """Return the sort key stored in cursor, checking it belongs to this sort"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        key = data["key"]
+        cursor_sort = data["sort"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ListingError("Invalid cursor") from e
+    if cursor_sort != sort or not isinstance(key, list):
+        raise ListingError("Cursor does not match the requested sort")
+    return key
+
+
+def parse_limit(value):
+    if value is None or value == '':
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError as e:
+        raise ListingError("limit must be an integer") from e
+    if limit < 1:
+        raise ListingError("limit must be positive")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_fields(value):
+    """Projected field names from a comma-separated fields= value, or None for all"""
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in JOB_FIELDS]
+    if unknown:
+        raise ListingError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(JOB_FIELDS)}")
+    # The id is always returned so clients can address the job
+    return ['id'] + [field for field in fields if field != 'id']
+
+
+def project(job, fields):
+    if fields is None:
+        return job
+    return {field: job[field] for field in fields if field in job}
+
+
+def listing_etag(version, args):
+    """ETag for a listing: corpus version plus the normalized query arguments"""
+    digest = hashlib.sha1(repr((version, sorted(args.items(multi=True)))).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def stream_json_array(jobs, fields):
+    """Serialize jobs one at a time instead of building the whole body in memory"""
+    yield '['
+    for i, job in enumerate(jobs):
+        yield (',' if i else '') + json.dumps(project(job, fields), ensure_ascii=False)
+    yield ']'
+
+
+def stream_json_page(jobs, fields, total, next_cursor):
+    yield '{"jobs":'
+    yield from stream_json_array(jobs, fields)
+    yield f',"total":{total},"next_cursor":{json.dumps(next_cursor)}}}'
@@ -0,0 +1,182 @@
+"""
+Versioned, immutable snapshots of the job catalogue for lock-free readers.
+
+Request handlers read whatever JobSnapshot is current: a single attribute
+load, no lock, and the snapshot never changes underneath them. Writers go
+through refresh(), which replays the job store's change log onto
+copy-on-write clones of the search indexes and publishes the result as a new
+snapshot in one assignment. The version is the store's change sequence
+number, so it is identical in every worker process that has caught up and
+can key caches and ETags.
+
+watch() keeps the snapshot current from a background thread, woken by the
+store's change notifications where it has them (Redis) and by a timer
+otherwise. While notifications arrive, request handlers skip the per-request
+store check and see other workers' writes within max_lag seconds. Call it in
+each worker after fork (gunicorn's post_fork), not in a preloading master:
+a forked child gets fresh locks and events, since the parent's watcher may
+hold them at fork time, and a watcher running in the parent is restarted.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from search_index import JobSearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+class JobSnapshot:
+    """The catalogue's search indexes as of one job store version"""
+
+    __slots__ = ('version', 'index', 'semantic', 'published_at')
+
+    def __init__(self, version, index, semantic=None):
+        self.version = version
+        self.index = index
+        self.semantic = semantic
+        self.published_at = time.time()
+
+    def __len__(self):
+        return len(self.index)
+
+
+class SnapshotManager:
+    """Publishes JobSnapshots of a JobStore as its change log advances"""
+
+    def __init__(self, store, semantic_factory=None, max_lag=1.0):
+        """semantic_factory(jobs) builds the optional SemanticJobIndex, or returns None"""
+        self._store = store
+        self._semantic_factory = semantic_factory
+        self.max_lag = max_lag
+        self._write_lock = threading.Lock()
+        self._publishes = 0
+        self.notifications = 0
+        self._pushed = False
+        self._dirty = False
+        self._checked_at = time.monotonic()
+        self._poll_interval = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._snapshot = self._rebuild()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def current(self):
+        """The latest published snapshot, without checking the store"""
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def refresh(self, force=False):
+        """
+        Publish a snapshot including every change in the store (made by this
+        or any other worker) and return it. Cheap when nothing changed.
+
+        When the store pushes change notifications, the store is only checked
+        after a notification or max_lag seconds after the last check; pass
+        force=True after a write so the writer sees its own change.
+        """
+        snapshot = self._snapshot
+        if (self._pushed and not force and not self._dirty
+                and time.monotonic() - self._checked_at < self.max_lag):
+            return snapshot
+        # Cleared before the check so a notification arriving during it is kept
+        self._dirty = False
+        self._checked_at = time.monotonic()
+        if self._store.latest_change() == snapshot.version:
+            return snapshot
+
+        with self._write_lock:
+            snapshot = self._snapshot
+            changes, latest = self._store.changes_since(snapshot.version)
+            if changes is None:
+                logger.info("Job change log truncated, rebuilding search index")
+                snapshot = self._rebuild()
+            elif changes:
+                snapshot = self._apply(snapshot, changes, latest)
+            self._snapshot = snapshot
+            return snapshot
+
+    def _rebuild(self):
+        # Read the version first: changes racing with list() are replayed later
+        version = self._store.latest_change()
+        entries = self._store.list_positioned()
+        jobs = [job for _, job in entries]
+        semantic = self._semantic_factory(jobs) if self._semantic_factory else None
+        self._publishes += 1
+        return JobSnapshot(version, JobSearchIndex(jobs, [position for position, _ in entries]), semantic)
+
+    def _apply(self, snapshot, changes, latest):
+        """Apply a batch of changes to clones of snapshot's indexes"""
+        index = snapshot.index.copy()
+        semantic = snapshot.semantic.copy() if snapshot.semantic is not None else None
+        # Only the last operation per job matters
+        ops = {job_id: op for _, job_id, op in changes}
+        stored = self._store.get_many_positioned([job_id for job_id, op in ops.items() if op == 'upsert'])
+        upserts = []
+        for job_id, op in ops.items():
+            if job_id in stored:
+                position, job = stored[job_id]
+                index.add(job, position)
+                upserts.append(job)
+            else:
+                index.remove(job_id)
+                if semantic is not None:
+                    semantic.remove(job_id)
+        if semantic is not None:
+            semantic.add_many(upserts)
+        index.freeze()
+        self._publishes += 1
+        return JobSnapshot(latest, index, semantic)
+
+    def watch(self, poll_interval=1.0):
+        """Refresh in the background on store notifications, or every poll_interval seconds"""
+        if self._poll_interval is not None:
+            return
+        self._poll_interval = poll_interval
+        self._pushed = self._store.subscribe(self._on_change)
+        self._start_watcher()
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+
+    def _on_change(self):
+        self.notifications += 1
+        self._dirty = True
+        self._wake.set()
+
+    def _start_watcher(self):
+        self._stopping.clear()
+        threading.Thread(target=self._watch, name='job-snapshot-watch', daemon=True).start()
+
+    def _after_fork(self):
+        # Only the forking thread survives: a lock or event held by the
+        # parent's watcher would never be released in the child
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        if self._poll_interval is not None:
+            self._start_watcher()
+
+    def _watch(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self._poll_interval)
+            self._wake.clear()
+            if self._stopping.is_set():
+                return
+            try:
+                self.refresh(force=True)
+            except Exception as e:
+                logger.warning(f"Background job snapshot refresh failed: {str(e)}")
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {"version": snapshot.version, "jobs": len(snapshot),
+                "publishes": self._publishes, "published_at": snapshot.published_at,
+                "watching": self._poll_interval is not None, "push_notifications": self._pushed,
+                "notifications": self.notifications}
@@ -0,0 +1,496 @@
+"""
+Pluggable job storage for the /api/jobs handlers.
+
+SQLiteJobStore is the default: one WAL-mode database file shared by every
+worker process, with the job id as primary key and secondary indexes on
+location and posted_date. Each write is also appended to a change log so
+workers can bring their in-process search index up to date incrementally.
+Stores also keep a content hash per job so bulk loads can skip postings that
+are already in the catalogue.
+
+Every stored job has a position: an integer that orders the catalogue by
+insertion (a replaced job moves to the end) and is the same in every worker,
+so listing cursors built from it stay valid whichever worker serves the next
+page.
+
+RedisJobStore keeps the same data in Redis for deployments spread over
+several hosts, and announces every write on a pub/sub channel so workers
+refresh their indexes as soon as the catalogue changes.
+"""
+
+import hashlib
+import json
+import threading
+
+from connections import RedisSubscriptions, SQLiteConnections
+from lazy_imports import lazy_import
+
+redis = lazy_import('redis')
+
+# Change log entries kept before old ones are pruned; a worker that falls
+# further behind than this rebuilds its index from scratch
+CHANGE_LOG_RETENTION = 10000
+
+# Fields that identify a posting; id and posted_date are assigned on insert
+CONTENT_FIELDS = ('title', 'company', 'location', 'salary', 'skills', 'contact', 'description')
+
+
+def _normalize(value):
+    if isinstance(value, (list, tuple)):
+        return sorted(_normalize(item) for item in value)
+    return ' '.join(str(value).split()).casefold()
+
+
+def content_hash(job):
+    """sha256 of a job's normalized content, ignoring case, whitespace and skill order"""
+    content = [_normalize(job.get(field, '')) for field in CONTENT_FIELDS]
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class JobStore:
+    """Interface shared by the job store backends"""
+
+    def get(self, job_id):
+        raise NotImplementedError
+
+    def get_many(self, job_ids):
+        """{job_id: job} for the ids that exist"""
+        jobs = {}
+        for job_id in job_ids:
+            job = self.get(job_id)
+            if job is not None:
+                jobs[job_id] = job
+        return jobs
+
+    def list(self):
+        """All jobs in insertion order"""
+        return [job for _, job in self.list_positioned()]
+
+    def list_positioned(self):
+        """(position, job) for all jobs, in position order"""
+        raise NotImplementedError
+
+    def get_many_positioned(self, job_ids):
+        """{job_id: (position, job)} for the ids that exist"""
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def add(self, job):
+        self.add_many([job])
+
+    def add_many(self, jobs):
+        """Insert or replace several jobs in one transaction"""
+        raise NotImplementedError
+
+    def delete(self, job_id):
+        """Delete a job; returns False if it did not exist"""
+        raise NotImplementedError
+
+    def existing_hashes(self, hashes):
+        """The subset of the given content hashes that belong to stored jobs"""
+        raise NotImplementedError
+
+    def latest_change(self):
+        """Sequence number of the most recent write"""
+        raise NotImplementedError
+
+    def changes_since(self, seq):
+        """
+        Return (changes, latest_seq) where changes is a list of
+        (seq, job_id, op) with op 'upsert' or 'delete'. changes is None when
+        seq is older than the retained log and the caller must reload.
+        """
+        raise NotImplementedError
+
+    def subscribe(self, callback):
+        """
+        Call callback() on a background thread after any worker writes.
+        Returns False if the store cannot push changes and must be polled.
+        """
+        return False
+
+    def close(self):
+        """Release connections held by the calling thread"""
+
+
+class MemoryJobStore(JobStore):
+    """Per-process store for development and tests"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # job id -> (position, job), kept in position order
+        self._jobs = {}
+        self._hashes = {}
+        self._changes = []
+        self._seq = 0
+        self._position = 0
+
+    def get(self, job_id):
+        entry = self._jobs.get(job_id)
+        return entry[1] if entry else None
+
+    def list_positioned(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get_many_positioned(self, job_ids):
+        with self._lock:
+            return {job_id: self._jobs[job_id] for job_id in job_ids if job_id in self._jobs}
+
+    def count(self):
+        return len(self._jobs)
+
+    def add_many(self, jobs):
+        with self._lock:
+            for job in jobs:
+                # A replaced job moves to the end, as with SQLite's INSERT OR REPLACE
+                previous = self._jobs.pop(job['id'], None)
+                self._forget_hash_locked(previous[1] if previous else None)
+                self._position += 1
+                self._jobs[job['id']] = (self._position, job)
+                self._hashes[content_hash(job)] = job['id']
+                self._log_locked(job['id'], 'upsert')
+
+    def delete(self, job_id):
+        with self._lock:
+            entry = self._jobs.pop(job_id, None)
+            if entry is None:
+                return False
+            self._forget_hash_locked(entry[1])
+            self._log_locked(job_id, 'delete')
+            return True
+
+    def _forget_hash_locked(self, job):
+        if job is not None:
+            digest = content_hash(job)
+            if self._hashes.get(digest) == job['id']:
+                del self._hashes[digest]
+
+    def existing_hashes(self, hashes):
+        with self._lock:
+            return {digest for digest in hashes if digest in self._hashes}
+
+    def _log_locked(self, job_id, op):
+        self._seq += 1
+        self._changes.append((self._seq, job_id, op))
+        if len(self._changes) > CHANGE_LOG_RETENTION:
+            del self._changes[:len(self._changes) - CHANGE_LOG_RETENTION]
+
+    def latest_change(self):
+        return self._seq
+
+    def changes_since(self, seq):
+        with self._lock:
+            if seq >= self._seq:
+                return [], self._seq
+            if self._changes and self._changes[0][0] > seq + 1:
+                return None, self._seq
+            return [change for change in self._changes if change[0] > seq], self._seq
+
+
+class SQLiteJobStore(JobStore):
+    """Embedded SQLite store in WAL mode, safe to share between processes"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            location TEXT NOT NULL DEFAULT '',
+            posted_date TEXT NOT NULL DEFAULT '',
+            data TEXT NOT NULL,
+            content_hash TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs (location COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_jobs_posted_date ON jobs (posted_date);
+        CREATE TABLE IF NOT EXISTS job_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL,
+            op TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connections = SQLiteConnections(path)
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+            self._migrate(conn)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_content_hash ON jobs (content_hash)')
+
+    def _migrate(self, conn):
+        """Add and backfill the content_hash column in databases created before it existed"""
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(jobs)')}
+        if 'content_hash' in columns:
+            return
+        conn.execute('ALTER TABLE jobs ADD COLUMN content_hash TEXT')
+        rows = conn.execute('SELECT id, data FROM jobs').fetchall()
+        conn.executemany('UPDATE jobs SET content_hash = ? WHERE id = ?',
+                         [(content_hash(json.loads(data)), job_id) for job_id, data in rows])
+
+    def _connection(self):
+        return self._connections.get()
+
+    def close(self):
+        self._connections.close()
+
+    def get(self, job_id):
+        row = self._connection().execute(
+            'SELECT data FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_positioned(self):
+        rows = self._connection().execute('SELECT rowid, data FROM jobs ORDER BY rowid')
+        return [(rowid, json.loads(data)) for rowid, data in rows]
+
+    def get_many_positioned(self, job_ids):
+        job_ids = list(job_ids)
+        found = {}
+        conn = self._connection()
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            for job_id, rowid, data in conn.execute(
+                    f'SELECT id, rowid, data FROM jobs WHERE id IN ({placeholders})', chunk):
+                found[job_id] = (rowid, json.loads(data))
+        return found
+
+    def count(self):
+        return self._connection().execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def add_many(self, jobs):
+        rows = [
+            (job['id'], job.get('location', ''), job.get('posted_date', ''),
+             json.dumps(job, ensure_ascii=False), content_hash(job))
+            for job in jobs
+        ]
+        if not rows:
+            return
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO job_changes (job_id, op) VALUES (?, 'upsert')",
+                [(row[0],) for row in rows])
+            # The transaction holds the write lock, so this batch's change
+            # sequence numbers are contiguous. They become the jobs' rowids:
+            # AUTOINCREMENT never reuses one, so positions only grow.
+            last = conn.execute('SELECT MAX(seq) FROM job_changes').fetchone()[0]
+            first = last - len(rows) + 1
+            conn.executemany(
+                'INSERT OR REPLACE INTO jobs (rowid, id, location, posted_date, data, content_hash) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(first + i,) + row for i, row in enumerate(rows)])
+            self._prune_changes(conn)
+
+    def delete(self, job_id):
+        with self._connection() as conn:
+            deleted = conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,)).rowcount
+            if deleted:
+                conn.execute("INSERT INTO job_changes (job_id, op) VALUES (?, 'delete')", (job_id,))
+        return bool(deleted)
+
+    def existing_hashes(self, hashes):
+        hashes = list(hashes)
+        found = set()
+        conn = self._connection()
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            found.update(digest for (digest,) in conn.execute(
+                f'SELECT content_hash FROM jobs WHERE content_hash IN ({placeholders})', chunk))
+        return found
+
+    def _prune_changes(self, conn):
+        conn.execute(
+            'DELETE FROM job_changes WHERE seq <= (SELECT MAX(seq) FROM job_changes) - ?',
+            (CHANGE_LOG_RETENTION,))
+
+    def latest_change(self):
+        return self._connection().execute('SELECT MAX(seq) FROM job_changes').fetchone()[0] or 0
+
+    def changes_since(self, seq):
+        conn = self._connection()
+        rows = conn.execute(
+            'SELECT seq, job_id, op FROM job_changes WHERE seq > ? ORDER BY seq', (seq,)).fetchall()
+        if not rows:
+            latest = self.latest_change()
+            # The log was reset or pruned past our position
+            if latest < seq:
+                return None, latest
+            return [], latest
+        if rows[0][0] > seq + 1:
+            oldest = conn.execute('SELECT MIN(seq) FROM job_changes').fetchone()[0]
+            if oldest > seq + 1:
+                return None, rows[-1][0]
+        return rows, rows[-1][0]
+
+
+class RedisJobStore(JobStore):
+    """
+    Store in a Redis-compatible server, shared by workers on every host.
+
+    Jobs live in a hash, insertion order in a sorted set scored by a counter,
+    and the change log in a list whose first retained entry has sequence
+    number trimmed + 1. Each write is one MULTI/EXEC transaction followed by
+    a notification on the changes channel; deletes WATCH the jobs hash so
+    that only one of several concurrent deletes of a job logs a change.
+    """
+
+    def __init__(self, url, prefix='vocawork:'):
+        self.url = url
+        self.prefix = prefix
+        # The connection pool reconnects by itself in forked workers
+        self.client = redis.Redis.from_url(url)
+        self._jobs = f"{prefix}jobs"
+        self._hashes = f"{prefix}job_hashes"
+        self._order = f"{prefix}job_order"
+        self._rowid = f"{prefix}job_rowid"
+        self._changes = f"{prefix}job_changes"
+        self._trimmed = f"{prefix}job_changes_trimmed"
+        self._channel = f"{prefix}job_changes"
+        self._subscriptions = RedisSubscriptions(self.client)
+
+    def get(self, job_id):
+        data = self.client.hget(self._jobs, job_id)
+        return json.loads(data) if data else None
+
+    def get_many(self, job_ids):
+        job_ids = list(job_ids)
+        jobs = {}
+        for start in range(0, len(job_ids), 1000):
+            chunk = job_ids[start:start + 1000]
+            for job_id, data in zip(chunk, self.client.hmget(self._jobs, chunk)):
+                if data:
+                    jobs[job_id] = json.loads(data)
+        return jobs
+
+    def list_positioned(self):
+        order = [(job_id.decode('utf-8'), int(score))
+                 for job_id, score in self.client.zrange(self._order, 0, -1, withscores=True)]
+        jobs = self.get_many(job_id for job_id, _ in order)
+        return [(position, jobs[job_id]) for job_id, position in order if job_id in jobs]
+
+    def get_many_positioned(self, job_ids):
+        job_ids = list(job_ids)
+        found = {}
+        for start in range(0, len(job_ids), 1000):
+            chunk = job_ids[start:start + 1000]
+            with self.client.pipeline(transaction=True) as pipe:
+                pipe.hmget(self._jobs, chunk)
+                pipe.zmscore(self._order, chunk)
+                datas, scores = pipe.execute()
+            for job_id, data, score in zip(chunk, datas, scores):
+                if data and score is not None:
+                    found[job_id] = (int(score), json.loads(data))
+        return found
+
+    def count(self):
+        return self.client.hlen(self._jobs)
+
+    def add_many(self, jobs):
+        if not jobs:
+            return
+        ids = [job['id'] for job in jobs]
+        # Content hashes of jobs being replaced stop pointing at them
+        replaced = [content_hash(job) for job in self.get_many(ids).values()]
+        last_rowid = self.client.incrby(self._rowid, len(jobs))
+        with self.client.pipeline(transaction=True) as pipe:
+            if replaced:
+                pipe.hdel(self._hashes, *replaced)
+            pipe.hset(self._jobs, mapping={job['id']: json.dumps(job, ensure_ascii=False) for job in jobs})
+            pipe.hset(self._hashes, mapping={content_hash(job): job['id'] for job in jobs})
+            pipe.zadd(self._order, {job_id: last_rowid - len(ids) + i + 1 for i, job_id in enumerate(ids)})
+            pipe.rpush(self._changes, *(f"upsert {job_id}" for job_id in ids))
+            pipe.execute()
+        self._prune_changes()
+        self.client.publish(self._channel, 'upsert')
+
+    def delete(self, job_id):
+        def remove(pipe):
+            # Runs again from the top if the watched hashes change before EXEC
+            data = pipe.hget(self._jobs, job_id)
+            if data is None:
+                return False
+            digest = content_hash(json.loads(data))
+            owner = pipe.hget(self._hashes, digest)
+            pipe.multi()
+            pipe.hdel(self._jobs, job_id)
+            pipe.zrem(self._order, job_id)
+            if owner is not None and owner.decode('utf-8') == job_id:
+                pipe.hdel(self._hashes, digest)
+            pipe.rpush(self._changes, f"delete {job_id}")
+            return True
+
+        deleted = self.client.transaction(remove, self._jobs, self._hashes, value_from_callable=True)
+        if deleted:
+            self.client.publish(self._channel, 'delete')
+        return deleted
+
+    def existing_hashes(self, hashes):
+        hashes = list(hashes)
+        found = set()
+        for start in range(0, len(hashes), 1000):
+            chunk = hashes[start:start + 1000]
+            found.update(digest for digest, job_id in zip(chunk, self.client.hmget(self._hashes, chunk))
+                         if job_id is not None)
+        return found
+
+    def _prune_changes(self):
+        length = self.client.llen(self._changes)
+        # Trim in steps so the log is not rewritten on every write
+        if length <= CHANGE_LOG_RETENTION + CHANGE_LOG_RETENTION // 10:
+            return
+        excess = length - CHANGE_LOG_RETENTION
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.ltrim(self._changes, excess, -1)
+            pipe.incrby(self._trimmed, excess)
+            pipe.execute()
+
+    def latest_change(self):
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.get(self._trimmed)
+            pipe.llen(self._changes)
+            trimmed, length = pipe.execute()
+        return int(trimmed or 0) + length
+
+    def changes_since(self, seq):
+        # The list index of seq depends on trimmed, so retry if a trim races the read
+        while True:
+            trimmed = int(self.client.get(self._trimmed) or 0)
+            if seq < trimmed:
+                return None, self.latest_change()
+            with self.client.pipeline(transaction=True) as pipe:
+                pipe.get(self._trimmed)
+                pipe.lrange(self._changes, seq - trimmed, -1)
+                pipe.llen(self._changes)
+                current, entries, length = pipe.execute()
+            if int(current or 0) == trimmed:
+                break
+        latest = trimmed + length
+        if latest < seq:
+            # The log was reset
+            return None, latest
+        changes = []
+        for offset, entry in enumerate(entries, seq + 1):
+            op, job_id = entry.decode('utf-8').split(' ', 1)
+            changes.append((offset, job_id, op))
+        return changes, latest
+
+    def subscribe(self, callback):
+        self._subscriptions.subscribe(self._channel, lambda message: callback())
+        return True
+
+    def close(self):
+        self._subscriptions.close()
+        self.client.close()
+
+
+def create_job_store(url):
+    """Build a store from a URL such as 'sqlite:///data/jobs.db', 'redis://host:6379/0' or 'memory://'"""
+    if url.startswith('memory://'):
+        return MemoryJobStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteJobStore(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisJobStore(url)
+    raise ValueError(f"Unsupported job store URL: {url}")
@@ -0,0 +1,74 @@
+"""
+Deferred imports for heavy optional-path dependencies.
+
+google.generativeai, speech_recognition, pydub and numpy together add about
+a second to a cold start, yet an instance serving only /api/jobs never needs
+them. lazy_import returns a stand-in that imports the real module on first
+attribute access and records how long that took, so import cost moves to the
+first request that needs it (or to warm-up) and stays visible.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+
+_lock = threading.Lock()
+_import_times = {}
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    already_imported = self._name in sys.modules
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    if not already_imported:
+                        _import_times[self._name] = round((time.perf_counter() - started) * 1000, 1)
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def load(*modules):
+    """Import the given lazy modules now, e.g. during warm-up"""
+    for module in modules:
+        module._load()
+
+
+def is_installed(name):
+    """Whether a module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def import_times():
+    """Milliseconds spent importing each lazily loaded module so far"""
+    with _lock:
+        return dict(_import_times)
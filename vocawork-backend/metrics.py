@@ -0,0 +1,270 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Counters and histograms are label-aware and updated under a per-metric lock,
+which keeps the cost on the request path to a dict lookup and a bisect.
+
+Each process keeps its own values. With a multiprocess directory, every
+process writes its totals there (periodically and when it exits) and a scrape
+of any one process renders the sum over all of them, including workers that
+have since exited, so counters never go backwards when a worker is replaced.
+"""
+
+import contextvars
+import glob
+import json
+import os
+import threading
+import uuid
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Outcome of the pipeline stage currently being timed; stages override the
+# default by calling set_outcome() (e.g. 'hit', 'fallback', 'mock')
+_stage_outcome = contextvars.ContextVar('stage_outcome', default='ok')
+
+
+def set_outcome(outcome):
+    _stage_outcome.set(outcome)
+
+
+def begin_stage():
+    return _stage_outcome.set('ok')
+
+
+def end_stage(token):
+    outcome = _stage_outcome.get()
+    _stage_outcome.reset(token)
+    return outcome
+
+
+# Language and stage outcomes seen while serving the current request
+_request_stages = contextvars.ContextVar('request_stages', default=None)
+
+# Most significant first: a request that fell back anywhere is a fallback
+# even if another stage was a cache hit
+REQUEST_OUTCOMES = ('error', 'mock', 'fallback', 'hit')
+
+
+def begin_request():
+    _request_stages.set({'language': None, 'outcomes': set()})
+
+
+def note_stage(language, outcome):
+    """Record a finished stage against the request being served, if any"""
+    stages = _request_stages.get()
+    if stages is not None:
+        stages['language'] = stages['language'] or language
+        stages['outcomes'].add(outcome)
+
+
+def end_request(failed=False):
+    """(language, outcome) for the request: 'none' and 'ok' when it ran no stages"""
+    stages = _request_stages.get() or {'language': None, 'outcomes': set()}
+    _request_stages.set(None)
+    outcomes = stages['outcomes'] | ({'error'} if failed else set())
+    outcome = next((name for name in REQUEST_OUTCOMES if name in outcomes), 'ok')
+    return stages['language'] or 'none', outcome
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def merge(total, values):
+        for labels, value in values.items():
+            total[labels] = total.get(labels, 0) + value
+
+    def render(self, values=None):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted((self.snapshot() if values is None else values).items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: list(series) for labels, series in self._values.items()}
+
+    def reset(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def merge(total, values):
+        for labels, series in values.items():
+            if labels in total:
+                total[labels] = [a + b for a, b in zip(total[labels], series)]
+            else:
+                total[labels] = list(series)
+
+    def render(self, values=None):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted((self.snapshot() if values is None else values).items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {series[-1]!r}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self, multiprocess_dir=None):
+        self._metrics = []
+        self._collectors = []
+        self.multiprocess_dir = multiprocess_dir
+        self._path = None
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stop = threading.Event()
+        if multiprocess_dir:
+            os.makedirs(multiprocess_dir, exist_ok=True)
+            # A forked child starts from zero under its own file, so values
+            # recorded in the parent are never counted twice
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect):
+        """Register a callable returning exposition lines, evaluated at scrape time"""
+        self._collectors.append(collect)
+
+    def render(self):
+        totals = self._collect_processes() if self.multiprocess_dir else {}
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(totals.get(metric.name)))
+        for collect in self._collectors:
+            lines.extend(collect())
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        """Write this process's totals to the multiprocess directory"""
+        if not self.multiprocess_dir:
+            return
+        with self._flush_lock:
+            if self._path is None:
+                # The pid alone could be reused by a later worker, overwriting
+                # the totals an exited one left behind
+                self._path = os.path.join(self.multiprocess_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+            data = {metric.name: [[list(labels), value] for labels, value in metric.snapshot().items()]
+                    for metric in self._metrics}
+            temp_path = self._path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self._path)
+
+    def start_flushing(self, interval=1.0):
+        """Flush every interval seconds on a daemon thread until close()"""
+        if not self.multiprocess_dir or self._flusher is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name='metrics-flush', daemon=True)
+        self._flusher.start()
+
+    def close(self):
+        """Stop flushing and write the final totals; call before the process exits"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=2)
+            self._flusher = None
+        self.flush()
+
+    def _after_fork(self):
+        self._path = None
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stop = threading.Event()
+        for metric in self._metrics:
+            metric.reset()
+
+    def _collect_processes(self):
+        self.flush()
+        by_name = {metric.name: metric for metric in self._metrics}
+        totals = {name: {} for name in by_name}
+        for path in glob.glob(os.path.join(self.multiprocess_dir, '*.json')):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, values in data.items():
+                if name in by_name:
+                    by_name[name].merge(totals[name], {tuple(labels): value for labels, value in values})
+        return totals
+
+
+def clear_multiprocess_dir(directory):
+    """Remove totals left by a previous run; call once before starting the workers"""
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
@@ -0,0 +1,164 @@
+"""
+Opt-in cProfile profiles of individual requests.
+
+A request to one of the profiled path prefixes is profiled when it carries
+an X-Profile header equal to PROFILE_TOKEN, or is picked at random with
+probability PROFILE_SAMPLE_RATE. The profile covers the handler (not the
+body of a streamed response) on the request's own thread, so work handed
+to executor threads shows up as time spent waiting for it. Each profile is
+written as a pstats file plus a JSON
+sidecar describing the request. The directory is a ring buffer: the oldest
+profiles are deleted once it holds more than max_files profiles or
+max_bytes. The app only samples when a token is also set, since reading
+profiles back needs it, and without a token it installs no hooks at all.
+"""
+
+import cProfile
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID = re.compile(r'^\d{13}-\d+-[0-9a-f]{8}$')
+SORT_KEYS = ('cumulative', 'tottime', 'calls', 'ncalls', 'time')
+
+
+class RequestProfiler:
+    """Decides which requests to profile and keeps their profiles on disk"""
+
+    def __init__(self, directory, sample_rate=0.0, token=None,
+                 prefixes=('/api/process-voice', '/api/jobs'), max_bytes=50 * 1024 * 1024, max_files=200):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.token = token
+        self.prefixes = tuple(prefixes)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self.saved = 0
+        self.skipped = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def authorized(self, header_value):
+        return bool(self.token and header_value) and hmac.compare_digest(header_value, self.token)
+
+    def trigger(self, path, header_value):
+        """'header', 'sample' or None for a request to path"""
+        if not path.startswith(self.prefixes):
+            return None
+        if self.authorized(header_value):
+            return 'header'
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sample'
+        return None
+
+    def start(self):
+        """An enabled cProfile.Profile, or None if another profiler is active"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one cProfile at a time per process
+            with self._lock:
+                self.skipped += 1
+            return None
+        return profile
+
+    def save(self, profile, info):
+        """Write a stopped profile and its request info; returns the profile id"""
+        profile_id = f"{int(time.time() * 1000)}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        path = os.path.join(self.directory, profile_id)
+        try:
+            profile.dump_stats(f"{path}.prof")
+            with open(f"{path}.json", 'w', encoding='utf-8') as f:
+                json.dump(dict(info, id=profile_id), f)
+        except OSError as e:
+            logger.warning(f"Could not write request profile {path}: {str(e)}")
+            return None
+        with self._lock:
+            self.saved += 1
+        self._prune()
+        return profile_id
+
+    def _prune(self):
+        """Delete the oldest profiles beyond max_files or max_bytes"""
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith('.prof'))
+        except OSError:
+            return
+        profiles = [(name[:-len('.prof')], self._size(name) + self._size(f"{name[:-len('.prof')]}.json"))
+                    for name in names]
+        count = len(profiles)
+        total = sum(size for _, size in profiles)
+        for profile_id, size in profiles:
+            if count <= self.max_files and total <= self.max_bytes:
+                break
+            self._remove(profile_id)
+            count -= 1
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def _size(self, name):
+        try:
+            return os.path.getsize(os.path.join(self.directory, name))
+        except OSError:
+            return 0
+
+    def _remove(self, profile_id):
+        for ext in ('.prof', '.json'):
+            try:
+                os.remove(os.path.join(self.directory, f"{profile_id}{ext}"))
+            except OSError:
+                pass
+
+    def list(self):
+        """Request info of the stored profiles, newest first"""
+        profiles = []
+        try:
+            names = sorted((name for name in os.listdir(self.directory) if name.endswith('.json')), reverse=True)
+        except OSError:
+            return profiles
+        for name in names:
+            try:
+                with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def path(self, profile_id):
+        """Path of a stored .prof file, or None"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.prof")
+        return path if os.path.exists(path) else None
+
+    def render(self, profile_id, sort='cumulative', limit=40):
+        """pstats text report of a stored profile, or None"""
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        output = io.StringIO()
+        stats = pstats.Stats(path, stream=output)
+        stats.strip_dirs().sort_stats(sort if sort in SORT_KEYS else 'cumulative').print_stats(limit)
+        return output.getvalue()
+
+    def stats(self):
+        return {
+            "sample_rate": self.sample_rate,
+            "header_enabled": bool(self.token),
+            "saved": self.saved,
+            "skipped": self.skipped,
+            "evictions": self.evictions,
+        }
@@ -2,12 +2,19 @@
 """
 Quick start script for Vocawork Backend with Gemini AI
 Run this to start the Flask server
+
+    python run_backend.py                      # development server with reloader
+    python run_backend.py --mode production    # gunicorn, several workers, preloaded app
+    python run_backend.py --install-requirements
 """
 
+import argparse
 import subprocess
 import sys
 import os
 
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
 def install_requirements():
     """Install required packages"""
     print("Installing required packages...")
@@ -22,29 +29,29 @@ def install_requirements():
 def check_environment():
     """Check if required environment variables are set"""
     print("Checking environment variables...")
-    
+
     gemini_key = os.environ.get('GEMINI_API_KEY')
     if gemini_key:
         print("✅ GEMINI_API_KEY found")
     else:
         print("⚠️  GEMINI_API_KEY not found - will use fallback responses")
-    
+
     return True
 
-def start_server():
-    """Start the Flask server"""
+def start_server(host, port):
+    """Start the Flask development server"""
     print("Starting Vocawork backend server with Gemini AI...")
-    print("🚀 Server will be available at: http://localhost:5000")
-    print("📱 Frontend should connect to: http://localhost:5000/api")
+    print(f"🚀 Server will be available at: http://localhost:{port}")
+    print(f"📱 Frontend should connect to: http://localhost:{port}/api")
     print("🤖 Gemini AI integration: Speech-to-text and intent extraction")
     print("\nPress Ctrl+C to stop the server\n")
-    
+
     try:
         # Set environment variables
         os.environ['FLASK_DEBUG'] = 'True'
-        os.environ['HOST'] = '0.0.0.0'
-        os.environ['PORT'] = '5000'
-        
+        os.environ['HOST'] = host
+        os.environ['PORT'] = str(port)
+
         # Run the Flask app
         subprocess.run([sys.executable, "app.py"])
     except KeyboardInterrupt:
@@ -52,15 +59,126 @@ def start_server():
     except Exception as e:
         print(f"❌ Error starting server: {e}")
 
+def start_production_server(host, port, workers, threads, timeout, graceful_timeout):
+    """
+    Serve the app with gunicorn: the app module (Gemini client, vocabularies,
+    job index) is loaded once in the master and shared with forked workers
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("❌ Production mode needs gunicorn: pip install -r requirements.txt")
+        return 1
+
+    import signal
+
+    metrics_dir = os.environ.get('METRICS_MULTIPROC_DIR')
+    if metrics_dir:
+        # Totals from a previous run would be added to this one's
+        import metrics
+        metrics.clear_multiprocess_dir(metrics_dir)
+
+    def post_fork(server, worker):
+        # Background threads start per worker, never in the preloading master
+        import app as backend
+        backend.start_background_work()
+
+    def post_worker_init(worker):
+        # Fail readiness as soon as a worker is asked to stop, then let
+        # gunicorn finish in-flight requests within graceful_timeout
+        import app as backend
+        default_handler = signal.getsignal(signal.SIGTERM)
+
+        def on_sigterm(signum, frame):
+            backend.begin_shutdown()
+            if callable(default_handler):
+                default_handler(signum, frame)
+
+        signal.signal(signal.SIGTERM, on_sigterm)
+
+    def worker_exit(server, worker):
+        import app as backend
+        backend.shutdown()
+
+    class VocaworkApplication(BaseApplication):
+        def load_config(self):
+            settings = {
+                'bind': f"{host}:{port}",
+                'workers': workers,
+                'worker_class': 'gthread',
+                'threads': threads,
+                'timeout': timeout,
+                'graceful_timeout': graceful_timeout,
+                'keepalive': 5,
+                'preload_app': True,
+                'accesslog': '-',
+                'post_fork': post_fork,
+                'post_worker_init': post_worker_init,
+                'worker_exit': worker_exit,
+            }
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app import app
+            return app
+
+    print(f"🚀 Production server on http://{host}:{port} "
+          f"({workers} workers x {threads} threads)")
+    print(f"🩺 Readiness probe: http://{host}:{port}/api/ready")
+    VocaworkApplication().run()
+    return 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Start the Vocawork backend")
+    parser.add_argument('--mode', choices=['dev', 'production'],
+                        default=os.environ.get('VOCAWORK_MODE', 'dev'),
+                        help="dev: Flask reloader; production: gunicorn workers (default: $VOCAWORK_MODE or dev)")
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('WEB_CONCURRENCY', min(2 * (os.cpu_count() or 1) + 1, 9))),
+                        help="worker processes in production mode (default: $WEB_CONCURRENCY)")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 8)),
+                        help="request threads per worker (default: $WEB_THREADS or 8)")
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('WEB_TIMEOUT', 120)),
+                        help="seconds before a stuck worker is restarted")
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30)),
+                        help="seconds workers get to finish requests on shutdown")
+    parser.add_argument('--warm-up', dest='warm_up', action='store_true',
+                        help="load speech/Gemini dependencies and the Gemini client at startup instead of "
+                             "on first use (default in production mode, or $WARM_UP)")
+    parser.add_argument('--no-warm-up', dest='warm_up', action='store_false',
+                        help="leave them to each worker's first request")
+    parser.set_defaults(warm_up=None)
+    parser.add_argument('--install-requirements', action='store_true',
+                        help="pip install -r requirements.txt before starting")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    # app.py resolves static/ and data/ relative to the backend directory
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+
     print("🎯 Vocawork Backend Setup with Gemini AI")
     print("=" * 50)
-    
+
     # Check environment
-    if check_environment():
-        # Install requirements
-        if install_requirements():
-            print("\n" + "=" * 50)
-            start_server()
-        else:
-            print("❌ Setup failed. Please check the error messages above.")
\ No newline at end of file
+    check_environment()
+    if args.install_requirements and not install_requirements():
+        print("❌ Setup failed. Please check the error messages above.")
+        sys.exit(1)
+
+    # In production the master warms up once before forking, so no worker
+    # pays for it on its first voice request
+    if args.warm_up is None:
+        default = 'true' if args.mode == 'production' else 'false'
+        args.warm_up = os.environ.get('WARM_UP', default).lower() == 'true'
+    os.environ['WARM_UP'] = 'true' if args.warm_up else 'false'
+
+    print("\n" + "=" * 50)
+    if args.mode == 'production':
+        sys.exit(start_production_server(args.host, args.port, args.workers, args.threads,
+                                         args.timeout, args.graceful_timeout))
+    start_server(args.host, args.port)
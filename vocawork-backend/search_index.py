@@ -0,0 +1,436 @@
+"""
+In-process inverted index over the job catalogue.
+
+Used by find_matching_jobs (voice search) and GET /api/jobs (text search) so
+neither has to scan and re-lowercase every posting per request. Both keep
+the original substring semantics ("script" finds "JavaScript Developer"):
+the vocabulary is searched for tokens containing each needle, and only
+needles spanning several tokens are re-checked against the job text.
+"""
+
+import heapq
+import re
+import sys
+from bisect import bisect_right
+from collections import defaultdict
+from operator import itemgetter
+
+# Latin word characters plus the Indic script blocks (Devanagari .. Malayalam),
+# so vowel signs and viramas stay inside their word
+TOKEN_RE = re.compile(r'[\w\u0900-\u0dff]+')
+
+# Scoring weights, kept identical to the original linear scan
+TITLE_PHRASE_WEIGHT = 5
+TITLE_WORD_WEIGHT = 3
+LOCATION_WEIGHT = 3
+SKILL_WEIGHT = 2
+DESCRIPTION_WORD_WEIGHT = 0.5
+MIN_DESCRIPTION_WORD_LENGTH = 4
+
+# Orders accepted by JobSearchIndex.page
+SORT_ORDERS = ('catalogue', 'posted_date', 'score')
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def _token_set(texts):
+    # Interned, so each distinct word is stored once however many jobs use it
+    return frozenset(sys.intern(token) for text in texts for token in tokenize(text))
+
+
+class _IndexedJob:
+    """
+    Search record compiled once when a job is indexed: lowercased text for
+    substring filters, the location facet key and per-field token sets
+    """
+
+    __slots__ = ('job', 'position', 'title', 'description', 'location', 'skills',
+                 'title_tokens', 'description_tokens', 'location_tokens', 'skills_tokens')
+
+    def __init__(self, job, position):
+        self.job = job
+        self.position = position
+        self.title = job.get('title', '').lower()
+        self.description = job.get('description', '').lower()
+        self.location = job.get('location', '').lower().strip()
+        self.skills = tuple(skill.lower() for skill in job.get('skills', []) or [])
+        self.title_tokens = _token_set((self.title,))
+        self.description_tokens = _token_set((self.description,))
+        self.location_tokens = _token_set((self.location,))
+        self.skills_tokens = _token_set(self.skills)
+
+    def tokens(self, field):
+        return getattr(self, field + '_tokens')
+
+
+class JobSearchIndex:
+    """
+    Tokenized inverted postings over title, skills, description and location.
+
+    An index is mutated by one writer at a time. copy() returns a clone that
+    shares every posting set with the original and copies a set only when
+    the clone first changes it, so a published index can keep serving
+    lock-free readers while the next version is prepared from it.
+
+    Jobs are ordered, for listings and ranking ties, by their position:
+    the job store's position when the caller passes one (identical in every
+    worker, so cursors can move between workers), otherwise a local counter.
+    """
+
+    FIELDS = ('title', 'skills', 'description', 'location')
+
+    def __init__(self, jobs=None, positions=None):
+        """positions, if given, holds the store position of each job in jobs"""
+        self._docs = {}
+        self._next_position = 0
+        # field -> token -> set of job ids
+        self._postings = {field: {} for field in self.FIELDS}
+        # token -> number of (job, field) pairs containing it; drives prefix lookups
+        self._vocab = {}
+        self._vocab_sorted = None
+        # The sorted vocabulary joined by newlines and each token's offset in
+        # it, so one str.find pass finds every token containing a needle
+        self._vocab_text = ''
+        self._vocab_offsets = []
+        # facet maps: normalized location / skill string -> set of job ids
+        self._locations = {}
+        self._skills = {}
+        # id() of the id sets this index created or copied and may mutate;
+        # every other set is shared with the index it was copied from
+        self._owned = set()
+        if jobs:
+            if positions is None:
+                for job in jobs:
+                    self.add(job)
+            else:
+                for job, position in zip(jobs, positions):
+                    self.add(job, position)
+        self.freeze()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, job_id):
+        return job_id in self._docs
+
+    def copy(self):
+        """Clone for the next version; costs O(jobs + vocabulary) references, not postings"""
+        clone = JobSearchIndex.__new__(JobSearchIndex)
+        clone._docs = dict(self._docs)
+        clone._next_position = self._next_position
+        clone._postings = {field: dict(postings) for field, postings in self._postings.items()}
+        clone._vocab = dict(self._vocab)
+        clone._vocab_sorted = self._vocab_sorted
+        clone._vocab_text = self._vocab_text
+        clone._vocab_offsets = self._vocab_offsets
+        clone._locations = dict(self._locations)
+        clone._skills = dict(self._skills)
+        clone._owned = set()
+        return clone
+
+    def freeze(self):
+        """Precompute lazily built lookups so readers never write to the index"""
+        if self._vocab_sorted is None:
+            self._vocab_sorted = sorted(self._vocab)
+            offsets = []
+            offset = 0
+            for token in self._vocab_sorted:
+                offsets.append(offset)
+                offset += len(token) + 1
+            self._vocab_text = '\n'.join(self._vocab_sorted)
+            self._vocab_offsets = offsets
+
+    def _writable(self, mapping, key):
+        """The id set under key, copied first if it is shared with another index"""
+        ids = mapping.get(key)
+        if ids is None:
+            ids = mapping[key] = set()
+        elif id(ids) in self._owned:
+            return ids
+        else:
+            ids = mapping[key] = set(ids)
+        self._owned.add(id(ids))
+        return ids
+
+    def _discard(self, mapping, key, job_id):
+        if key not in mapping:
+            return
+        ids = self._writable(mapping, key)
+        ids.discard(job_id)
+        if not ids:
+            del mapping[key]
+            self._owned.discard(id(ids))
+
+    def add(self, job, position=None):
+        """Index a job, replacing any previous version with the same id"""
+        job_id = job['id']
+        if job_id in self._docs:
+            self._remove_doc(job_id)
+        if position is None:
+            position = self._next_position
+        self._next_position = max(self._next_position, position + 1)
+        doc = _IndexedJob(job, position)
+        self._docs[job_id] = doc
+        for field in self.FIELDS:
+            postings = self._postings[field]
+            for token in doc.tokens(field):
+                if token not in self._vocab:
+                    self._vocab_sorted = None
+                self._writable(postings, token).add(job_id)
+                self._vocab[token] = self._vocab.get(token, 0) + 1
+        self._writable(self._locations, doc.location).add(job_id)
+        for skill in doc.skills:
+            self._writable(self._skills, skill).add(job_id)
+
+    def remove(self, job_id):
+        """Drop a job from the index; returns False if it was not indexed"""
+        if job_id not in self._docs:
+            return False
+        self._remove_doc(job_id)
+        return True
+
+    def _remove_doc(self, job_id):
+        doc = self._docs.pop(job_id)
+        for field in self.FIELDS:
+            postings = self._postings[field]
+            for token in doc.tokens(field):
+                self._discard(postings, token, job_id)
+                self._vocab[token] -= 1
+                if self._vocab[token] <= 0:
+                    del self._vocab[token]
+                    self._vocab_sorted = None
+        self._discard(self._locations, doc.location, job_id)
+        for skill in doc.skills:
+            self._discard(self._skills, skill, job_id)
+
+    def get(self, job_id):
+        doc = self._docs.get(job_id)
+        return doc.job if doc else None
+
+    def locations(self):
+        """Location facet counts, e.g. {'bangalore': 2, 'delhi': 2}"""
+        return {location: len(ids) for location, ids in self._locations.items()}
+
+    def _facet_ids(self, facet, needle):
+        """Ids whose facet value contains needle (facets are small, so scan keys)"""
+        ids = set()
+        for value, value_ids in facet.items():
+            if needle in value:
+                ids |= value_ids
+        return ids
+
+    def _tokens_containing(self, needle):
+        """Vocabulary tokens that contain needle (which holds no newline)"""
+        self.freeze()
+        text, offsets, vocab = self._vocab_text, self._vocab_offsets, self._vocab_sorted
+        found = []
+        i = text.find(needle)
+        while i != -1:
+            k = bisect_right(offsets, i) - 1
+            found.append(vocab[k])
+            # Continue from the next token; one hit per token is enough
+            i = text.find(needle, offsets[k + 1]) if k + 1 < len(offsets) else -1
+        return found
+
+    def _substring_ids(self, needle, fields):
+        """Ids of jobs where needle is a substring of one of the fields (as lowercased)"""
+        tokens = tokenize(needle)
+        if not tokens:
+            candidates = set(self._docs)
+        else:
+            candidates = None
+            for token in tokens:
+                ids = set()
+                for match in self._tokens_containing(token):
+                    for field in fields:
+                        ids |= self._postings[field].get(match, set())
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    return set()
+        # A needle made of one token lies inside a single token of any text
+        # containing it, so the postings are exact; otherwise confirm
+        if tokens == [needle]:
+            return candidates
+        docs = self._docs
+        return {job_id for job_id in candidates
+                if any(_field_contains(docs[job_id], field, needle) for field in fields)}
+
+    @staticmethod
+    def match_key(intent):
+        """The parts of an intent that match() scores, normalized, as a hashable key"""
+        return (
+            (intent.get('job_role') or '').lower(),
+            (intent.get('location') or '').lower(),
+            tuple(sorted(skill.lower() for skill in intent.get('skills') or [] if skill)),
+            tuple(sorted(word for word in (intent.get('original_text') or '').lower().split()
+                         if len(word) >= MIN_DESCRIPTION_WORD_LENGTH)),
+        )
+
+    def match(self, intent, limit=10, extra_scores=None):
+        """
+        Rank jobs for an extracted intent, mirroring the original scoring.
+        extra_scores ({job_id: score}, e.g. semantic similarity) is added on top.
+
+        Every criterion is a set of job ids from the postings, so scoring is
+        set algebra plus one addition per matching job; job text is only read
+        to confirm needles that span several tokens.
+        """
+        job_role = (intent.get('job_role') or '').lower()
+        location = (intent.get('location') or '').lower()
+        skills = [skill.lower() for skill in intent.get('skills') or [] if skill]
+        words = [word for word in (intent.get('original_text') or '').lower().split()
+                 if len(word) >= MIN_DESCRIPTION_WORD_LENGTH]
+
+        docs = self._docs
+        scores = defaultdict(float)
+
+        if job_role:
+            phrase = self._substring_ids(job_role, ('title',))
+            candidates = set()
+            for word in job_role.split():
+                candidates |= self._substring_ids(word, ('title',))
+            for job_id in phrase:
+                scores[job_id] += TITLE_PHRASE_WEIGHT
+            for job_id in candidates - phrase:
+                scores[job_id] += TITLE_WORD_WEIGHT
+
+        if location:
+            for job_id in self._facet_ids(self._locations, location):
+                scores[job_id] += LOCATION_WEIGHT
+
+        for skill in skills:
+            for job_id in self._facet_ids(self._skills, skill):
+                scores[job_id] += SKILL_WEIGHT
+
+        for job_id, score in (extra_scores or {}).items():
+            if job_id in docs:
+                scores[job_id] += score
+
+        word_ids = [self._substring_ids(word, ('description',)) for word in words]
+
+        # Description words add at most `bonus`, so a job scoring more than
+        # that below the limit-th best so far cannot reach the top; common
+        # words then cost a set intersection instead of a pass over the catalogue
+        bonus = DESCRIPTION_WORD_WEIGHT * len(word_ids)
+        floor = heapq.nlargest(limit, scores.values())[-1] - bonus if len(scores) >= limit else 0
+        if floor > 0:
+            scores = {job_id: score for job_id, score in scores.items() if score >= floor}
+            contenders = set(scores)
+            for ids in word_ids:
+                for job_id in ids & contenders:
+                    scores[job_id] += DESCRIPTION_WORD_WEIGHT
+        else:
+            for ids in word_ids:
+                for job_id in ids:
+                    scores[job_id] += DESCRIPTION_WORD_WEIGHT
+
+        if len(scores) > limit:
+            cutoff = heapq.nlargest(limit, scores.values())[-1]
+            ranked = [item for item in scores.items() if item[1] >= cutoff]
+        else:
+            ranked = scores.items()
+        top = heapq.nsmallest(
+            limit, (item for item in ranked if item[1] > 0),
+            key=lambda item: (-item[1], docs[item[0]].position))
+        return [(docs[job_id].job, score) for job_id, score in top]
+
+    def _filter_ids(self, query, location):
+        """Ids passing the GET /api/jobs substring filters, or None for every job"""
+        candidates = None
+        if query:
+            candidates = self._substring_ids(query, ('title', 'description', 'skills'))
+
+        if location:
+            location_ids = self._facet_ids(self._locations, location)
+            candidates = location_ids if candidates is None else candidates & location_ids
+        return candidates
+
+    def search(self, query='', location=''):
+        """Substring-style filter for GET /api/jobs, in catalogue order"""
+        query = (query or '').lower()
+        location = (location or '').lower()
+
+        candidates = self._filter_ids(query, location)
+        if candidates is None:
+            docs = self._docs.values()
+        else:
+            docs = (self._docs[job_id] for job_id in candidates)
+        return [doc.job for doc in sorted(docs, key=lambda doc: doc.position)]
+
+    def page(self, query='', location='', sort='catalogue', after=None, limit=None):
+        """
+        Filter like search() and return (jobs, total, next_key) for one page.
+
+        sort is 'catalogue' (insertion order), 'posted_date' (newest first) or
+        'score' (query relevance, best first). after is the next_key of the
+        previous page; next_key is None on the last page.
+        """
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort: {sort}")
+        query = (query or '').lower()
+        location = (location or '').lower()
+        after = tuple(after) if after is not None else None
+
+        candidates = self._filter_ids(query, location)
+        if candidates is None:
+            docs = self._docs.values()
+            total = len(self._docs)
+        else:
+            docs = [self._docs[job_id] for job_id in candidates]
+            total = len(docs)
+
+        if sort == 'catalogue':
+            keyed = (((doc.position,), doc) for doc in docs)
+            descending = False
+        elif sort == 'posted_date':
+            keyed = (((doc.job.get('posted_date') or '', -doc.position), doc) for doc in docs)
+            descending = True
+        else:
+            keyed = (((_search_score(doc, query), -doc.position), doc) for doc in docs)
+            descending = True
+
+        # Keyset pagination: skip everything at or before the cursor
+        if after is not None:
+            if descending:
+                keyed = (item for item in keyed if item[0] < after)
+            else:
+                keyed = (item for item in keyed if item[0] > after)
+
+        first = itemgetter(0)
+        if limit is None:
+            page = sorted(keyed, key=first, reverse=descending)
+        elif descending:
+            page = heapq.nlargest(limit + 1, keyed, key=first)
+        else:
+            page = heapq.nsmallest(limit + 1, keyed, key=first)
+
+        next_key = None
+        if limit is not None and len(page) > limit:
+            page = page[:limit]
+            next_key = list(page[-1][0])
+        return [doc.job for _, doc in page], total, next_key
+
+
+def _field_contains(doc, field, needle):
+    if field == 'skills':
+        return any(needle in skill for skill in doc.skills)
+    return needle in getattr(doc, field)
+
+
+def _search_score(doc, query):
+    """Relevance of a text-search hit, on the same weights as match()"""
+    if not query:
+        return 0
+    score = 0
+    if query in doc.title:
+        score += TITLE_PHRASE_WEIGHT
+    if any(query in skill for skill in doc.skills):
+        score += SKILL_WEIGHT
+    if query in doc.description:
+        score += DESCRIPTION_WORD_WEIGHT
+    return score
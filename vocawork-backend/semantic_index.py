@@ -0,0 +1,228 @@
+"""
+Optional semantic job ranking over a dense embedding matrix.
+
+Every job is embedded once into a row of a contiguous float32 NumPy matrix.
+A query is embedded the same way and scored against all jobs with a single
+matrix-vector product, and the best rows are picked with argpartition. The
+default encoder hashes character n-grams, so it needs nothing but NumPy and
+still catches inflections, compounds and misspellings that exact keywords
+miss; a local sentence-transformers model can be plugged in for
+cross-lingual paraphrases.
+"""
+
+import zlib
+from functools import lru_cache
+
+from intent_matcher import normalize_text
+from lazy_imports import is_installed, lazy_import
+from search_index import TOKEN_RE
+
+# Optional dependency, imported when the first index is built
+np = lazy_import('numpy')
+
+DEFAULT_DIMENSIONS = 512
+# Texts hashed per bincount call in encode_many, bounding its scratch memory
+ENCODE_BATCH = 1024
+# Only the start of long descriptions is embedded; it carries the summary
+MAX_DESCRIPTION_CHARS = 400
+
+
+def available():
+    return is_installed('numpy')
+
+
+@lru_cache(maxsize=200000)
+def _word_features(word, dimensions):
+    """Signed hash buckets for a word and its padded character 3- and 4-grams"""
+    padded = f' {word} '
+    grams = ['w:' + word]
+    for n in (3, 4):
+        grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    hashes = [zlib.crc32(gram.encode('utf-8')) for gram in grams]
+    indices = np.array([h % dimensions for h in hashes], dtype=np.int64)
+    signs = np.array([-1.0 if h & 0x80000000 else 1.0 for h in hashes])
+    return indices, signs
+
+
+class HashedNgramEncoder:
+    """Dependency-free text embeddings: hashed character n-grams, log-scaled, L2-normalized"""
+
+    def __init__(self, dimensions=DEFAULT_DIMENSIONS):
+        self.dimensions = dimensions
+        self.name = f'hashed-{dimensions}'
+
+    def encode(self, text):
+        return self.encode_many([text])[0]
+
+    def encode_many(self, texts):
+        texts = list(texts)
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for start in range(0, len(texts), ENCODE_BATCH):
+            batch = texts[start:start + ENCODE_BATCH]
+            indices, signs = [], []
+            for row, text in enumerate(batch):
+                offset = row * self.dimensions
+                for word in TOKEN_RE.findall(normalize_text(text)):
+                    word_indices, word_signs = _word_features(word, self.dimensions)
+                    indices.append(word_indices + offset)
+                    signs.append(word_signs)
+            if indices:
+                counts = np.bincount(np.concatenate(indices), weights=np.concatenate(signs),
+                                     minlength=len(batch) * self.dimensions)
+                matrix[start:start + len(batch)] = counts.reshape(len(batch), self.dimensions)
+        # Sublinear term frequency, then unit length so dot products are cosines
+        np.copysign(np.log1p(np.abs(matrix)), matrix, out=matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+class SentenceTransformerEncoder:
+    """Local CPU embedding model from the sentence-transformers package"""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self._model = SentenceTransformer(model_name, device='cpu')
+        self.dimensions = self._model.get_sentence_embedding_dimension()
+        self.name = model_name
+
+    def encode(self, text):
+        return self.encode_many([text])[0]
+
+    def encode_many(self, texts):
+        return self._model.encode(list(texts), normalize_embeddings=True,
+                                  convert_to_numpy=True).astype(np.float32)
+
+
+def create_encoder(spec='hashed'):
+    """
+    Build an encoder from a spec: 'hashed', 'hashed:<dimensions>' or
+    'sentence-transformers:<model name>'
+    """
+    kind, _, arg = spec.partition(':')
+    if kind == 'hashed':
+        return HashedNgramEncoder(int(arg) if arg else DEFAULT_DIMENSIONS)
+    if kind == 'sentence-transformers' and arg:
+        return SentenceTransformerEncoder(arg)
+    raise ValueError(f"Unknown semantic encoder: {spec}")
+
+
+def job_text(job):
+    """Text embedded for a job; the title is repeated to weigh it over the description"""
+    skills = ' '.join(job.get('skills', []) or [])
+    description = (job.get('description') or '')[:MAX_DESCRIPTION_CHARS]
+    title = job.get('title', '')
+    return f"{title}. {title}. {skills}. {job.get('location', '')}. {description}"
+
+
+def intent_text(intent):
+    """Text embedded for an extracted intent"""
+    parts = [intent.get('job_role') or '', ' '.join(intent.get('skills') or []),
+             intent.get('location') or '', intent.get('original_text') or '']
+    return '. '.join(part for part in parts if part)
+
+
+class SemanticJobIndex:
+    """
+    Job embeddings in one growable matrix.
+
+    Rows are append-only: replacing or removing a job only marks its old row
+    dead. copy() therefore shares the matrix with the original (new rows land
+    past the original's row count, where its readers never look) and copies
+    just the small id and liveness arrays. Dead rows are compacted away into
+    a fresh matrix once they make up a quarter of it.
+    """
+
+    def __init__(self, encoder, jobs=None):
+        self.encoder = encoder
+        self._matrix = np.zeros((16, encoder.dimensions), dtype=np.float32)
+        self._alive = np.zeros(16, dtype=bool)
+        self._count = 0
+        self._ids = []
+        self._rows = {}
+        if jobs:
+            self.add_many(jobs)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def copy(self):
+        clone = SemanticJobIndex.__new__(SemanticJobIndex)
+        clone.encoder = self.encoder
+        clone._matrix = self._matrix
+        clone._alive = self._alive.copy()
+        clone._count = self._count
+        clone._ids = list(self._ids)
+        clone._rows = dict(self._rows)
+        return clone
+
+    def add_many(self, jobs):
+        """Embed jobs in one batch and insert or replace their rows"""
+        jobs = list(jobs)
+        if not jobs:
+            return
+        vectors = self.encoder.encode_many([job_text(job) for job in jobs])
+        for job, vector in zip(jobs, vectors):
+            self._append(job['id'], vector)
+
+    def add(self, job):
+        self._append(job['id'], self.encoder.encode(job_text(job)))
+
+    def _append(self, job_id, vector):
+        self.remove(job_id)
+        row = self._count
+        if row == len(self._matrix):
+            self._grow(row * 2)
+        self._matrix[row] = vector
+        self._alive[row] = True
+        self._ids.append(job_id)
+        self._rows[job_id] = row
+        self._count += 1
+
+    def _grow(self, capacity):
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:self._count] = self._matrix[:self._count]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._count] = self._alive[:self._count]
+        self._matrix, self._alive = matrix, alive
+
+    def remove(self, job_id):
+        """Mark a job's row dead; returns False if absent"""
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._ids[row] = None
+        if self._count >= 1024 and self._count - len(self._rows) > self._count // 4:
+            self._compact()
+        return True
+
+    def _compact(self):
+        live = np.flatnonzero(self._alive[:self._count])
+        matrix = np.zeros((max(16, len(live) * 2), self._matrix.shape[1]), dtype=np.float32)
+        matrix[:len(live)] = self._matrix[live]
+        alive = np.zeros(len(matrix), dtype=bool)
+        alive[:len(live)] = True
+        self._ids = [self._ids[row] for row in live]
+        self._rows = {job_id: row for row, job_id in enumerate(self._ids)}
+        self._matrix, self._alive, self._count = matrix, alive, len(live)
+
+    def top_k(self, text, k=50, min_similarity=0.0):
+        """[(job_id, cosine similarity)] of the k jobs closest to text, best first"""
+        query = self.encoder.encode(text)
+        count = self._count
+        if not self._rows or not query.any():
+            return []
+        scores = self._matrix[:count] @ query
+        scores[~self._alive[:count]] = -np.inf
+        if k < count:
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(count)
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(self._ids[row], float(scores[row])) for row in best
+                if scores[row] > min_similarity]
+
+    def stats(self):
+        return {"encoder": self.encoder.name, "jobs": len(self._rows),
+                "rows": self._count, "dimensions": int(self._matrix.shape[1])}
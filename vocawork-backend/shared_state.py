@@ -0,0 +1,250 @@
+"""
+State shared by every worker process, and with Redis by every host.
+
+A SharedState is a namespaced byte-string store with per-key expiry, plus
+publish/subscribe notifications. It backs the transcript and intent cache
+tiers and synthesized audio, so what one worker produced is found by the
+next worker (or machine) the load balancer picks:
+
+    memory://                   this process only (development, tests)
+    sqlite:///data/shared.db    every worker on one host
+    redis://host:6379/0         every worker on every host (pip install redis)
+
+Subscribers are called on a background thread. SQLite has no push channel,
+so its subscribers poll a per-channel counter instead. Listener threads do
+not survive fork(), so they are restarted in each forked worker.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from connections import RedisSubscriptions, SQLiteConnections
+from lazy_imports import lazy_import
+
+redis = lazy_import('redis')
+
+KEY_PREFIX = 'vocawork:'
+
+
+class SharedState:
+    """Interface shared by the shared-state backends"""
+
+    name = 'abstract'
+
+    def get(self, namespace, key):
+        """The bytes stored under (namespace, key), or None"""
+        raise NotImplementedError
+
+    def set(self, namespace, key, value, ttl=None):
+        """Store bytes, expiring after ttl seconds if given"""
+        raise NotImplementedError
+
+    def delete(self, namespace, key):
+        raise NotImplementedError
+
+    def publish(self, channel, message=''):
+        """Notify subscribers of channel in every process"""
+        raise NotImplementedError
+
+    def subscribe(self, channel, callback):
+        """Call callback(message) on a background thread after each publish to channel"""
+        raise NotImplementedError
+
+    def close(self):
+        """Stop listener threads and release connections"""
+
+    def stats(self):
+        return {"backend": self.name}
+
+
+class MemorySharedState(SharedState):
+    """Per-process stand-in; subscribers are called synchronously by publish"""
+
+    name = 'memory'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._subscribers = {}
+
+    def get(self, namespace, key):
+        with self._lock:
+            entry = self._values.get((namespace, key))
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._values[(namespace, key)]
+                return None
+            return value
+
+    def set(self, namespace, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._values[(namespace, key)] = (bytes(value), expires_at)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._values.pop((namespace, key), None)
+
+    def publish(self, channel, message=''):
+        for callback in list(self._subscribers.get(channel, ())):
+            callback(message)
+
+    def subscribe(self, channel, callback):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+
+class SQLiteSharedState(SharedState):
+    """One WAL-mode SQLite file shared by the worker processes of a host"""
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS shared_values (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value BLOB NOT NULL,
+            expires_at REAL,
+            PRIMARY KEY (namespace, key)
+        );
+        CREATE TABLE IF NOT EXISTS shared_channels (
+            name TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            message TEXT NOT NULL DEFAULT ''
+        );
+    """
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path, poll_interval=0.5):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._connections = SQLiteConnections(path)
+        self._writes = 0
+        self._subscribers = {}
+        self._listener = None
+        self._stopping = threading.Event()
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _connection(self):
+        return self._connections.get()
+
+    def get(self, namespace, key):
+        row = self._connection().execute(
+            'SELECT value, expires_at FROM shared_values WHERE namespace = ? AND key = ?',
+            (namespace, key)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return bytes(row[0])
+
+    def set(self, namespace, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO shared_values (namespace, key, value, expires_at) '
+                         'VALUES (?, ?, ?, ?)', (namespace, key, sqlite3.Binary(value), expires_at))
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                conn.execute('DELETE FROM shared_values WHERE expires_at <= ?', (time.time(),))
+
+    def delete(self, namespace, key):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM shared_values WHERE namespace = ? AND key = ?', (namespace, key))
+
+    def publish(self, channel, message=''):
+        with self._connection() as conn:
+            conn.execute('INSERT INTO shared_channels (name, seq, message) VALUES (?, 1, ?) '
+                         'ON CONFLICT (name) DO UPDATE SET seq = seq + 1, message = excluded.message',
+                         (channel, message))
+
+    def subscribe(self, channel, callback):
+        self._subscribers.setdefault(channel, []).append(callback)
+        self._start_listener()
+
+    def _channel_seqs(self):
+        rows = self._connection().execute('SELECT name, seq, message FROM shared_channels')
+        return {name: (seq, message) for name, seq, message in rows}
+
+    def _start_listener(self):
+        if self._listener is not None and self._listener.is_alive():
+            return
+        self._stopping.clear()
+        self._listener = threading.Thread(target=self._poll, name='shared-state-poll', daemon=True)
+        self._listener.start()
+
+    def _poll(self):
+        # Publishes between two polls are coalesced into one notification
+        seen = self._channel_seqs()
+        while not self._stopping.wait(self.poll_interval):
+            try:
+                current = self._channel_seqs()
+            except sqlite3.Error:
+                continue
+            for channel, callbacks in list(self._subscribers.items()):
+                if channel in current and current[channel] != seen.get(channel):
+                    for callback in callbacks:
+                        callback(current[channel][1])
+            seen = current
+
+    def _after_fork(self):
+        # The parent's listener may have held the event's lock at fork time
+        self._stopping = threading.Event()
+        self._listener = None
+        if self._subscribers:
+            self._start_listener()
+
+    def close(self):
+        self._stopping.set()
+        self._connections.close()
+
+
+class RedisSharedState(SharedState):
+    """Any Redis-compatible server, shared by workers on every host"""
+
+    name = 'redis'
+
+    def __init__(self, url, prefix=KEY_PREFIX):
+        self.url = url
+        self.prefix = prefix
+        # The connection pool reconnects by itself in forked workers
+        self.client = redis.Redis.from_url(url)
+        self._subscriptions = RedisSubscriptions(self.client)
+
+    def _key(self, namespace, key):
+        return f"{self.prefix}{namespace}:{key}"
+
+    def get(self, namespace, key):
+        return self.client.get(self._key(namespace, key))
+
+    def set(self, namespace, key, value, ttl=None):
+        self.client.set(self._key(namespace, key), value, ex=max(1, int(ttl)) if ttl else None)
+
+    def delete(self, namespace, key):
+        self.client.delete(self._key(namespace, key))
+
+    def publish(self, channel, message=''):
+        self.client.publish(self.prefix + channel, message)
+
+    def subscribe(self, channel, callback):
+        self._subscriptions.subscribe(self.prefix + channel, callback)
+
+    def close(self):
+        self._subscriptions.close()
+        self.client.close()
+
+    def stats(self):
+        return {"backend": self.name, "listening": self._subscriptions.listening}
+
+
+def create_shared_state(url):
+    """Build shared state from 'memory://', 'sqlite:///data/shared.db' or 'redis://host:6379/0'"""
+    if url.startswith('memory://'):
+        return MemorySharedState()
+    if url.startswith('sqlite:///'):
+        return SQLiteSharedState(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisSharedState(url)
+    raise ValueError(f"Unsupported shared state URL: {url}")
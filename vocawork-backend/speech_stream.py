@@ -0,0 +1,134 @@
+"""
+Chunked speech recognition for long recordings.
+
+Decoded audio is split at pauses found with a frame-energy voice activity
+detector, so each chunk is a short, self-contained utterance. Chunks are
+recognized concurrently and reported in order as soon as every earlier chunk
+is done, which lets callers act on a partial transcript while later chunks
+are still in flight. Frame energies need audioop; without it (Python 3.13+
+without audioop-lts) a recording is recognized as a single chunk.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from audio_io import audioop
+from lazy_imports import lazy_import
+
+sr = lazy_import('speech_recognition')
+
+FRAME_MS = 20
+
+
+class AudioChunk:
+    """A slice of decoded audio and its position in the recording"""
+
+    __slots__ = ('index', 'start', 'end', 'audio')
+
+    def __init__(self, index, start, end, audio):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.audio = audio
+
+
+def can_split():
+    """Whether recordings can be split at pauses (needs audioop)"""
+    return audioop is not None
+
+
+def duration_seconds(audio_data):
+    return len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width)
+
+
+def frame_energies(frames, frame_bytes, sample_width):
+    return [audioop.rms(frames[offset:offset + frame_bytes], sample_width)
+            for offset in range(0, len(frames), frame_bytes)]
+
+
+def _silent_runs(energies, threshold, min_frames):
+    """(first, last) frame indexes of each silence at least min_frames long"""
+    runs = []
+    start = None
+    for i, energy in enumerate(energies + [threshold + 1]):
+        if energy <= threshold:
+            if start is None:
+                start = i
+        elif start is not None:
+            if i - start >= min_frames:
+                runs.append((start, i - 1))
+            start = None
+    return runs
+
+
+def split_on_silence(audio_data, min_silence_ms=400, silence_db=16, max_chunk_seconds=15.0,
+                     min_chunk_seconds=1.0):
+    """
+    Split mono AudioData into AudioChunks at pauses.
+
+    A frame is silent when its RMS is silence_db below the clip's mean RMS.
+    Cuts fall in the middle of pauses of at least min_silence_ms; chunks
+    shorter than min_chunk_seconds are merged into their neighbour and chunks
+    longer than max_chunk_seconds are cut at their quietest frame. Without
+    audioop the whole recording is returned as one chunk.
+    """
+    if not can_split():
+        if not audio_data.frame_data:
+            return []
+        return [AudioChunk(0, 0.0, duration_seconds(audio_data), audio_data)]
+
+    width = audio_data.sample_width
+    frame_bytes = int(audio_data.sample_rate * FRAME_MS / 1000) * width
+    frames = audio_data.frame_data
+    energies = frame_energies(frames, frame_bytes, width)
+    if not energies:
+        return []
+
+    mean_energy = sum(energies) / len(energies)
+    threshold = mean_energy * 10 ** (-silence_db / 20)
+    max_frames = max(1, int(max_chunk_seconds * 1000 / FRAME_MS))
+    min_frames = int(min_chunk_seconds * 1000 / FRAME_MS)
+
+    cuts = [0]
+    for first, last in _silent_runs(energies, threshold, max(1, min_silence_ms // FRAME_MS)):
+        cut = (first + last + 1) // 2
+        if cut - cuts[-1] >= min_frames and len(energies) - cut >= min_frames:
+            cuts.append(cut)
+    cuts.append(len(energies))
+
+    # Break up stretches without a usable pause at their quietest point
+    bounded = [0]
+    for end in cuts[1:]:
+        while end - bounded[-1] > max_frames:
+            lo = bounded[-1] + max(min_frames, max_frames // 2)
+            hi = bounded[-1] + max_frames
+            bounded.append(min(range(lo, hi), key=energies.__getitem__))
+        bounded.append(end)
+
+    chunks = []
+    for first, last in zip(bounded, bounded[1:]):
+        data = frames[first * frame_bytes:last * frame_bytes]
+        chunks.append(AudioChunk(len(chunks), first * FRAME_MS / 1000, last * FRAME_MS / 1000,
+                                 sr.AudioData(data, audio_data.sample_rate, width)))
+    return chunks
+
+
+def recognize_chunks(chunks, recognize, executor):
+    """
+    Run recognize(chunk) for every chunk on executor and yield (chunk, text)
+    in chunk order, each as soon as it and all earlier chunks have finished.
+    An exception from recognize is re-raised when its chunk is reached.
+    """
+    pending = {executor.submit(recognize, chunk): chunk.index for chunk in chunks}
+    done_texts = {}
+    next_index = 0
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                done_texts[pending.pop(future)] = future
+            while next_index in done_texts:
+                yield chunks[next_index], done_texts.pop(next_index).result()
+                next_index += 1
+    finally:
+        for future in pending:
+            future.cancel()
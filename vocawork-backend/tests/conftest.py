@@ -0,0 +1,48 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# The backend is a flat set of modules imported by name from vocawork-backend
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def redis_url():
+    """URL of a fresh Redis stand-in server (benchmarks/redis_standin.py); needs redis-py"""
+    pytest.importorskip('redis')
+    from benchmarks.redis_standin import Server
+    server = Server(('127.0.0.1', 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope='session')
+def backend(tmp_path_factory):
+    """The app module, imported once with in-memory stores and no upstream services"""
+    data = tmp_path_factory.mktemp('backend')
+    os.environ.update({
+        'JOB_STORE_URL': 'memory://',
+        'VOICE_TASK_STATE_URL': 'memory://',
+        'SHARED_STATE_URL': '',
+        'TTS_BACKEND': 'mock',
+        'GEMINI_API_KEY': '',
+        'WARM_UP': 'false',
+        'PROFILE_DIR': str(data / 'profiles'),
+    })
+    import app
+    # Synthesized replies go to a temporary directory, not static/audio
+    audio_folder = data / 'audio'
+    audio_folder.mkdir()
+    app.app.config['AUDIO_FOLDER'] = app.AUDIO_CACHE.directory = str(audio_folder)
+    yield app
+    app.shutdown()
+
+
+@pytest.fixture
+def client(backend):
+    return backend.app.test_client()
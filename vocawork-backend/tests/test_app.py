@@ -0,0 +1,269 @@
+"""HTTP behaviour of the app's routes, through Flask's test client"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import wave
+from pathlib import Path
+
+import pytest
+
+import speech_stream
+from job_snapshots import JobSnapshot
+from request_profiler import RequestProfiler
+
+MB = 1024 * 1024
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wav_upload(seconds, channels=1):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b'\x00\x01' * channels * int(16000 * seconds))
+    return buffer.getvalue()
+
+
+def sse_events(response):
+    events = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        event, data = block.split('\n')
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def batch_upload(count, size):
+    return {'audio': [(io.BytesIO(b'0' * size), f'{i}.wav') for i in range(count)]}
+
+
+def test_batch_bodies_may_exceed_the_single_upload_limit(backend, client, monkeypatch):
+    monkeypatch.setattr(backend, 'process_batch_item',
+                        lambda item: {"index": item.index, "filename": item.filename})
+    response = client.post('/api/process-voice/batch', data=batch_upload(20, MB),
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 21 and lines[-1]["summary"]["items"] == 20
+
+
+def test_batch_limits_come_from_their_own_settings(backend, client, monkeypatch):
+    monkeypatch.setitem(backend.app.config, 'BATCH_MAX_ITEM_BYTES', MB // 2)
+    response = client.post('/api/process-voice/batch', data=batch_upload(1, MB),
+                           content_type='multipart/form-data')
+    assert response.status_code == 400 and 'too large' in response.get_json()["error"]
+
+    monkeypatch.setitem(backend.app.config, 'BATCH_MAX_BYTES', 2 * MB)
+    response = client.post('/api/process-voice/batch', data=batch_upload(3, MB),
+                           content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert response.get_json()["error"] == "File too large. Maximum size is 2MB."
+
+
+def test_pcm_wav_batch_items_are_decoded_without_the_process_pool(backend):
+    audio = backend.decode_in_process_pool(wav_upload(0.1, channels=2))
+    assert (audio.sample_rate, len(audio.frame_data)) == (16000, 3200)
+    assert backend._decode_pool is None
+
+
+def test_single_uploads_keep_the_16mb_limit(client):
+    response = client.post('/api/process-voice/stream', data=batch_upload(1, 17 * MB),
+                           content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert response.get_json()["error"] == "File too large. Maximum size is 16MB."
+
+
+def test_hybrid_matching_returns_nothing_for_unrelated_speech(backend, monkeypatch):
+    pytest.importorskip('numpy')
+    import semantic_index
+    current = backend.job_snapshot()
+    semantic = semantic_index.SemanticJobIndex(semantic_index.create_encoder('hashed'),
+                                               backend.JOB_STORE.list())
+    monkeypatch.setattr(backend, 'job_snapshot',
+                        lambda force=False: JobSnapshot(current.version, current.index, semantic))
+
+    unrelated = backend.extract_intent_fallback('banana smoothie recipe', 'en')
+    assert backend.find_matching_jobs(unrelated) == []
+    related = backend.extract_intent_fallback('software developer python', 'en')
+    assert backend.find_matching_jobs(related)[0]['title'] == 'Software Developer'
+
+    monkeypatch.setitem(backend.app.config, 'SEMANTIC_MIN_SIMILARITY', 0.0)
+    assert backend.find_matching_jobs(backend.extract_intent_fallback('weather tomorrow', 'en'))
+
+
+def test_recordings_are_recognized_whole_without_audioop(backend, client, monkeypatch):
+    clips = []
+    monkeypatch.setattr(speech_stream, 'audioop', None)
+    monkeypatch.setitem(backend.app.config, 'AUDIO_PREPROCESS', False)
+    monkeypatch.setattr(backend, 'recognize_google',
+                        lambda audio_data, language: clips.append(audio_data) or 'need a cook job')
+
+    response = client.post('/api/process-voice/stream', content_type='multipart/form-data',
+                           data={'audio': (io.BytesIO(wav_upload(2)), 'a.wav'), 'language': 'en'})
+    events = sse_events(response)
+    assert [event for event, _ in events] == ['chunks', 'partial', 'result']
+    assert events[-1][1]["transcript"] == 'need a cook job'
+
+    response = client.post('/api/process-voice', content_type='multipart/form-data',
+                           data={'audio': (io.BytesIO(wav_upload(20)), 'b.wav'), 'language': 'en'})
+    assert response.get_json()["transcript"] == 'need a cook job'
+    assert [len(clip.frame_data) for clip in clips] == [2 * 32000, 20 * 32000]
+
+
+def test_request_metrics_carry_language_and_outcome(backend, client, monkeypatch):
+    monkeypatch.setattr(backend, 'recognize_google', lambda audio_data, language: 'mujhe cook ki naukri chahiye')
+    response = client.post('/api/process-voice', content_type='multipart/form-data',
+                           data={'audio': (io.BytesIO(wav_upload(1.5)), 'c.wav'), 'language': 'hi'})
+    assert response.status_code == 200
+    client.get('/api/health')
+
+    response = client.get('/api/metrics')
+    assert response.status_code == 200 and response.mimetype == 'text/plain'
+    lines = response.get_data(as_text=True).splitlines()
+    # No Gemini key here, so intent extraction falls back to keywords
+    assert any(line.startswith('vocawork_request_duration_seconds_count{route="/api/process-voice",method="POST",'
+                               'status="200",language="hi",outcome="fallback"}') for line in lines)
+    assert any(line.startswith('vocawork_request_duration_seconds_count{route="/api/health",method="GET",'
+                               'status="200",language="none",outcome="ok"}') for line in lines)
+    assert any(line.startswith('vocawork_stage_duration_seconds_count{stage="intent_extraction",'
+                               'language="hi",outcome="fallback"}') for line in lines)
+
+
+CSV_HEADER = b'title,company,location,salary,contact,description,skills\n'
+
+
+def csv_row(title):
+    return f'{title},Acme,Pune,20000,98765,Full time,"cooking;baking"\n'.encode()
+
+
+def test_bulk_csv_load_reports_inserted_duplicates_and_rejected_rows(backend, client):
+    body = CSV_HEADER + csv_row('Bulk cook') + csv_row('Bulk baker') + csv_row('Bulk cook') + b',,,,,,\nx,y\n'
+    response = client.post('/api/jobs/bulk', data=body, content_type='text/csv')
+    report = response.get_json()
+    assert response.status_code == 200
+    assert (report["received"], report["inserted"], report["duplicates"], report["rejected"]) == (4, 2, 1, 1)
+    assert report["errors"][0]["line"] == 6 and report["version"] == backend.JOB_SNAPSHOTS.version
+    assert 'Bulk baker' in [job["title"] for job in client.get('/api/jobs?query=bulk').get_json()]
+
+
+def test_bulk_load_that_fails_part_way_reports_the_jobs_already_inserted(client):
+    body = CSV_HEADER + csv_row('Partial welder') + b'\xff\xfe,broken\n' + csv_row('Never loaded')
+    response = client.post('/api/jobs/bulk', data=body, content_type='text/csv')
+    report = response.get_json()
+    assert response.status_code == 207
+    assert report["inserted"] == 1 and 'not valid UTF-8' in report["error"]
+    titles = [job["title"] for job in client.get('/api/jobs?query=welder').get_json()]
+    assert titles == ['Partial welder']
+
+    response = client.post('/api/jobs/bulk', data=b'\xff\xfe' + CSV_HEADER, content_type='text/csv')
+    assert response.status_code == 400 and response.get_json()["inserted"] == 0
+
+
+def test_sampling_is_not_enabled_without_a_profile_token(tmp_path):
+    env = dict(os.environ, JOB_STORE_URL='memory://', VOICE_TASK_STATE_URL='memory://', SHARED_STATE_URL='',
+               TTS_BACKEND='mock', GEMINI_API_KEY='', WARM_UP='false', PROFILE_SAMPLE_RATE='0.5',
+               PROFILE_TOKEN='', PROFILE_DIR=str(tmp_path))
+    result = subprocess.run([sys.executable, '-c', 'import app; print(app.PROFILER)'], env=env,
+                            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0 and result.stdout.strip() == 'None'
+    assert 'PROFILE_SAMPLE_RATE is ignored' in result.stderr
+
+
+def new_job(title):
+    return {'title': title, 'company': 'Acme', 'location': 'Pune', 'salary': '18000',
+            'contact': '98765', 'description': 'Day shift', 'skills': ['driving']}
+
+
+def test_job_listings_are_revalidated_with_etags(client):
+    first = client.get('/api/jobs?limit=2&sort=posted_date')
+    assert first.status_code == 200 and first.headers['ETag']
+    page = first.get_json()
+    assert len(page["jobs"]) == 2 and page["next_cursor"]
+
+    unchanged = client.get('/api/jobs?limit=2&sort=posted_date', headers={'If-None-Match': first.headers['ETag']})
+    assert unchanged.status_code == 304 and unchanged.headers['ETag'] == first.headers['ETag']
+    assert unchanged.get_data() == b''
+
+    added = client.post('/api/jobs', json=new_job('ETag courier'))
+    assert added.status_code == 200
+    changed = client.get('/api/jobs?limit=2&sort=posted_date', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200 and changed.headers['ETag'] != first.headers['ETag']
+    assert changed.headers['X-Catalogue-Version'] == str(added.get_json()["version"])
+
+    # The next page follows on from the cursor of the first
+    second = client.get(f"/api/jobs?limit=2&sort=posted_date&cursor={page['next_cursor']}").get_json()
+    first_ids = {job["id"] for job in page["jobs"]}
+    assert second["jobs"] and not first_ids & {job["id"] for job in second["jobs"]}
+
+
+@pytest.mark.parametrize('query, error', [
+    ('limit=abc', 'limit must be an integer'),
+    ('limit=0', 'limit must be positive'),
+    ('cursor=not-a-cursor', 'Invalid cursor'),
+])
+def test_bad_listing_parameters_are_rejected(client, query, error):
+    response = client.get(f'/api/jobs?{query}')
+    assert response.status_code == 400 and response.get_json()["error"] == error
+
+
+def test_cursors_only_apply_to_their_own_sort(client):
+    cursor = client.get('/api/jobs?limit=1&sort=posted_date').get_json()["next_cursor"]
+    response = client.get(f'/api/jobs?limit=1&sort=catalogue&cursor={cursor}')
+    assert response.status_code == 400
+    assert response.get_json()["error"] == 'Cursor does not match the requested sort'
+
+
+def test_readiness_follows_startup_draining_and_the_job_store(backend, client, monkeypatch):
+    response = client.get('/api/ready')
+    assert response.status_code == 200
+    assert response.get_json() == {"ready": True, "checks": {"started": True, "draining": False, "job_store": True}}
+
+    def unreachable(force=False):
+        raise ConnectionError("job store down")
+
+    monkeypatch.setattr(backend, 'job_snapshot', unreachable)
+    response = client.get('/api/ready')
+    assert response.status_code == 503 and response.get_json()["checks"]["job_store"] is False
+    monkeypatch.undo()
+
+    monkeypatch.setattr(backend, '_draining', threading.Event())
+    backend.begin_shutdown()
+    response = client.get('/api/ready')
+    assert response.status_code == 503 and response.get_json()["checks"]["draining"] is True
+
+
+@pytest.fixture
+def profiler(backend, tmp_path, monkeypatch):
+    profiler = RequestProfiler(str(tmp_path / 'profiles'), token='secret')
+    monkeypatch.setattr(backend, 'PROFILER', profiler)
+    return profiler
+
+
+def test_profiles_are_listed_and_downloaded_with_the_token(client, profiler):
+    profile = profiler.start()
+    sum(range(1000))
+    profile.disable()
+    profile_id = profiler.save(profile, {"path": "/api/jobs", "method": "GET"})
+
+    assert client.get('/api/admin/profiles').status_code == 403
+    assert client.get('/api/admin/profiles', headers={'X-Profile': 'wrong'}).status_code == 403
+    response = client.get('/api/admin/profiles', headers={'X-Profile': 'secret'})
+    assert response.status_code == 200
+    assert [info["id"] for info in response.get_json()["profiles"]] == [profile_id]
+
+    download = client.get(f'/api/admin/profiles/{profile_id}', headers={'X-Profile': 'secret'})
+    assert download.status_code == 200 and download.get_data() == Path(profiler.path(profile_id)).read_bytes()
+    download.close()
+    text = client.get(f'/api/admin/profiles/{profile_id}?format=text&limit=5', headers={'X-Profile': 'secret'})
+    assert text.status_code == 200 and 'function calls' in text.get_data(as_text=True)
+    missing = client.get('/api/admin/profiles/0-0-deadbeef', headers={'X-Profile': 'secret'})
+    assert missing.status_code == 404
+
+
+def test_profile_endpoints_are_absent_when_profiling_is_off(backend, client, monkeypatch):
+    monkeypatch.setattr(backend, 'PROFILER', None)
+    assert client.get('/api/admin/profiles', headers={'X-Profile': 'secret'}).status_code == 404
@@ -0,0 +1,49 @@
+"""Uploads decoded in memory into mono speech_recognition.AudioData"""
+
+import io
+import struct
+import wave
+
+import pytest
+
+pytest.importorskip('speech_recognition')
+
+from audio_io import AudioDecodeError, decode_audio, decode_pcm_wav, downmix, read_pcm_wav  # noqa: E402
+
+
+def wav_bytes(samples, channels=1, sample_width=2, rate=16000):
+    fmt = '<%dh' % len(samples) if sample_width == 2 else '%dB' % len(samples)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(rate)
+        wav.writeframes(struct.pack(fmt, *samples))
+    return buffer.getvalue()
+
+
+def test_mono_wav_is_passed_through():
+    audio = decode_audio(wav_bytes([0, 100, -100, 200], rate=8000))
+    assert (audio.sample_rate, audio.sample_width) == (8000, 2)
+    assert struct.unpack('<4h', audio.frame_data) == (0, 100, -100, 200)
+
+
+def test_stereo_wav_is_downmixed_in_process():
+    audio = decode_audio(wav_bytes([100, 300, -200, -400], channels=2))
+    assert struct.unpack('<2h', audio.frame_data) == (200, -300)
+
+
+def test_unsigned_8_bit_stereo_keeps_its_midpoint():
+    assert downmix(bytes([128, 128, 0, 255]), 1) == bytes([128, 127])
+
+
+def test_non_wav_bytes_are_not_read_as_pcm():
+    assert read_pcm_wav(b'RIFF\x00\x00') is None
+    assert read_pcm_wav(b'not audio at all') is None
+    assert decode_pcm_wav(b'not audio at all') is None
+    assert decode_pcm_wav(wav_bytes([1, 2])).frame_data == struct.pack('<2h', 1, 2)
+
+
+def test_undecodable_uploads_raise_audio_decode_error():
+    with pytest.raises(AudioDecodeError):
+        decode_audio(b'not audio at all')
@@ -0,0 +1,65 @@
+"""Resampling, silence trimming, normalization and the length cap before recognition"""
+
+import math
+import struct
+
+import pytest
+
+audio_preprocess = pytest.importorskip('audio_preprocess')
+if audio_preprocess.audioop is None:
+    pytest.skip('needs audioop (audioop-lts on Python 3.13+)', allow_module_level=True)
+
+import speech_recognition as sr
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=8000, rate=RATE):
+    return struct.pack(f'<{int(seconds * rate)}h',
+                       *(int(amplitude * math.sin(2 * math.pi * 220 * i / rate)) for i in range(int(seconds * rate))))
+
+
+def silence(seconds, rate=RATE):
+    return bytes(int(seconds * rate) * 2)
+
+
+def preprocess(frames, rate=RATE, **options):
+    return audio_preprocess.preprocess_audio(sr.AudioData(frames, rate, 2), **options)
+
+
+def test_leading_and_trailing_silence_is_trimmed_to_the_padding():
+    processed, report = preprocess(silence(2) + tone(1) + silence(3), trim_padding_ms=200)
+    assert report["trimmed_seconds"] == pytest.approx(4.6, abs=0.02)
+    assert len(processed.frame_data) / 2 / RATE == pytest.approx(1.4, abs=0.02)
+
+
+def test_speech_edges_are_found_to_the_frame():
+    # Speech starting and ending mid-window must not be clipped
+    processed, _ = preprocess(silence(1.03) + tone(0.5) + silence(1.07), trim_padding_ms=0)
+    # Each edge may keep the rest of a partly voiced 20ms frame
+    assert 0.5 <= len(processed.frame_data) / 2 / RATE <= 0.54
+
+
+def test_silence_only_and_disabled_trim_keep_the_clip():
+    frames = silence(1) + tone(1) + silence(1)
+    assert preprocess(silence(2))[1]["trimmed_seconds"] == 0
+    assert preprocess(frames, trim_silence_db=0)[1]["trimmed_seconds"] == 0
+
+
+def test_long_recordings_are_not_truncated_by_default():
+    processed, report = preprocess(tone(150, rate=8000), rate=8000)
+    assert not report["truncated"]
+    assert len(processed.frame_data) / 2 / 8000 == pytest.approx(150, abs=0.01)
+
+
+def test_max_seconds_caps_the_length():
+    processed, report = preprocess(tone(3), max_seconds=1)
+    assert report["truncated"]
+    assert len(processed.frame_data) == RATE * 2
+
+
+def test_higher_rates_are_downsampled_and_quiet_audio_is_boosted():
+    processed, report = preprocess(tone(1, amplitude=300, rate=44100), rate=44100, trim_silence_db=0)
+    assert processed.sample_rate == RATE and report["output_rate"] == RATE
+    assert report["output_bytes"] == pytest.approx(RATE * 2, rel=0.01)
+    assert report["gain_db"] == 20.0
@@ -0,0 +1,33 @@
+"""Latency summaries and baseline comparison of the benchmark suite"""
+
+from benchmarks.results import compare_results, percentile, save_results, summarize
+
+
+def test_nearest_rank_percentiles():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 0.5) == 0.05
+    assert percentile(values, 0.99) == 0.099
+    assert percentile([], 0.5) == 0.0
+    assert percentile([0.2], 0.01) == 0.2
+
+
+def test_summary_of_latencies():
+    summary = summarize('search', [0.003, 0.001, 0.002], elapsed=0.5, params={"jobs": 10})
+    assert summary["ops"] == 3 and summary["params"] == {"jobs": 10}
+    assert (summary["p50_ms"], summary["max_ms"], summary["mean_ms"]) == (2.0, 3.0, 2.0)
+    assert summary["throughput_per_s"] == 6.0
+    assert summarize('empty', [], elapsed=0)["mean_ms"] == 0.0
+
+
+def test_regressions_beyond_the_threshold_are_reported(tmp_path, capsys):
+    path = str(tmp_path / 'baseline' / 'results.json')
+    save_results(path, [summarize('search', [0.010] * 10, 1, {"jobs": 10}),
+                        summarize('search', [0.010] * 10, 1, {"jobs": 100})])
+    current = [summarize('search', [0.0105] * 10, 1, {"jobs": 10}),
+               summarize('search', [0.020] * 10, 1, {"jobs": 100}),
+               summarize('ingest', [0.050] * 10, 1)]
+
+    regressions = compare_results(path, current, threshold=0.10)
+    assert [(params, metric) for _, params, metric, _ in regressions] == [
+        ({"jobs": 100}, "p50_ms"), ({"jobs": 100}, "p95_ms")]
+    assert 'ingest' not in capsys.readouterr().out
@@ -0,0 +1,118 @@
+"""Transcript cache tiers, intent coalescing and version handling of SearchResultCache"""
+
+import threading
+import time
+
+from caches import IntentCache, SearchResultCache, TranscriptCache
+from shared_state import MemorySharedState
+
+
+def test_transcripts_fall_through_memory_disk_and_shared_tiers(tmp_path):
+    shared = MemorySharedState()
+    key = TranscriptCache.key(b'audio', 'en')
+    assert key != TranscriptCache.key(b'audio', 'hi')
+    TranscriptCache(directory=str(tmp_path / 'a'), shared=shared).put([key], 'hello')
+
+    # A restarted worker finds it on disk, another worker in the shared tier
+    restarted = TranscriptCache(directory=str(tmp_path / 'a'))
+    other = TranscriptCache(directory=str(tmp_path / 'b'), shared=shared)
+    assert restarted.get(key) == other.get(key) == 'hello'
+    assert other.get(key) == 'hello' and other.stats()["entries"] == 1
+
+
+def test_transcript_pre_checks_do_not_count_misses():
+    cache = TranscriptCache(max_entries=1)
+    assert cache.get('a', count_miss=False) is None
+    assert cache.get('a') is None
+    cache.put(['a', 'b'], 'hello')
+    assert cache.get('a') is None and cache.get('b') == 'hello'
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_intents_are_keyed_by_normalized_transcript():
+    assert IntentCache.key('  Cook JOB, Pune!', 'en') == IntentCache.key('cook job pune', 'en')
+    assert IntentCache.key('cook', 'en') != IntentCache.key('cook', 'hi')
+    cache = IntentCache(shared=MemorySharedState())
+    calls = []
+    compute = lambda: calls.append(1) or {"job_role": "Cook"}  # noqa: E731
+    key = IntentCache.key('cook', 'en')
+    assert cache.get_or_compute(key, compute) == cache.get_or_compute(key, compute)
+    assert len(calls) == 1
+    assert cache.get_or_compute(IntentCache.key('driver', 'en'), lambda: None) is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_concurrent_lookups_share_one_computation():
+    cache = IntentCache()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"job_role": "Cook"}
+
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+                 for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.coalesced < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+    assert len(calls) == 1 and len(results) == 4
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_hit_at_same_version_and_invalidation_on_newer():
+    cache = SearchResultCache()
+    cache.put(1, 'q', ['a', 'b'], 2)
+    assert cache.get(1, 'q') == (('a', 'b'), 2)
+    assert cache.get(2, 'q') is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.get(1, 'q') is None
+
+
+def test_older_readers_neither_clear_nor_store():
+    cache = SearchResultCache()
+    cache.put(5, 'q', ['new'])
+    cache.put(4, 'q', ['old'])
+    assert cache.get(4, 'q') is None
+    assert cache.get(5, 'q') == (('new',),)
+    stats = cache.stats()
+    assert stats["version"] == 5
+    assert stats["invalidations"] == 0
+    assert stats["stale_skipped"] == 2
+
+
+def test_oversized_results_are_not_cached():
+    cache = SearchResultCache(max_ids=2)
+    cache.put(1, 'q', ['a', 'b', 'c'])
+    assert cache.get(1, 'q') is None
+
+
+def test_interleaved_old_and_new_readers_keep_new_entries():
+    cache = SearchResultCache()
+    cache.put(2, 'q', ['current'])
+    barrier = threading.Barrier(8)
+
+    def reader(version):
+        barrier.wait()
+        for _ in range(500):
+            cache.get(version, 'q')
+            cache.put(version, 'other', [str(version)])
+
+    threads = [threading.Thread(target=reader, args=(1 + i % 2,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.get(2, 'q') == (('current',),)
+    assert cache.get(2, 'other') == (('2',),)
+    assert cache.stats()["invalidations"] == 0
@@ -0,0 +1,66 @@
+"""Per-thread, per-process SQLite connections and Redis listeners across fork()"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from connections import RedisSubscriptions, SQLiteConnections
+
+
+def test_each_thread_gets_its_own_connection(tmp_path):
+    connections = SQLiteConnections(str(tmp_path / 'nested' / 'state.db'))
+    main = connections.get()
+    assert connections.get() is main
+    assert main.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(connections.get()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main
+
+    connections.close()
+    assert connections.get() is not main
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork()')
+def test_forked_child_opens_its_own_connection(tmp_path):
+    connections = SQLiteConnections(str(tmp_path / 'state.db'))
+    parent = connections.get()
+    parent.execute('CREATE TABLE t (x)')
+    pid = os.fork()
+    if pid == 0:
+        child = connections.get()
+        with child:
+            child.execute('INSERT INTO t VALUES (1)')
+        connections.close()
+        os._exit(0 if child is not parent else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    # The parent's connection survived the child closing its own
+    assert parent.execute('SELECT x FROM t').fetchall() == [(1,)]
+
+
+def test_subscriptions_deliver_text_to_every_callback(redis_url):
+    import redis
+    client = redis.Redis.from_url(redis_url)
+    subscriptions = RedisSubscriptions(client)
+    received = []
+    try:
+        subscriptions.subscribe('a', lambda message: received.append(('a1', message)))
+        subscriptions.subscribe('a', lambda message: received.append(('a2', message)))
+        subscriptions.subscribe('b', lambda message: received.append(('b', message)))
+        assert subscriptions.listening
+        time.sleep(0.2)
+        client.publish('a', 'hello')
+        client.publish('b', 'world')
+        deadline = time.monotonic() + 5
+        while len(received) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sorted(received) == [('a1', 'hello'), ('a2', 'hello'), ('b', 'world')]
+    finally:
+        subscriptions.close()
+        client.close()
+    assert not subscriptions.listening
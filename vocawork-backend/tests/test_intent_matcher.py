@@ -0,0 +1,51 @@
+"""Keyword intent extraction from the compiled multilingual vocabulary"""
+
+import json
+import os
+
+from intent_matcher import KeywordIntentMatcher
+
+
+def test_english_transcript():
+    matcher = KeywordIntentMatcher()
+    intent = matcher.extract("I am a Software Engineer in Chennai who knows JavaScript and Excel", 'en')
+    assert intent == {"job_role": "software developer", "location": "chennai",
+                      "skills": ["javascript", "excel"]}
+
+
+def test_whole_words_only_for_latin_phrases():
+    intent = KeywordIntentMatcher().extract("an excellent candidate, developers welcome", 'en')
+    assert intent["skills"] == [] and intent["job_role"] == "software developer"
+
+
+def test_indic_words_match_with_case_suffixes_and_english_loanwords():
+    matcher = KeywordIntentMatcher()
+    assert matcher.extract("சென்னையில் டெவலப்பர் வேலை", 'ta')["location"] == "chennai"
+    assert matcher.extract("मुझे chennai में डेवलपर की नौकरी चाहिए", 'hi')["job_role"] == "software developer"
+    assert matcher.extract("मुझे chennai में नौकरी चाहिए", 'hi')["location"] == "chennai"
+
+
+def test_unknown_language_falls_back_to_english():
+    assert KeywordIntentMatcher().extract("programmer in madras", 'xx')["location"] == "chennai"
+
+
+def write_vocabulary(path, roles):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"roles": roles}, f)
+
+
+def test_vocabulary_file_is_reloaded_when_it_changes(tmp_path):
+    path = str(tmp_path / 'vocabulary.json')
+    write_vocabulary(path, {"cook": {"en": ["cook"]}})
+    matcher = KeywordIntentMatcher(path, reload_interval=0)
+    assert matcher.extract("plumber wanted", 'en')["job_role"] == ""
+
+    write_vocabulary(path, {"plumber": {"en": ["plumber"]}})
+    os.utime(path, (1, 1))
+    assert matcher.extract("plumber wanted", 'en')["job_role"] == "plumber"
+
+    # A broken file keeps the last good vocabulary
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{')
+    os.utime(path, (2, 2))
+    assert matcher.extract("plumber wanted", 'en')["job_role"] == "plumber"
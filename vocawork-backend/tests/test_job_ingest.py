@@ -0,0 +1,80 @@
+"""Parsing, validation, de-duplication and batching of POST /api/jobs/bulk feeds"""
+
+import io
+import json
+
+import pytest
+
+from job_ingest import IngestError, detect_format, ingest, iter_csv, iter_ndjson
+from job_snapshots import SnapshotManager
+from job_store import MemoryJobStore
+
+
+def posting(title='Cook', **fields):
+    return dict({'title': title, 'company': 'Acme', 'location': 'Pune', 'salary': '1',
+                 'contact': 'x', 'description': 'kitchen work'}, **fields)
+
+
+def ndjson(*records, tail=b''):
+    return io.BytesIO(b''.join(json.dumps(record).encode('utf-8') + b'\n' for record in records) + tail)
+
+
+def load(rows, batch_size=2, store=None):
+    store = MemoryJobStore() if store is None else store
+    snapshots = SnapshotManager(store)
+    return ingest(rows, store, lambda: snapshots.refresh(force=True), batch_size=batch_size), store
+
+
+def test_detect_format():
+    assert detect_format('text/csv') == 'csv'
+    assert detect_format('application/json', requested='ndjson') == 'ndjson'
+    with pytest.raises(IngestError):
+        detect_format('application/json')
+    with pytest.raises(IngestError):
+        detect_format('text/csv', requested='xml')
+
+
+def test_ndjson_rows_are_validated_deduplicated_and_batched():
+    body = ndjson(posting('Cook'), posting('Driver', skills='driving; english'), posting('Cook'),
+                  {'title': 'No company'}, posting('Painter'), tail=b'\n{not json\n')
+
+    report, store = load(iter_ndjson(body))
+    assert (report["received"], report["inserted"], report["duplicates"], report["rejected"]) == (6, 3, 1, 2)
+    assert report["batches"] == 2 and report["version"] == store.latest_change()
+    assert [error["line"] for error in report["errors"]] == [4, 7]
+    assert "Missing required field: company" in report["errors"][0]["error"]
+    driver = next(job for job in store.list() if job['title'] == 'Driver')
+    assert driver['skills'] == ['driving', 'english']
+
+
+def test_postings_already_in_the_store_are_duplicates():
+    report, store = load(iter_ndjson(ndjson(posting('Cook'))))
+    report, _ = load(iter_ndjson(ndjson(posting(' cook '), posting('Driver'))), store=store)
+    assert (report["inserted"], report["duplicates"]) == (1, 1)
+    assert store.count() == 2
+
+
+def test_csv_rows_with_a_bom_and_quoted_cells():
+    body = io.BytesIO('﻿title,company,location,salary,contact,description,skills\n'
+                      'Cook,Acme,Pune,1,x,"kitchen, catering","cooking,hygiene"\n'
+                      '\n'
+                      'Driver,Acme,Pune,1,x,driving,,extra\n'.encode('utf-8'))
+    report, store = load(iter_csv(body))
+    assert (report["inserted"], report["rejected"]) == (1, 1)
+    assert store.list()[0]['description'] == 'kitchen, catering'
+    assert store.list()[0]['skills'] == ['cooking', 'hygiene']
+
+
+def test_oversized_lines_are_rejected_without_reading_them_whole():
+    body = ndjson(posting('Cook', description='x' * 500), posting('Driver'))
+    report, store = load(iter_ndjson(body, max_line_bytes=200))
+    assert (report["inserted"], report["rejected"]) == (1, 1)
+    assert report["errors"][0] == {"line": 1, "error": "Line longer than 200 bytes"}
+
+
+def test_invalid_csv_encoding_stops_the_load_but_keeps_earlier_rows():
+    body = io.BytesIO(b'title,company,location,salary,contact,description\n'
+                      b'Cook,Acme,Pune,1,x,kitchen\n'
+                      b'Driver,Acme,Pune,1,x,\xff\n')
+    report, store = load(iter_csv(body))
+    assert report["inserted"] == 1 and "not valid UTF-8" in report["error"]
@@ -0,0 +1,104 @@
+"""Copy-on-write snapshots, change-log sync between workers and fork safety"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from job_snapshots import SnapshotManager
+from job_store import MemoryJobStore, SQLiteJobStore
+
+
+def make_job(job_id, title=None):
+    return {'id': job_id, 'title': title or f'Cook {job_id}', 'company': 'Acme', 'location': 'Pune',
+            'salary': '1', 'contact': 'x', 'description': 'kitchen work', 'skills': [],
+            'posted_date': '2024-01-01T00:00:00'}
+
+
+def ids(jobs):
+    return [job['id'] for job in jobs]
+
+
+def test_published_snapshot_is_not_changed_by_later_writes():
+    store = MemoryJobStore()
+    store.add_many([make_job('1'), make_job('2')])
+    manager = SnapshotManager(store)
+    old = manager.current()
+
+    store.add(make_job('3', title='Driver'))
+    store.add(make_job('1', title='Electrician'))
+    store.delete('2')
+    new = manager.refresh()
+
+    assert new is not old and new.version > old.version
+    assert ids(old.index.search()) == ['1', '2']
+    assert old.index.get('1')['title'] == 'Cook 1'
+    assert ids(old.index.search('driver')) == []
+    assert ids(new.index.search()) == ['3', '1']
+    assert new.index.get('1')['title'] == 'Electrician'
+    assert '2' not in new.index
+
+
+def test_refresh_without_changes_keeps_the_snapshot():
+    store = MemoryJobStore()
+    store.add(make_job('1'))
+    manager = SnapshotManager(store)
+    assert manager.refresh() is manager.current()
+
+
+def test_writes_in_one_worker_reach_another_through_the_change_log(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    store_a = SQLiteJobStore(path)
+    store_a.add_many([make_job('1'), make_job('2')])
+    worker_a = SnapshotManager(store_a)
+    worker_b = SnapshotManager(SQLiteJobStore(path))
+
+    store_a.add(make_job('3', title='Driver'))
+    store_a.delete('1')
+    worker_a.refresh(force=True)
+    snapshot_b = worker_b.refresh()
+
+    assert snapshot_b.version == worker_a.version
+    assert ids(snapshot_b.index.search()) == ids(worker_a.current().index.search()) == ['2', '3']
+    assert ids(snapshot_b.index.search('driver')) == ['3']
+
+
+def test_watch_refreshes_in_the_background():
+    store = MemoryJobStore()
+    manager = SnapshotManager(store)
+    manager.watch(poll_interval=0.01)
+    try:
+        store.add(make_job('1'))
+        deadline = time.monotonic() + 5
+        while manager.version != store.latest_change() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert '1' in manager.current().index
+    finally:
+        manager.stop()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork()')
+def test_forked_child_does_not_inherit_a_held_write_lock():
+    manager = SnapshotManager(MemoryJobStore())
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with manager._write_lock:
+            held.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait()
+    try:
+        pid = os.fork()
+        if pid == 0:
+            acquired = manager._write_lock.acquire(timeout=2)
+            os._exit(0 if acquired else 1)
+        _, status = os.waitpid(pid, 0)
+    finally:
+        release.set()
+        holder.join()
+    assert os.waitstatus_to_exitcode(status) == 0
@@ -0,0 +1,127 @@
+"""Jobs and the change log seen through two store instances, as two workers hold them"""
+
+import threading
+import time
+
+import pytest
+
+import job_store
+from job_store import MemoryJobStore, RedisJobStore, SQLiteJobStore, content_hash
+
+
+def make_job(job_id, title=None):
+    return {'id': job_id, 'title': title or f'Cook {job_id}', 'company': 'Acme', 'location': 'Pune',
+            'salary': '1', 'contact': 'x', 'description': 'kitchen work', 'skills': ['Cooking'],
+            'posted_date': '2024-01-01T00:00:00'}
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'redis'])
+def stores(request, tmp_path):
+    """A writer and a reader over the same catalogue"""
+    if request.param == 'memory':
+        store = MemoryJobStore()
+        pair = (store, store)
+    elif request.param == 'sqlite':
+        path = str(tmp_path / 'jobs.db')
+        pair = (SQLiteJobStore(path), SQLiteJobStore(path))
+    else:
+        url = request.getfixturevalue('redis_url')
+        pair = (RedisJobStore(url), RedisJobStore(url))
+    yield pair
+    for store in set(pair):
+        store.close()
+
+
+def test_writes_are_visible_to_the_other_instance(stores):
+    writer, reader = stores
+    writer.add_many([make_job('1'), make_job('2')])
+    writer.add(make_job('1', title='Electrician'))
+    assert reader.count() == 2
+    assert [job['id'] for job in reader.list()] == ['2', '1']
+    assert reader.get('1')['title'] == 'Electrician'
+    assert set(reader.get_many(['1', '3'])) == {'1'}
+    positions = reader.get_many_positioned(['1', '2'])
+    assert positions['2'][0] < positions['1'][0]
+
+    assert writer.delete('2') and not writer.delete('2')
+    assert reader.get('2') is None
+
+
+def test_change_log_replays_writes_in_order(stores):
+    writer, reader = stores
+    start = reader.latest_change()
+    writer.add_many([make_job('1'), make_job('2')])
+    writer.delete('1')
+
+    changes, latest = reader.changes_since(start)
+    assert latest == reader.latest_change() == start + 3
+    assert [(job_id, op) for _, job_id, op in changes] == [('1', 'upsert'), ('2', 'upsert'), ('1', 'delete')]
+    assert [seq for seq, _, _ in changes] == [start + 1, start + 2, start + 3]
+    assert reader.changes_since(latest) == ([], latest)
+
+
+def test_reader_behind_the_retained_log_must_reload(stores, monkeypatch):
+    monkeypatch.setattr(job_store, 'CHANGE_LOG_RETENTION', 5)
+    writer, reader = stores
+    for i in range(20):
+        writer.add(make_job(str(i)))
+    changes, latest = reader.changes_since(0)
+    assert changes is None and latest == 20
+    assert reader.changes_since(latest - 1)[0] == [(latest, '19', 'upsert')]
+
+
+def test_concurrent_deletes_of_a_job_log_it_once(stores):
+    writer, reader = stores
+    for i in range(10):
+        writer.add(make_job(str(i)))
+        start = reader.latest_change()
+        barrier = threading.Barrier(2)
+        results = []
+
+        def delete(store):
+            barrier.wait()
+            results.append(store.delete(str(i)))
+
+        threads = [threading.Thread(target=delete, args=(store,)) for store in (writer, reader)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(results) == [False, True]
+        assert reader.changes_since(start)[0] == [(start + 1, str(i), 'delete')]
+
+
+def test_deleting_a_duplicate_keeps_the_other_jobs_content_hash(stores):
+    writer, reader = stores
+    writer.add_many([make_job('1', title='Cook'), make_job('2', title='Cook')])
+    digest = content_hash(make_job('1', title='Cook'))
+    writer.delete('1')
+    assert reader.existing_hashes([digest]) == {digest}
+
+
+def test_content_hashes_follow_replacements_and_deletes(stores):
+    writer, reader = stores
+    original, replacement = make_job('1'), make_job('1', title='Electrician')
+    writer.add(original)
+    assert reader.existing_hashes([content_hash(original)]) == {content_hash(original)}
+    writer.add(replacement)
+    assert reader.existing_hashes([content_hash(original), content_hash(replacement)]) == {
+        content_hash(replacement)}
+    writer.delete('1')
+    assert reader.existing_hashes([content_hash(replacement)]) == set()
+
+
+def test_redis_store_notifies_other_workers(redis_url):
+    writer, reader = RedisJobStore(redis_url), RedisJobStore(redis_url)
+    notified = []
+    try:
+        assert reader.subscribe(lambda: notified.append(True))
+        time.sleep(0.2)
+        writer.add(make_job('1'))
+        deadline = time.monotonic() + 5
+        while not notified and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert notified
+    finally:
+        writer.close()
+        reader.close()
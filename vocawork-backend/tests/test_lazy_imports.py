@@ -0,0 +1,30 @@
+"""Modules imported on first use, with their import cost recorded"""
+
+import sys
+
+import lazy_imports
+from lazy_imports import is_installed, lazy_import
+
+
+def test_module_is_imported_on_first_attribute_access(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'colorsys', raising=False)
+    colorsys = lazy_import('colorsys')
+    assert 'not loaded' in repr(colorsys)
+    assert 'colorsys' not in sys.modules
+
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert 'colorsys' in sys.modules and '(loaded)' in repr(colorsys)
+    assert 'colorsys' in lazy_imports.import_times()
+
+
+def test_load_imports_eagerly_and_skips_timing_for_modules_already_imported():
+    json = lazy_import('json')
+    lazy_imports.load(json)
+    assert json.loads('[1]') == [1]
+    assert 'json' not in lazy_imports.import_times()
+
+
+def test_is_installed_for_missing_modules_and_packages():
+    assert is_installed('json')
+    assert not is_installed('no_such_module_here')
+    assert not is_installed('no_such_package.child')
@@ -0,0 +1,83 @@
+"""Counters, histograms and stage outcomes in Prometheus text exposition"""
+
+import metrics
+
+
+def test_counter_and_histogram_exposition():
+    registry = metrics.Registry()
+    requests = registry.counter('requests_total', 'Requests', ('route',))
+    latency = registry.histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1.0))
+    requests.inc('/api/jobs')
+    requests.inc('/api/jobs', amount=2)
+    latency.observe(0.05, '/api/jobs')
+    latency.observe(0.5, '/api/jobs')
+    latency.observe(5, '/api/jobs')
+    registry.add_collector(lambda: ['up 1'])
+
+    lines = registry.render().splitlines()
+    assert '# TYPE requests_total counter' in lines
+    assert 'requests_total{route="/api/jobs"} 3' in lines
+    assert 'latency_seconds_bucket{route="/api/jobs",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/api/jobs",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/api/jobs",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/api/jobs"} 5.55' in lines
+    assert 'latency_seconds_count{route="/api/jobs"} 3' in lines
+    assert lines[-1] == 'up 1'
+
+
+def test_label_values_are_escaped():
+    counter = metrics.Counter('events_total', 'Events', ('reason',))
+    counter.inc('say "hi"\n')
+    assert counter.render()[-1] == 'events_total{reason="say \\"hi\\"\\n"} 1'
+
+
+def test_stage_outcome_defaults_to_ok_and_is_scoped_to_the_stage():
+    outer = metrics.begin_stage()
+    metrics.set_outcome('fallback')
+    inner = metrics.begin_stage()
+    assert metrics.end_stage(inner) == 'ok'
+    assert metrics.end_stage(outer) == 'fallback'
+
+
+def test_request_outcome_is_the_most_significant_stage_outcome():
+    metrics.begin_request()
+    metrics.note_stage('hi', 'hit')
+    metrics.note_stage('hi', 'fallback')
+    metrics.note_stage('hi', 'gemini')
+    assert metrics.end_request() == ('hi', 'fallback')
+    metrics.begin_request()
+    assert metrics.end_request() == ('none', 'ok')
+    metrics.begin_request()
+    metrics.note_stage('en', 'hit')
+    assert metrics.end_request(failed=True) == ('en', 'error')
+
+
+def build(directory):
+    registry = metrics.Registry(multiprocess_dir=str(directory))
+    requests = registry.counter('requests_total', 'Requests', ('route',))
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(1.0,))
+    return registry, requests, latency
+
+
+def test_multiprocess_totals_include_every_process(tmp_path):
+    # Two registries sharing a directory stand in for two workers
+    first, first_requests, first_latency = build(tmp_path)
+    second, second_requests, second_latency = build(tmp_path)
+    first_requests.inc('/api/jobs')
+    first_latency.observe(0.5)
+    second_requests.inc('/api/jobs', amount=2)
+    second_requests.inc('/api/health')
+    second_latency.observe(2.0)
+    # The second worker exits; its totals stay in the scrape
+    second.close()
+    second_requests.inc('/api/jobs', amount=100)
+
+    lines = first.render().splitlines()
+    assert 'requests_total{route="/api/jobs"} 3' in lines
+    assert 'requests_total{route="/api/health"} 1' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 1' in lines
+    assert 'latency_seconds_count 2' in lines
+    assert 'latency_seconds_sum 2.5' in lines
+
+    metrics.clear_multiprocess_dir(str(tmp_path))
+    assert 'requests_total{route="/api/health"} 1' not in first.render().splitlines()
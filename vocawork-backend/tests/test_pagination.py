@@ -0,0 +1,82 @@
+"""Keyset cursors handed from one worker's snapshot to another's"""
+
+import pytest
+
+from job_listing import decode_cursor, encode_cursor
+from job_snapshots import SnapshotManager
+from job_store import SQLiteJobStore
+
+
+def make_job(job_id, posted_date='2024-01-01T00:00:00'):
+    return {'id': job_id, 'title': f'Cook {job_id}', 'company': 'Acme', 'location': 'Pune',
+            'salary': '1', 'contact': 'x', 'description': 'kitchen work', 'skills': [],
+            'posted_date': posted_date}
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two workers over one SQLite file: A indexes incrementally, B rebuilds from scratch"""
+    path = str(tmp_path / 'jobs.db')
+    store_a = SQLiteJobStore(path)
+    store_a.add_many([make_job(str(i)) for i in range(1, 4)])
+    worker_a = SnapshotManager(store_a)
+
+    store_a.delete('1')
+    store_a.add_many([make_job(str(i)) for i in range(4, 10)])
+    worker_a.refresh()
+    worker_b = SnapshotManager(SQLiteJobStore(path))
+    return worker_a.current().index, worker_b.current().index
+
+
+def ids(jobs):
+    return [job['id'] for job in jobs]
+
+
+@pytest.mark.parametrize('sort', ['catalogue', 'posted_date', 'score'])
+def test_cursor_from_one_worker_pages_identically_on_another(workers, sort):
+    index_a, index_b = workers
+    first, _, key = index_a.page(sort=sort, limit=3)
+    cursor = decode_cursor(encode_cursor(sort, key), sort)
+
+    second_a, _, _ = index_a.page(sort=sort, after=cursor, limit=3)
+    second_b, _, _ = index_b.page(sort=sort, after=cursor, limit=3)
+    assert ids(second_b) == ids(second_a)
+    assert not set(ids(first)) & set(ids(second_b))
+
+
+def test_catalogue_pages_cover_every_job_once_across_workers(workers):
+    index_a, index_b = workers
+    seen = []
+    key = None
+    for turn in range(10):
+        jobs, _, key = (index_a, index_b)[turn % 2].page(after=key, limit=2)
+        seen.extend(ids(jobs))
+        if key is None:
+            break
+    assert seen == ['2', '3', '4', '5', '6', '7', '8', '9']
+
+
+def test_replaced_job_moves_to_the_end_in_every_worker(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    store = SQLiteJobStore(path)
+    store.add_many([make_job(str(i)) for i in range(1, 4)])
+    worker_a = SnapshotManager(store)
+    store.add(make_job('1'))
+    worker_b = SnapshotManager(SQLiteJobStore(path))
+
+    assert ids(worker_a.refresh().index.search()) == ['2', '3', '1']
+    assert ids(worker_b.current().index.search()) == ['2', '3', '1']
+
+
+def test_deleted_last_position_is_not_reused(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / 'jobs.db'))
+    store.add_many([make_job('1'), make_job('2')])
+    worker = SnapshotManager(store)
+    # The cursor a page ending at job 2 hands out
+    cursor = [position for position, job in store.list_positioned() if job['id'] == '2']
+
+    # A cursor ending at a job deleted since must not skip the job added next
+    store.delete('2')
+    store.add(make_job('3'))
+    jobs, _, _ = worker.refresh().index.page(after=cursor, limit=5)
+    assert ids(jobs) == ['3']
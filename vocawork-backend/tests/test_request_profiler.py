@@ -0,0 +1,63 @@
+"""Request selection and the on-disk ring buffer of cProfile profiles"""
+
+import os
+
+import pytest
+
+from request_profiler import RequestProfiler
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    return RequestProfiler(str(tmp_path / 'profiles'), token='secret', max_files=3)
+
+
+def profile_some_work(profiler, path='/api/jobs'):
+    profile = profiler.start()
+    sum(i * i for i in range(1000))
+    profile.disable()
+    return profiler.save(profile, {"path": path, "method": "GET"})
+
+
+def test_only_authorized_requests_to_profiled_paths_are_chosen(profiler):
+    assert profiler.trigger('/api/jobs', 'secret') == 'header'
+    assert profiler.trigger('/api/process-voice/tasks', 'secret') == 'header'
+    assert profiler.trigger('/api/jobs', 'wrong') is None
+    assert profiler.trigger('/api/jobs', None) is None
+    assert profiler.trigger('/api/health', 'secret') is None
+
+
+def test_sampling_without_a_token(tmp_path):
+    always = RequestProfiler(str(tmp_path), sample_rate=1.0)
+    assert always.trigger('/api/jobs', None) == 'sample'
+    assert not always.authorized('')
+    assert RequestProfiler(str(tmp_path)).trigger('/api/jobs', None) is None
+
+
+def test_saved_profiles_are_listed_and_rendered(profiler):
+    profile_id = profile_some_work(profiler)
+    [info] = profiler.list()
+    assert info == {"path": "/api/jobs", "method": "GET", "id": profile_id}
+    report = profiler.render(profile_id, sort='tottime', limit=5)
+    assert 'function calls' in report and 'genexpr' in report
+    assert profiler.stats()["saved"] == 1
+
+
+def test_unknown_or_malformed_ids_are_not_opened(profiler):
+    profile_some_work(profiler)
+    assert profiler.path('../../etc/passwd') is None
+    assert profiler.render('1700000000000-1-deadbeef') is None
+
+
+def test_oldest_profiles_are_evicted_beyond_max_files(profiler):
+    ids = [profile_some_work(profiler) for _ in range(5)]
+    listed = [info["id"] for info in profiler.list()]
+    assert listed == sorted(ids, reverse=True)[:3]
+    assert profiler.stats()["evictions"] == 2
+    assert len(os.listdir(profiler.directory)) == 6
+
+
+def test_byte_budget_evicts_too(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), max_bytes=1)
+    profile_some_work(profiler)
+    assert profiler.list() == [] and profiler.evictions == 1
@@ -0,0 +1,108 @@
+"""JobSearchIndex against the original linear scans it replaced"""
+
+import random
+
+import pytest
+
+from search_index import JobSearchIndex
+
+TITLES = ['JavaScript Developer', 'Senior Plumber', 'Delivery Driver (Two-Wheeler)', 'C++ Engineer',
+          'Electrician', 'Data Entry Operator', 'Cook / Chef', 'Security Guard', 'प्लंबर', 'Java Developer']
+WORDS = ['pipes', 'homework', 'driving', 'script', 'wiring', 'kitchen', 'typing', 'night', 'shift',
+         'c++', 'repairs', 'पाइप', 'deliveries', 'customers', 'cooking']
+LOCATIONS = ['Mumbai', 'Navi Mumbai', 'Pune', 'Delhi', 'Bangalore']
+SKILLS = ['Plumbing', 'JavaScript', 'Driving License', 'Wiring', 'Typing', 'Cooking', 'C++']
+
+
+def make_jobs(count, seed=7):
+    rng = random.Random(seed)
+    return [{
+        'id': str(i),
+        'title': rng.choice(TITLES),
+        'location': rng.choice(LOCATIONS),
+        'skills': rng.sample(SKILLS, rng.randint(0, 3)),
+        'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 10))),
+    } for i in range(count)]
+
+
+def baseline_match(jobs, intent):
+    """find_matching_jobs as it was before the index"""
+    job_role = intent.get('job_role', '').lower()
+    location = intent.get('location', '').lower()
+    matching = []
+    for job in jobs:
+        score = 0
+        if job_role:
+            if job_role in job['title'].lower():
+                score += 5
+            elif any(word in job['title'].lower() for word in job_role.split()):
+                score += 3
+        if location and location in job['location'].lower():
+            score += 3
+        for skill in intent.get('skills', []):
+            if any(skill.lower() in job_skill.lower() for job_skill in job.get('skills', [])):
+                score += 2
+        for word in intent.get('original_text', '').lower().split():
+            if len(word) > 3 and word in job['description'].lower():
+                score += 0.5
+        if score > 0:
+            matching.append((job, score))
+    matching.sort(key=lambda item: item[1], reverse=True)
+    return [(job['id'], score) for job, score in matching[:10]]
+
+
+def baseline_filter(jobs, query, location):
+    """GET /api/jobs filtering as it was before the index"""
+    query, location = query.lower(), location.lower()
+    if query:
+        jobs = [job for job in jobs if query in job['title'].lower() or query in job['description'].lower()
+                or any(query in skill.lower() for skill in job['skills'])]
+    if location:
+        jobs = [job for job in jobs if location in job['location'].lower()]
+    return [job['id'] for job in jobs]
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    jobs = make_jobs(400)
+    return jobs, JobSearchIndex(jobs)
+
+
+@pytest.mark.parametrize('query', ['script', 'JAVA', 'developer', 'c++', 'work', 'ipe', 'night shift',
+                                   'driver (two', 'wheeler', 'प्लं', 'पाइप', ' ', 'nothing-like-this'])
+@pytest.mark.parametrize('location', ['', 'mumbai'])
+def test_search_keeps_substring_semantics(corpus, query, location):
+    jobs, index = corpus
+    assert [job['id'] for job in index.search(query, location)] == baseline_filter(jobs, query, location)
+
+
+def test_script_finds_javascript_developer():
+    index = JobSearchIndex([{'id': '1', 'title': 'JavaScript Developer', 'description': '', 'skills': []}])
+    assert [job['id'] for job in index.search('script')] == ['1']
+
+
+@pytest.mark.parametrize('intent', [
+    {'job_role': 'developer', 'location': 'mumbai', 'skills': ['script']},
+    {'job_role': 'script'},
+    {'job_role': 'senior plumber', 'original_text': 'need someone for pipes and repairs'},
+    {'job_role': 'plumb driver', 'skills': ['driving'], 'original_text': 'work at night'},
+    {'job_role': 'c++', 'original_text': 'c++ homework wiring,'},
+    {'location': 'pune', 'original_text': 'pipes pipes kitchen'},
+    {'job_role': 'प्लंबर', 'original_text': 'पाइप'},
+])
+def test_match_scores_like_the_linear_scan(corpus, intent):
+    jobs, index = corpus
+    ranked = [(job['id'], score) for job, score in index.match(intent)]
+    assert ranked == baseline_match(jobs, intent)
+
+
+def test_match_and_search_follow_updates(corpus):
+    jobs, _ = corpus
+    index = JobSearchIndex(jobs[:50])
+    index.add({'id': 'new', 'title': 'TypeScript Developer', 'location': 'Pune',
+               'skills': [], 'description': 'frontend'})
+    index.remove(jobs[0]['id'])
+    expected = jobs[1:50] + [index.get('new')]
+    assert [job['id'] for job in index.search('script')] == baseline_filter(expected, 'script', '')
+    intent = {'job_role': 'script developer', 'location': 'pune'}
+    assert [(job['id'], score) for job, score in index.match(intent)] == baseline_match(expected, intent)
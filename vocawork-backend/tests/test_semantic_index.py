@@ -0,0 +1,65 @@
+"""Dense job embeddings ranked by cosine similarity"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from semantic_index import HashedNgramEncoder, SemanticJobIndex, create_encoder, intent_text  # noqa: E402
+
+
+def make_job(job_id, title, skills=(), description=''):
+    return {'id': job_id, 'title': title, 'skills': list(skills), 'location': 'Pune',
+            'description': description}
+
+
+@pytest.fixture
+def index():
+    return SemanticJobIndex(HashedNgramEncoder(256), [
+        make_job('1', 'Electrician', ['wiring'], 'house wiring and repairs'),
+        make_job('2', 'Cook', ['cooking'], 'restaurant kitchen'),
+        make_job('3', 'Delivery driver', ['driving'], 'two wheeler deliveries'),
+    ])
+
+
+def test_encodings_are_deterministic_and_normalized():
+    encoder = HashedNgramEncoder(128)
+    vector = encoder.encode('electrician wiring')
+    assert vector.shape == (128,)
+    assert (encoder.encode_many(['electrician wiring'])[0] == vector).all()
+    assert abs(float(vector @ vector) - 1.0) < 1e-5
+    assert float(encoder.encode('electricians') @ vector) > float(encoder.encode('cooking') @ vector)
+
+
+def test_closest_jobs_come_first(index):
+    results = index.top_k('need an electrician for wiring', k=2)
+    assert len(results) == 2 and results[0][0] == '1'
+    assert results[0][1] >= results[1][1]
+    assert index.top_k('', k=2) == []
+    assert index.top_k('cooking', k=3, min_similarity=0.99) == []
+    assert index.top_k('banana smoothie recipe', k=3, min_similarity=0.25) == []
+
+
+def test_replaced_and_removed_jobs_are_not_returned(index):
+    index.add(make_job('2', 'Electrician helper', ['wiring']))
+    assert len(index) == 3 and index.stats()["rows"] == 4
+    assert index.remove('1') and not index.remove('1')
+    ids = [job_id for job_id, _ in index.top_k('electrician wiring', k=10)]
+    assert ids[0] == '2' and '1' not in ids
+
+
+def test_copies_are_isolated_from_the_original(index):
+    clone = index.copy()
+    clone.add(make_job('4', 'Plumber', ['plumbing']))
+    clone.remove('2')
+    assert len(index) == 3 and len(clone) == 3
+    assert '4' not in [job_id for job_id, _ in index.top_k('plumber', k=10)]
+    assert '2' in [job_id for job_id, _ in index.top_k('cook', k=10)]
+    assert clone.top_k('plumber', k=1)[0][0] == '4'
+
+
+def test_encoder_specs_and_intent_text():
+    assert create_encoder('hashed:64').dimensions == 64
+    with pytest.raises(ValueError):
+        create_encoder('word2vec')
+    assert intent_text({'job_role': 'Cook', 'skills': ['baking'], 'location': None,
+                        'original_text': 'cook job'}) == 'Cook. baking. cook job'
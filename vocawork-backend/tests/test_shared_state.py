@@ -0,0 +1,60 @@
+"""Values and publish/subscribe across two SharedState instances on every backend"""
+
+import time
+
+import pytest
+
+from shared_state import MemorySharedState, RedisSharedState, SQLiteSharedState
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'redis'])
+def states(request, tmp_path):
+    """Two handles on one shared state, as two workers would hold them"""
+    if request.param == 'memory':
+        state = MemorySharedState()
+        pair = (state, state)
+    elif request.param == 'sqlite':
+        path = str(tmp_path / 'shared.db')
+        pair = (SQLiteSharedState(path, poll_interval=0.02), SQLiteSharedState(path, poll_interval=0.02))
+    else:
+        url = request.getfixturevalue('redis_url')
+        pair = (RedisSharedState(url), RedisSharedState(url))
+    yield pair
+    for state in set(pair):
+        state.close()
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_values_written_by_one_worker_are_read_by_another(states):
+    writer, reader = states
+    writer.set('ns', 'key', b'\x00value')
+    assert reader.get('ns', 'key') == b'\x00value'
+    assert reader.get('other', 'key') is None
+    writer.delete('ns', 'key')
+    assert reader.get('ns', 'key') is None
+
+
+def test_values_expire(states):
+    writer, reader = states
+    writer.set('ns', 'key', b'value', ttl=1)
+    assert reader.get('ns', 'key') == b'value'
+    assert wait_until(lambda: reader.get('ns', 'key') is None)
+
+
+def test_publish_reaches_subscribers_of_another_worker(states):
+    publisher, subscriber = states
+    received = []
+    subscriber.subscribe('changes', received.append)
+    subscriber.subscribe('unrelated', lambda message: received.append(('unrelated', message)))
+    # Redis only delivers to subscriptions that are already registered
+    time.sleep(0.2)
+    publisher.publish('changes', 'job-1')
+    assert wait_until(lambda: received)
+    assert received[-1] == 'job-1'
+    assert all(not isinstance(message, tuple) for message in received)
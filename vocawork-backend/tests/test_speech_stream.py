@@ -0,0 +1,96 @@
+"""Splitting long recordings at pauses and recognizing chunks in order"""
+
+import math
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+speech_stream = pytest.importorskip('speech_stream')
+if speech_stream.audioop is None:
+    pytest.skip('needs audioop (audioop-lts on Python 3.13+)', allow_module_level=True)
+
+import speech_recognition as sr
+
+from speech_stream import duration_seconds, recognize_chunks, split_on_silence
+
+RATE = 16000
+
+
+def tone(seconds):
+    return struct.pack(f'<{int(seconds * RATE)}h',
+                       *(int(8000 * math.sin(2 * math.pi * 220 * i / RATE)) for i in range(int(seconds * RATE))))
+
+
+def silence(seconds):
+    return bytes(int(seconds * RATE) * 2)
+
+
+def audio(frames):
+    return sr.AudioData(frames, RATE, 2)
+
+
+def test_chunks_are_cut_in_the_middle_of_pauses():
+    recording = audio(tone(2) + silence(1) + tone(3) + silence(0.6) + tone(2))
+    chunks = split_on_silence(recording)
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [(0, 2.5), (2.5, 6.3), (6.3, 8.6)]
+    assert sum(duration_seconds(chunk.audio) for chunk in chunks) == pytest.approx(duration_seconds(recording))
+
+
+def test_short_pauses_and_short_chunks_are_not_cut():
+    chunks = split_on_silence(audio(tone(2) + silence(0.2) + tone(2)))
+    assert len(chunks) == 1
+    chunks = split_on_silence(audio(tone(0.5) + silence(1) + tone(3)), min_chunk_seconds=1.0)
+    assert chunks[0].end >= 1.0
+
+
+def test_long_stretches_without_pauses_are_bounded():
+    chunks = split_on_silence(audio(tone(40)), max_chunk_seconds=15)
+    assert len(chunks) >= 3
+    assert all(chunk.end - chunk.start <= 15 for chunk in chunks)
+    assert chunks[-1].end == pytest.approx(40)
+
+
+def test_empty_audio_has_no_chunks():
+    assert split_on_silence(audio(b'')) == []
+
+
+def test_recordings_are_one_chunk_without_audioop(monkeypatch):
+    monkeypatch.setattr(speech_stream, 'audioop', None)
+    recording = audio(tone(2) + silence(1) + tone(2))
+    [chunk] = split_on_silence(recording)
+    assert (chunk.start, chunk.end, chunk.audio) == (0.0, 5.0, recording)
+    assert split_on_silence(audio(b'')) == []
+
+
+def test_results_are_yielded_in_chunk_order():
+    chunks = split_on_silence(audio(tone(2) + silence(1) + tone(2) + silence(1) + tone(2)))
+    second_done = threading.Event()
+
+    def recognize(chunk):
+        if chunk.index == 0:
+            # The first chunk finishes last but is still reported first
+            second_done.wait(5)
+        elif chunk.index == 1:
+            second_done.set()
+        return f"part {chunk.index}"
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = [(chunk.index, text) for chunk, text in recognize_chunks(chunks, recognize, executor)]
+    assert results == [(0, "part 0"), (1, "part 1"), (2, "part 2")]
+
+
+def test_a_failed_chunk_raises_when_it_is_reached():
+    chunks = split_on_silence(audio(tone(2) + silence(1) + tone(2)))
+
+    def recognize(chunk):
+        if chunk.index == 1:
+            raise sr.RequestError("quota")
+        return "ok"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stream = recognize_chunks(chunks, recognize, executor)
+        assert next(stream)[1] == "ok"
+        with pytest.raises(sr.RequestError):
+            next(stream)
@@ -0,0 +1,82 @@
+"""Phrase audio synthesized once, shared between workers and kept under a size cap"""
+
+import os
+import threading
+
+import pytest
+
+from shared_state import MemorySharedState
+from tts import MockTTSBackend, PhraseAudioCache, TTSError, create_tts_backend
+
+
+class CountingBackend(MockTTSBackend):
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def synthesize(self, text, language, voice=''):
+        self.calls += 1
+        self.release.wait(5)
+        return super().synthesize(text, language, voice)
+
+
+def test_each_phrase_is_synthesized_once(tmp_path):
+    backend = CountingBackend()
+    cache = PhraseAudioCache(backend, str(tmp_path))
+    first = cache.get_or_synthesize('Found 3 jobs', 'en')
+    assert cache.get_or_synthesize('Found 3 jobs', 'en') == first
+    assert cache.get_or_synthesize('Found 3 jobs', 'hi') != first
+    assert backend.calls == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert os.path.exists(os.path.join(str(tmp_path), first))
+
+
+def test_concurrent_requests_for_a_new_phrase_synthesize_it_once(tmp_path):
+    backend = CountingBackend()
+    backend.release.clear()
+    cache = PhraseAudioCache(backend, str(tmp_path))
+    names = []
+    threads = [threading.Thread(target=lambda: names.append(cache.get_or_synthesize('Hello', 'en')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    backend.release.set()
+    for thread in threads:
+        thread.join()
+    assert backend.calls == 1 and len(set(names)) == 1
+
+
+def test_phrases_are_shared_between_workers(tmp_path):
+    shared = MemorySharedState()
+    backend_a, backend_b = CountingBackend(), CountingBackend()
+    worker_a = PhraseAudioCache(backend_a, str(tmp_path / 'a'), shared=shared)
+    worker_b = PhraseAudioCache(backend_b, str(tmp_path / 'b'), shared=shared)
+
+    filename = worker_a.get_or_synthesize('Hello', 'en')
+    assert worker_b.fetch(filename)
+    assert worker_b.get_or_synthesize('Hello', 'en') == filename
+    assert backend_b.calls == 0 and worker_b.shared_hits == 1
+    assert not worker_b.fetch('../secret.wav')
+    assert not worker_b.fetch('0' * 32 + '.wav')
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    size = len(MockTTSBackend().synthesize('', 'en'))
+    cache = PhraseAudioCache(MockTTSBackend(), str(tmp_path), max_bytes=2 * size)
+    first = cache.get_or_synthesize('one', 'en')
+    second = cache.get_or_synthesize('two', 'en')
+    # Make the first phrase the most recently used, then add a third
+    os.utime(os.path.join(str(tmp_path), second), (1, 1))
+    cache.get_or_synthesize('three', 'en')
+    assert sorted(os.listdir(str(tmp_path))) == sorted([first, cache.filename('three', 'en')])
+    assert cache.evictions == 1
+
+
+def test_backend_selection():
+    assert create_tts_backend('mock').name == 'mock'
+    with pytest.raises(ValueError):
+        create_tts_backend('festival')
+    if create_tts_backend('auto').name == 'mock':
+        with pytest.raises(TTSError):
+            create_tts_backend('espeak')
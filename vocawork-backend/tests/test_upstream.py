@@ -0,0 +1,156 @@
+"""Circuit breaker transitions and guarded upstream calls"""
+
+import threading
+import time
+
+import pytest
+
+from upstream import CircuitBreaker, CircuitOpenError, Upstream, UpstreamBusy, UpstreamTimeout
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures_only(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.opens == 1
+    assert not breaker.allow()
+
+
+def test_half_open_lets_a_single_trial_through(breaker, clock):
+    trip(breaker)
+    clock.now += 9.9
+    assert not breaker.allow()
+    assert breaker.stats()["retry_in_s"] == pytest.approx(0.1)
+
+    clock.now += 0.1
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes_the_circuit(breaker, clock):
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_trial_reopens_for_another_reset_timeout(breaker, clock):
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.opens == 2
+    clock.now += 9
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_cancelled_trial_can_be_claimed_again(breaker, clock):
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.cancel()
+    assert breaker.allow()
+
+
+def fail():
+    raise ConnectionError("upstream down")
+
+
+def test_upstream_short_circuits_after_failures():
+    upstream = Upstream('test', timeout=1.0, failure_threshold=2, reset_timeout=60)
+    try:
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                upstream.call(fail)
+        with pytest.raises(CircuitOpenError):
+            upstream.call(lambda: 'ok')
+        stats = upstream.stats()
+        assert stats["failures"] == 2 and stats["short_circuited"] == 1
+        assert stats["circuit"]["state"] == CircuitBreaker.OPEN
+    finally:
+        upstream.shutdown()
+
+
+def test_answers_rejected_by_is_failure_keep_the_circuit_closed():
+    upstream = Upstream('test', failure_threshold=1, is_failure=lambda exc: not isinstance(exc, ValueError))
+
+    def no_speech():
+        raise ValueError("no speech")
+
+    try:
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                upstream.call(no_speech)
+        assert upstream.breaker.state == CircuitBreaker.CLOSED
+        assert upstream.call(lambda: 'ok') == 'ok'
+    finally:
+        upstream.shutdown()
+
+
+def test_slow_calls_time_out_and_hold_their_slot():
+    release = threading.Event()
+    upstream = Upstream('test', timeout=0.05, max_concurrency=1, failure_threshold=5)
+    try:
+        with pytest.raises(UpstreamTimeout):
+            upstream.call(release.wait, 5)
+        with pytest.raises(UpstreamBusy):
+            upstream.call(lambda: 'ok')
+        assert upstream.breaker.failures == 1
+    finally:
+        release.set()
+        upstream.shutdown()
+
+
+def test_hedged_attempt_wins_over_a_stalled_one():
+    calls = []
+    stalled = threading.Event()
+
+    def flaky():
+        calls.append(None)
+        if len(calls) == 1:
+            stalled.wait(5)
+        return len(calls)
+
+    upstream = Upstream('test', timeout=2.0, hedge_after=0.05)
+    try:
+        started = time.monotonic()
+        assert upstream.call(flaky) == 2
+        assert time.monotonic() - started < 1
+        assert upstream.stats()["hedge_wins"] == 1
+    finally:
+        stalled.set()
+        upstream.shutdown()
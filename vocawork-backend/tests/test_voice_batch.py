@@ -0,0 +1,121 @@
+"""Zip limits and early-close cancellation of POST /api/process-voice/batch"""
+
+import io
+import json
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from voice_batch import BatchError, BatchItem, collect_items, stream_results
+
+
+def is_audio(filename):
+    return filename.endswith('.wav')
+
+
+def make_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def upload(data, filename='clips.zip'):
+    return FileStorage(io.BytesIO(data), filename=filename)
+
+
+def collect(*files, max_items=10, max_item_bytes=1000, max_total_bytes=None):
+    return collect_items(files, {}, 'en', is_audio, max_items, max_item_bytes, max_total_bytes)
+
+
+def test_archive_entries_are_expanded_and_tagged():
+    items = collect(upload(make_zip({'a.wav': b'1' * 10, 'notes.txt': b'x', 'b/c.wav': b'2' * 20})),
+                    upload(b'3' * 5, 'd.wav'))
+    assert [(item.filename, len(item.audio_bytes), item.language) for item in items] == [
+        ('a.wav', 10, 'en'), ('b/c.wav', 20, 'en'), ('d.wav', 5, 'en')]
+
+
+def test_entry_larger_than_the_item_limit_is_rejected():
+    with pytest.raises(BatchError, match='too large'):
+        collect(upload(make_zip({'a.wav': b'0' * 1001})))
+    with pytest.raises(BatchError, match='too large'):
+        collect(upload(b'0' * 1001, 'a.wav'))
+    assert len(collect(upload(b'0' * 1000, 'a.wav'))[0].audio_bytes) == 1000
+
+
+def test_total_budget_counts_decompressed_bytes():
+    # Highly compressible entries: 6KB of audio from a few hundred bytes of zip
+    archive = make_zip({f'{i}.wav': b'0' * 1000 for i in range(6)})
+    assert len(archive) < 2000
+    assert len(collect(upload(archive), max_total_bytes=6000)) == 6
+    with pytest.raises(BatchError, match='Batch audio is too large'):
+        collect(upload(archive), max_total_bytes=5500)
+
+
+def test_declared_entry_sizes_are_not_trusted():
+    archive = bytearray(make_zip({'a.wav': b'0' * 5000}))
+    # Claim 10 bytes in the central directory; the real entry inflates to 5000
+    central = archive.index(b'PK\x01\x02')
+    archive[central + 24:central + 28] = (10).to_bytes(4, 'little')
+    with pytest.raises(BatchError):
+        collect(upload(bytes(archive)))
+
+
+def test_too_many_entries_are_rejected():
+    with pytest.raises(BatchError, match='Too many'):
+        collect(upload(make_zip({f'{i}.wav': b'0' for i in range(4)})), max_items=3)
+
+
+def patch_headers(archive, local_offset, central_offset, value):
+    """Overwrite a 16-bit field of the only entry's local and central headers"""
+    archive = bytearray(archive)
+    for signature, offset in ((b'PK\x03\x04', local_offset), (b'PK\x01\x02', central_offset)):
+        start = archive.index(signature) + offset
+        archive[start:start + 2] = value.to_bytes(2, 'little')
+    return bytes(archive)
+
+
+def test_encrypted_archive_is_a_batch_error():
+    # General purpose flag bit 0 marks the entry as encrypted
+    archive = patch_headers(make_zip({'a.wav': b'0' * 10}, zipfile.ZIP_STORED), 6, 8, 0x1)
+    with pytest.raises(BatchError, match='encrypted'):
+        collect(upload(archive))
+
+
+def test_unsupported_compression_is_a_batch_error():
+    # Method 98 is PPMd, which zipfile cannot decompress
+    archive = patch_headers(make_zip({'a.wav': b'0' * 10}, zipfile.ZIP_STORED), 8, 10, 98)
+    with pytest.raises(BatchError, match='unsupported compression'):
+        collect(upload(archive))
+
+
+def test_corrupt_archive_is_a_batch_error():
+    with pytest.raises(BatchError, match='not a valid zip'):
+        collect(upload(b'PK\x03\x04 not really a zip'))
+
+
+def test_closing_the_stream_cancels_items_that_have_not_started():
+    release = threading.Event()
+    started = []
+
+    def process(item):
+        started.append(item.index)
+        release.wait(5)
+        return {"index": item.index}
+
+    items = [BatchItem(i, f'{i}.wav', b'', 'en') for i in range(10)]
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        stream = stream_results(items, process, executor)
+        release.set()
+        assert "index" in json.loads(next(stream))
+        release.clear()
+        stream.close()
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+    assert len(started) < len(items)
@@ -0,0 +1,79 @@
+"""Voice tasks submitted in one worker and polled or followed from another"""
+
+import threading
+
+import pytest
+
+from shared_state import MemorySharedState, SQLiteSharedState
+from voice_tasks import QueueFullError, VoiceTaskQueue
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two task queues over one SQLite shared state"""
+    path = str(tmp_path / 'tasks.db')
+    queues = [VoiceTaskQueue(SQLiteSharedState(path, poll_interval=0.02), max_workers=2) for _ in range(2)]
+    yield queues
+    for queue in queues:
+        queue.shutdown()
+        queue.state.close()
+
+
+def test_task_submitted_in_one_worker_is_polled_in_another(workers):
+    worker_a, worker_b = workers
+    release = threading.Event()
+
+    def pipeline(text):
+        release.wait(5)
+        return {"transcript": text, "timings_ms": {"speech_to_text": 1.5}}
+
+    task = worker_a.submit(pipeline, 'cook in pune')
+    assert worker_b.get(task.id).status in ('queued', 'running')
+
+    release.set()
+    worker_a.shutdown()
+    polled = worker_b.get(task.id)
+    assert polled.status == 'completed'
+    assert polled.to_dict()["result"] == {"transcript": 'cook in pune', "timings_ms": {"speech_to_text": 1.5}}
+
+
+def test_waiter_in_another_worker_sees_every_status_change(workers):
+    worker_a, worker_b = workers
+    release = threading.Event()
+    task = worker_a.submit(lambda: release.wait(5) and {"ok": True})
+
+    seen = [worker_b.get(task.id)]
+    release.set()
+    while not seen[-1].done:
+        seen.append(worker_b.wait_for_change(seen[-1], timeout=5))
+    assert seen[-1].status == 'completed'
+    assert seen[-1].result == {"ok": True}
+    assert [task.version for task in seen] == sorted({task.version for task in seen})
+
+
+def test_failed_task_keeps_its_error():
+    queue = VoiceTaskQueue(MemorySharedState())
+
+    def pipeline():
+        raise ValueError("no speech detected")
+
+    task = queue.submit(pipeline)
+    queue.shutdown()
+    failed = queue.get(task.id)
+    assert failed.status == 'failed' and failed.error == "no speech detected"
+    assert failed.finished_at is not None
+
+
+def test_unknown_task_is_none():
+    assert VoiceTaskQueue(MemorySharedState()).get('missing') is None
+
+
+def test_full_queue_rejects_submissions():
+    queue = VoiceTaskQueue(MemorySharedState(), max_workers=1, max_pending=1)
+    release = threading.Event()
+    queue.submit(release.wait, 5)
+    with pytest.raises(QueueFullError):
+        queue.submit(release.wait, 5)
+    release.set()
+    queue.shutdown()
+    assert queue.stats()["pending"] == 0
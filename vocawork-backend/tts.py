@@ -0,0 +1,212 @@
+"""
+Text-to-speech for voice responses.
+
+Audio is cached on disk under a name derived from (backend, text, language,
+voice), so each distinct phrase is synthesized once and then served as a
+static file. The directory is kept under a configurable size by evicting the
+least recently used files (by access time). With a shared state, each new
+phrase is also stored there, so a worker on another host serves it without
+synthesizing it again.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import wave
+
+logger = logging.getLogger(__name__)
+
+AUDIO_FILENAME = re.compile(r'^[0-9a-f]{32}\.[a-z0-9]+$')
+
+
+class TTSError(Exception):
+    """Raised when a backend fails to synthesize speech"""
+
+
+class MockTTSBackend:
+    """Short silent WAV for environments without a speech engine"""
+
+    name = 'mock'
+    extension = 'wav'
+
+    def synthesize(self, text, language, voice=''):
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(b'\0\0' * 8000)
+        return buffer.getvalue()
+
+
+class EspeakTTSBackend:
+    """Offline synthesis with the espeak-ng (or espeak) command-line engine"""
+
+    name = 'espeak'
+    extension = 'wav'
+
+    def __init__(self, binary):
+        self.binary = binary
+
+    def synthesize(self, text, language, voice=''):
+        voice_name = f"{language}+{voice}" if voice else language
+        try:
+            result = subprocess.run([self.binary, '--stdout', '-v', voice_name, text],
+                                    capture_output=True, timeout=30, check=True)
+        except (OSError, subprocess.SubprocessError) as e:
+            raise TTSError(f"espeak failed for voice {voice_name}: {str(e)}") from e
+        if not result.stdout:
+            raise TTSError(f"espeak produced no audio for voice {voice_name}")
+        return result.stdout
+
+
+def create_tts_backend(name='auto'):
+    """Build a backend by name: 'espeak', 'mock', or 'auto' (espeak if installed)"""
+    binary = shutil.which('espeak-ng') or shutil.which('espeak')
+    if name == 'mock' or (name == 'auto' and not binary):
+        return MockTTSBackend()
+    if name in ('espeak', 'auto'):
+        if not binary:
+            raise TTSError("TTS backend 'espeak' requested but espeak-ng/espeak is not installed")
+        return EspeakTTSBackend(binary)
+    raise ValueError(f"Unknown TTS backend: {name}")
+
+
+class PhraseAudioCache:
+    """Content-addressed, size-capped directory of synthesized phrases"""
+
+    def __init__(self, backend, directory, max_bytes=100 * 1024 * 1024, shared=None, shared_ttl=None):
+        """shared is an optional SharedState holding every worker's synthesized phrases"""
+        self.backend = backend
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def filename(self, text, language, voice=''):
+        key = '\0'.join((self.backend.name, voice, language, text)).encode('utf-8')
+        return f"{hashlib.sha256(key).hexdigest()[:32]}.{self.backend.extension}"
+
+    def _lock_for(self, filename):
+        with self._locks_guard:
+            return self._locks.setdefault(filename, threading.Lock())
+
+    def get_or_synthesize(self, text, language, voice=''):
+        """Return the cached file name for the phrase, synthesizing it if needed"""
+        filename = self.filename(text, language, voice)
+        path = os.path.join(self.directory, filename)
+
+        if self._touch(path):
+            self.hits += 1
+            return filename
+
+        # Concurrent requests for the same new phrase synthesize it once
+        with self._lock_for(filename):
+            if self._touch(path):
+                self.hits += 1
+                return filename
+            audio = self._shared_get(filename)
+            if audio is not None:
+                self.shared_hits += 1
+            else:
+                self.misses += 1
+                audio = self.backend.synthesize(text, language, voice)
+                self._shared_put(filename, audio)
+            self._write(path, audio)
+
+        with self._locks_guard:
+            self._locks.pop(filename, None)
+        self._evict()
+        return filename
+
+    def fetch(self, filename):
+        """
+        Copy a phrase synthesized by another worker from the shared state
+        into the local directory; False if it is not there either.
+        """
+        if not AUDIO_FILENAME.match(filename):
+            return False
+        audio = self._shared_get(filename)
+        if audio is None:
+            return False
+        self.shared_hits += 1
+        self._write(os.path.join(self.directory, filename), audio)
+        self._evict()
+        return True
+
+    def _write(self, path, audio):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+
+    def _shared_get(self, filename):
+        if self.shared is None:
+            return None
+        try:
+            return self.shared.get('audio', filename)
+        except Exception as e:
+            logger.warning(f"Shared audio read failed for {filename}: {str(e)}")
+            return None
+
+    def _shared_put(self, filename, audio):
+        if self.shared is None:
+            return
+        try:
+            self.shared.set('audio', filename, audio, ttl=self.shared_ttl)
+        except Exception as e:
+            logger.warning(f"Shared audio write failed for {filename}: {str(e)}")
+
+    def _touch(self, path):
+        """Mark a cached file as recently used; False if it does not exist"""
+        try:
+            # Only the access time changes, so mtime-based ETags stay stable
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+            return True
+        except OSError:
+            return False
+
+    def _evict(self):
+        """Remove least recently used files until the directory fits max_bytes"""
+        try:
+            entries = [entry for entry in os.scandir(self.directory)
+                       if entry.is_file() and not entry.name.endswith('.tmp')]
+        except OSError:
+            return
+        total = sum(entry.stat().st_size for entry in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_atime)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+                self.evictions += 1
+            except OSError:
+                pass
+
+    def stats(self):
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "shared_enabled": self.shared is not None,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,232 @@
+"""
+Guarded calls to remote services (Google Speech Recognition, Gemini).
+
+Every call through an Upstream gets a deadline, waits for one of a bounded
+number of concurrency slots, and passes a circuit breaker: after
+failure_threshold consecutive failures or timeouts the circuit opens and
+calls fail at once with CircuitOpenError, so callers go straight to their
+local fallback instead of waiting on a sick service. After reset_timeout a
+single trial call is let through; if it succeeds the circuit closes again.
+
+With hedge_after set, an attempt that has not answered after that many
+seconds is raced against a second, identical attempt and the first answer
+wins, trimming tail latency for idempotent calls.
+
+Python cannot interrupt a blocking call, so an attempt that misses its
+deadline keeps running on the upstream's worker thread and holds its slot
+until it returns. That is deliberate: a slow service is not sent more
+requests than it has slots.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class UpstreamError(Exception):
+    """Raised instead of calling, or waiting on, an unavailable upstream"""
+
+    reason = 'error'
+
+
+class CircuitOpenError(UpstreamError):
+    reason = 'circuit_open'
+
+
+class UpstreamTimeout(UpstreamError):
+    reason = 'timeout'
+
+
+class UpstreamBusy(UpstreamError):
+    reason = 'busy'
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opens = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    def allow(self):
+        """Whether a call may go ahead now; claims the trial call when half-open"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def cancel(self):
+        """Give back a permission from allow() that was not used"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opens += 1
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+
+    def stats(self):
+        with self._lock:
+            stats = {"state": self.state, "consecutive_failures": self.failures, "opens": self.opens}
+            if self.state == self.OPEN:
+                stats["retry_in_s"] = round(max(0.0, self.reset_timeout - (self._clock() - self._opened_at)), 1)
+            return stats
+
+
+class Upstream:
+    """A remote dependency called with a deadline, bounded concurrency and a circuit breaker"""
+
+    def __init__(self, name, timeout=10.0, max_concurrency=8, failure_threshold=5,
+                 reset_timeout=30.0, hedge_after=0.0, is_failure=None):
+        """
+        is_failure(exc) decides whether an exception means the upstream is
+        unhealthy; exceptions it rejects (e.g. "no speech in this clip") are
+        re-raised to the caller but count as answers.
+        """
+        self.name = name
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.hedge_after = hedge_after
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._is_failure = is_failure or (lambda exc: True)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix=f'upstream-{name}')
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=512)
+        self._in_flight = 0
+        self._counts = dict.fromkeys(('calls', 'ok', 'failures', 'timeouts', 'short_circuited',
+                                      'busy', 'hedges', 'hedge_wins'), 0)
+
+    def call(self, fn, *args, timeout=None, **kwargs):
+        """
+        Return fn(*args, **kwargs), run on the upstream's workers. Raises
+        CircuitOpenError, UpstreamBusy or UpstreamTimeout, or whatever fn
+        raised.
+        """
+        started = time.monotonic()
+        deadline = started + (self.timeout if timeout is None else timeout)
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+
+        first = self._submit(fn, args, kwargs, deadline)
+        if first is None:
+            self.breaker.cancel()
+            self._count('busy')
+            raise UpstreamBusy(f"{self.name} has {self.max_concurrency} calls in flight")
+
+        pending = {first}
+        hedge_at = started + self.hedge_after if self.hedge_after else None
+        error = None
+        while pending:
+            wake = deadline if hedge_at is None else min(deadline, hedge_at)
+            done, pending = wait(pending, timeout=max(0.0, wake - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if self._is_failure(e):
+                        error = e
+                        continue
+                    self._succeeded(started, hedged=future is not first)
+                    raise
+                self._succeeded(started, hedged=future is not first)
+                return result
+
+            now = time.monotonic()
+            if hedge_at is not None and now >= hedge_at and pending:
+                hedge_at = None
+                hedge = self._submit(fn, args, kwargs, deadline=None)
+                if hedge is not None:
+                    self._count('hedges')
+                    pending.add(hedge)
+            if pending and now >= deadline:
+                break
+
+        self.breaker.record_failure()
+        if pending:
+            self._count('timeouts')
+            raise UpstreamTimeout(f"{self.name} did not answer within "
+                                  f"{deadline - started:.1f}s") from error
+        self._count('failures')
+        raise error
+
+    def _submit(self, fn, args, kwargs, deadline):
+        """Start an attempt once a slot is free (by deadline, or right now if None)"""
+        if deadline is None:
+            acquired = self._slots.acquire(blocking=False)
+        else:
+            acquired = self._slots.acquire(timeout=max(0.0, deadline - time.monotonic()))
+        if not acquired:
+            return None
+        with self._lock:
+            self._in_flight += 1
+        future = self._executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _succeeded(self, started, hedged):
+        self.breaker.record_success()
+        with self._lock:
+            self._counts['ok'] += 1
+            if hedged:
+                self._counts['hedge_wins'] += 1
+            self._latencies.append(time.monotonic() - started)
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self._counts, in_flight=self._in_flight, max_concurrency=self.max_concurrency,
+                         timeout_s=self.timeout, hedge_after_s=self.hedge_after or None)
+        if latencies:
+            stats["latency_ms"] = {
+                "p50": round(latencies[len(latencies) // 2] * 1000, 1),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+            }
+        stats["circuit"] = self.breaker.stats()
+        return stats
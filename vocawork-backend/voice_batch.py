@@ -0,0 +1,154 @@
+"""
+Helpers for POST /api/process-voice/batch.
+
+Collects audio items from multipart uploads and zip archives, then runs them
+on an executor and yields NDJSON lines in completion order. Archive entries
+are read in chunks and counted as they decompress, so the declared sizes in
+the archive are never trusted.
+"""
+
+import io
+import json
+import os
+import time
+import zipfile
+import zlib
+from concurrent.futures import as_completed
+
+READ_CHUNK = 64 * 1024
+
+
+class BatchError(Exception):
+    """Raised for a batch request that cannot be processed at all"""
+
+
+class BatchItem:
+    """One audio clip of a batch with its language tag"""
+
+    __slots__ = ('index', 'filename', 'audio_bytes', 'language')
+
+    def __init__(self, index, filename, audio_bytes, language):
+        self.index = index
+        self.filename = filename
+        self.audio_bytes = audio_bytes
+        self.language = language
+
+
+def parse_languages(raw):
+    """Parse the 'languages' form field: a JSON object of filename -> language code"""
+    if not raw:
+        return {}
+    try:
+        languages = json.loads(raw)
+    except ValueError:
+        raise BatchError("'languages' must be a JSON object mapping filenames to language codes")
+    if not isinstance(languages, dict):
+        raise BatchError("'languages' must be a JSON object mapping filenames to language codes")
+    return languages
+
+
+def read_entry(archive, info, max_bytes):
+    """Decompress an archive entry, stopping once it exceeds max_bytes; None if it does"""
+    chunks = []
+    size = 0
+    with archive.open(info) as entry:
+        while True:
+            chunk = entry.read(min(READ_CHUNK, max_bytes - size + 1))
+            if not chunk:
+                return b''.join(chunks)
+            size += len(chunk)
+            if size > max_bytes:
+                return None
+            chunks.append(chunk)
+
+
+def collect_items(files, languages, default_language, is_allowed, max_items, max_item_bytes,
+                  max_total_bytes=None):
+    """
+    Build BatchItems from uploaded files. Zip archives are expanded; entries
+    that are not allowed audio types are skipped. max_item_bytes bounds each
+    clip, uploaded or unzipped; max_total_bytes bounds the audio held for the
+    whole batch, after decompression.
+    """
+    items = []
+    total = 0
+
+    def add(filename, audio_bytes):
+        nonlocal total
+        if len(items) >= max_items:
+            raise BatchError(f"Too many audio files in batch (maximum {max_items})")
+        total += len(audio_bytes)
+        if max_total_bytes is not None and total > max_total_bytes:
+            raise BatchError(f"Batch audio is too large (maximum {max_total_bytes} bytes)")
+        language = languages.get(filename) or languages.get(os.path.basename(filename)) or default_language
+        items.append(BatchItem(len(items), filename, audio_bytes, language))
+
+    def remaining():
+        return max_item_bytes if max_total_bytes is None else min(max_item_bytes, max_total_bytes - total)
+
+    for file in files:
+        if not file.filename:
+            continue
+        if file.filename.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(io.BytesIO(file.read())) as archive:
+                    for info in archive.infolist():
+                        if info.is_dir() or not is_allowed(info.filename):
+                            continue
+                        if len(items) >= max_items:
+                            raise BatchError(f"Too many audio files in batch (maximum {max_items})")
+                        audio_bytes = read_entry(archive, info, remaining())
+                        if audio_bytes is None:
+                            if remaining() < max_item_bytes:
+                                raise BatchError(f"Batch audio is too large (maximum {max_total_bytes} bytes)")
+                            raise BatchError(f"Archive entry {info.filename} is too large")
+                        add(info.filename, audio_bytes)
+            except (zipfile.BadZipFile, zlib.error, EOFError):
+                raise BatchError(f"{file.filename} is not a valid zip archive")
+            except NotImplementedError:
+                raise BatchError(f"{file.filename} uses an unsupported compression method")
+            except RuntimeError:
+                # zipfile's error for encrypted entries (checked after its subclass above)
+                raise BatchError(f"{file.filename} is encrypted; upload an unencrypted archive")
+        elif is_allowed(file.filename):
+            audio_bytes = file.read(max_item_bytes + 1)
+            if len(audio_bytes) > max_item_bytes:
+                raise BatchError(f"{file.filename} is too large (maximum {max_item_bytes} bytes)")
+            add(file.filename, audio_bytes)
+        else:
+            raise BatchError(f"File type not allowed: {file.filename}")
+
+    if not items:
+        raise BatchError("No audio files provided")
+    return items
+
+
+def stream_results(items, process_item, executor):
+    """Submit every item and yield one NDJSON line per finished item, then a summary"""
+    started = time.perf_counter()
+    futures = {executor.submit(process_item, item): item for item in items}
+    errors = 0
+    try:
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # process_item isolates its own failures; this is a last resort
+                result = {"index": item.index, "filename": item.filename, "error": str(e)}
+            if "error" in result:
+                errors += 1
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+    finally:
+        # The generator is closed early when the client disconnects: drop the
+        # items that have not started instead of leaving them on the executor
+        for future in futures:
+            future.cancel()
+
+    yield json.dumps({
+        "summary": {
+            "items": len(items),
+            "errors": errors,
+            "total_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+    }) + "\n"
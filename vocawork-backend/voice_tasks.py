@@ -0,0 +1,162 @@
+"""
+Background task runner for the voice-processing pipeline.
+
+Submitting a task returns immediately with a task id; a bounded thread pool
+runs the pipeline and clients poll the task or follow it over server-sent
+events.
+
+Task records (status, result with its stage timings, error) live in a
+SharedState rather than in the submitting process, so a poll or event
+stream landing on any worker finds the task. Every update is published on
+the 'voice_tasks' channel to wake waiters in other workers. Records expire
+result_ttl seconds after their last update.
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = 'voice_tasks'
+CHANNEL = 'voice_tasks'
+
+
+class QueueFullError(Exception):
+    """Raised when the number of unfinished tasks reaches the configured bound"""
+
+
+class VoiceTask:
+    """State of one submitted pipeline run, as last stored"""
+
+    def __init__(self, task_id=None, status='queued', created_at=None):
+        self.id = task_id or str(uuid.uuid4())
+        self.status = status
+        self.result = None
+        self.error = None
+        self.created_at = created_at or time.time()
+        self.finished_at = None
+        # Bumped on every status change so waiters can detect updates
+        self.version = 0
+
+    @property
+    def done(self):
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self):
+        data = {
+            "task_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+        }
+        if self.finished_at:
+            data["finished_at"] = self.finished_at
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+    def to_record(self):
+        return json.dumps(dict(self.to_dict(), version=self.version), ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def from_record(cls, data):
+        record = json.loads(data)
+        task = cls(record["task_id"], record["status"], record["created_at"])
+        task.result = record.get("result")
+        task.error = record.get("error")
+        task.finished_at = record.get("finished_at")
+        task.version = record["version"]
+        return task
+
+
+class VoiceTaskQueue:
+    """Runs pipeline callables on a bounded pool and keeps results in shared state for polling"""
+
+    def __init__(self, state, max_workers=4, max_pending=100, result_ttl=600):
+        self.state = state
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='voice-task')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._changed = threading.Condition()
+        self.state.subscribe(CHANNEL, self._on_change)
+
+    def submit(self, fn, *args):
+        """Queue fn(*args) and return its VoiceTask; raises QueueFullError when saturated"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError("Voice processing queue is full")
+            self._pending += 1
+        task = VoiceTask()
+        try:
+            self._save(task)
+            self._executor.submit(self._run, task, fn, args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return task
+
+    def get(self, task_id):
+        """The task as last stored by whichever worker runs it, or None"""
+        data = self.state.get(NAMESPACE, task_id)
+        return VoiceTask.from_record(data) if data is not None else None
+
+    def wait_for_change(self, task, timeout):
+        """
+        Block until task is stored at a newer version or timeout expires, and
+        return the latest stored task (None once it has expired)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            latest = self.get(task.id)
+            remaining = deadline - time.monotonic()
+            if latest is None or latest.version != task.version or remaining <= 0:
+                return latest
+            with self._changed:
+                # Re-read at least every second in case a notification was lost
+                self._changed.wait(min(remaining, 1.0))
+
+    def stats(self):
+        with self._lock:
+            return {"pending": self._pending, "backend": self.state.name}
+
+    def shutdown(self, wait=True):
+        """Stop accepting work and, with wait, let queued and running tasks finish"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _save(self, task):
+        self.state.set(NAMESPACE, task.id, task.to_record(), ttl=self.result_ttl)
+        self.state.publish(CHANNEL, task.id)
+        self._on_change(task.id)
+
+    def _update(self, task, **fields):
+        for name, value in fields.items():
+            setattr(task, name, value)
+        task.version += 1
+        try:
+            self._save(task)
+        except Exception as e:
+            logger.warning(f"Could not store voice task {task.id}: {str(e)}")
+
+    def _on_change(self, message=''):
+        with self._changed:
+            self._changed.notify_all()
+
+    def _run(self, task, fn, args):
+        self._update(task, status='running')
+        try:
+            result = fn(*args)
+            self._update(task, status='completed', result=result, finished_at=time.time())
+        except Exception as e:
+            logger.error(f"Voice task {task.id} failed: {str(e)}", exc_info=True)
+            self._update(task, status='failed', error=str(e), finished_at=time.time())
+        finally:
+            with self._lock:
+                self._pending -= 1